@@ -5,8 +5,8 @@ Main application controller
 
 import json
 import streamlit as st
-import asyncio
 import logging
+import time
 import traceback
 import pandas as pd
 from typing import Dict
@@ -14,14 +14,19 @@ from typing import Dict
 from social.config import ADOPTER_CATEGORIES, SimulationConfig
 
 from app.utils import (
-    calculate_adoption_metrics, cancel_simulation, setup_logging
+    cancel_simulation, setup_logging
 )
 from app.ui_components import (
     setup_page, create_sidebar_controls, create_sidebar_help, 
 )
-from app.visualizations import create_adoption_curve, create_category_adoption_rate_over_time, create_category_analysis, create_network_graph, display_simulation_summary
+from app.visualizations import display_simulation_summary, get_network_graph, get_results_figure, is_network_layout_pending, LiveNetworkView
+from social.network_layout import LAYOUT_ALGORITHMS
+from social.runner import COMPLETED, CANCELLED, FAILED, INITIALIZED, STEP_COMPLETED, STEP_STARTED, SimulationEvent, SimulationRunner
 from social.simulation import get_simulation_with_config
 
+# Seconds between polls of the background simulation runner
+MONITOR_POLL_INTERVAL = 0.5
+
 class StreamlitDiffusionApp:
     """
     Streamlit application for interactive social innovation diffusion simulation
@@ -34,6 +39,11 @@ class StreamlitDiffusionApp:
         self.step_metrics_container = None
         self.live_network_placeholder = None
         self.live_metrics_placeholder = None
+        self.live_network_view = None
+        self.live_step = None
+        self.live_step_results = None
+        self.progress = 0
+        self.status = ""
         
         # Setup logging and initialize session state
         setup_logging()
@@ -49,7 +59,8 @@ class StreamlitDiffusionApp:
     def reset_session_state(self):
         """Reset the session state to initial values"""
         st.session_state.simulation_running = False
-        st.session_state.simulation_task = None
+        st.session_state.simulation_runner = None
+        st.session_state.simulation_error = None
         st.session_state.simulation_cancelled = False
         st.session_state.simulation_starting = False
         st.session_state.simulation_started = False
@@ -66,6 +77,7 @@ class StreamlitDiffusionApp:
     def start_simulation(self):
         st.session_state.simulation_running = True
         st.session_state.simulation_cancelled = False
+        st.session_state.simulation_error = None
         st.session_state.simulation_starting = True
         st.session_state.simulation_started = False
 
@@ -131,8 +143,15 @@ class StreamlitDiffusionApp:
         if st.session_state.get('wait_for_cancel', False):
             st.info("⏳ Wait for initialization to cancel the simulation...")
 
+        if session.get('simulation_error') is not None:
+            error = session.simulation_error
+            st.error(f"❌ Simulation failed at step {error.step}: {error.message}")
+            with st.expander("🔍 Error Details (for debugging)", expanded=False):
+                st.code(error.details)
+
         if is_running and session.simulation_started:
-            st.info("🔄 Simulation is currently running... Please wait for completion.")
+            st.info("🔄 Simulation is running in the background. The view updates after every step.")
+            self._monitor_simulation()
             return
         
         if is_completed or session.simulation_loaded and not is_running:
@@ -146,75 +165,109 @@ class StreamlitDiffusionApp:
             self._execute_simulation()
     
     def _execute_simulation(self):
-        """Execute simulation with proper error handling and UI updates"""
-
-        # Setup live visualization if requested
-        if st.session_state.live_visualization_enabled:
-            self._setup_live_visualization()
-        
-        # Create progress indicators
-        self.progress_bar = st.progress(0)
-        self.status_text = st.empty()
-        
-        try:            
-            self.status_text.text("🚀 Initializing simulation...")
-            self.progress_bar.progress(0.1)
-
-            st.session_state.simulation_starting = False
-
-            # Initialize simulation with callbacks
-            simulation = get_simulation_with_config(
-                st.session_state.temp_simulation_config,
-                simulation_step_started_callback=self.step_started_callback,
-                simulation_step_completed_callback=self.step_completed_callback,
-                simulation_completed_callback=self.simulation_completed_callback,
-                simulation_initialized_callback=self.simulation_initialized_callback
-            )
+        """Start the simulation on a background runner"""
+        st.session_state.simulation_starting = False
+        try:
+            simulation = get_simulation_with_config(st.session_state.temp_simulation_config)
+            runner = SimulationRunner(simulation)
             st.session_state.simulation = simulation
-            simulation.initialize_simulation()
-            asyncio.run(self.run_simulation())
-            st.session_state.simulation_running = True
+            st.session_state.simulation_runner = runner
+            self.live_network_view = None
+            self.live_step = None
+            self.live_step_results = None
+            self.progress = 0.1
+            self.status = "🚀 Initializing simulation..."
+            runner.start()
             st.session_state.simulation_started = True
         except Exception as e:
             error_msg = str(e)
-            self.status_text.text(f"❌ Simulation failed to start: {error_msg}")
+            st.error(f"❌ Simulation failed to start: {error_msg}")
             logging.error(f"Simulation error: {error_msg}")
             logging.error(f"Traceback: {traceback.format_exc()}")
-            
+
             # Additional error context for debugging
             with st.expander("🔍 Error Details (for debugging)", expanded=False):
                 st.code(traceback.format_exc())
-            self.progress_bar = None
+            st.session_state.simulation_running = False
+            return
         st.rerun()
 
-    def simulation_initialized_callback(self):
-        """Callback when simulation is initialized"""
-        self.status_text.text("📊 Initial network stored! Starting simulation...")
-        self.progress_bar.progress(0.2)
-        try:
-            self._display_live_network(0)
-        except Exception as e:
-            logging.error(f"Error displaying initial live network: {str(e)}")
-            pass
-    
-    def step_started_callback(self, step):
-        """Callback when a simulation step starts"""
-        progress = 0.3 + (step / st.session_state.temp_simulation_config.max_steps) * 0.6
-        self.progress_bar.progress(progress)
-        self.status_text.text(f"🏃‍♂️ Running step {step}/{st.session_state.temp_simulation_config.max_steps}...")
-
-    def step_completed_callback(self, step):
-        """Callback when a simulation step completes"""
-        config = st.session_state.temp_simulation_config
-        progress = 0.3 + ((step) / config.max_steps) * 0.6
-        self.progress_bar.progress(progress)
+    def _monitor_simulation(self):
+        """
+        Show the progress of the background run until it finishes
+
+        The runner publishes events on a queue that is polled here. Widget
+        interactions rerun the script as usual (the run itself is unaffected)
+        and the monitor picks up where it left off.
+        """
+        runner = st.session_state.simulation_runner
+
+        if st.session_state.live_visualization_enabled:
+            self._setup_live_visualization()
+        self.progress_bar = st.progress(self.progress)
+        self.status_text = st.empty()
+        self.status_text.text(self.status)
+        if self.live_step is not None:
+            self._display_live_network(self.live_step, self.live_step_results)
+
+        started = time.time()
+        while True:
+            events = runner.poll(timeout=MONITOR_POLL_INTERVAL)
+            # Only the latest step is drawn when several completed since the last poll
+            completed_steps = [event for event in events if event.kind == STEP_COMPLETED]
+            for event in events:
+                if event.kind == STEP_COMPLETED and event is not completed_steps[-1]:
+                    continue
+                self._handle_simulation_event(event)
+
+            # Refreshing the status also lets Streamlit handle widget interactions
+            self.status_text.text(f"{self.status} ({time.time() - started:.0f}s)")
+            if not events and not runner.running and runner.events.empty():
+                # The runner died without a final event
+                st.session_state.simulation_running = False
+                st.session_state.simulation_started = False
+                st.session_state.simulation_runner = None
+                st.rerun()
+
+    def _handle_simulation_event(self, event: SimulationEvent):
+        """Update the progress display (and finish the run) from a runner event"""
+        max_steps = st.session_state.simulation.config.max_steps
+        if event.kind == INITIALIZED:
+            self.progress = 0.2
+            self.status = "📊 Initial network stored! Starting simulation..."
+            self._show_live_step(0, None)
+        elif event.kind == STEP_STARTED:
+            self.progress = 0.3 + ((event.step - 1) / max_steps) * 0.6
+            self.status = f"🏃‍♂️ Running step {event.step}/{max_steps}..."
+        elif event.kind == STEP_COMPLETED:
+            self.progress = 0.3 + (event.step / max_steps) * 0.6
+            self._show_live_step(event.step, event.data)
+        elif event.kind == COMPLETED:
+            self.simulation_completed()
+        elif event.kind == CANCELLED:
+            st.session_state.simulation_runner = None
+            st.session_state.simulation_cancelled = True
+            st.session_state.simulation_running = False
+            st.session_state.simulation_started = False
+            st.rerun()
+        elif event.kind == FAILED:
+            logging.error(f"Simulation error: {event.message}")
+            st.session_state.simulation_runner = None
+            st.session_state.simulation_running = False
+            st.session_state.simulation_started = False
+            st.session_state.simulation_error = event
+            st.rerun()
+        self.progress_bar.progress(self.progress)
+
+    def _show_live_step(self, step: int, step_results):
+        self.live_step = step
+        self.live_step_results = step_results
         try:
-            self._display_live_network(step)
+            self._display_live_network(step, step_results)
         except Exception as e:
             logging.error(f"Error displaying live network: {e}")
-            pass
-    
-    def simulation_completed_callback(self):
+
+    def simulation_completed(self):
         # Auto-save if enabled
         if st.session_state.auto_save_enabled:
             try:
@@ -230,6 +283,7 @@ class StreamlitDiffusionApp:
         self.status_text.text("📊 Analyzing results...")
         self.progress_bar.progress(0.95)
 
+        st.session_state.simulation_runner = None
         st.session_state.simulation_running = False
         st.session_state.simulation_started = False
         st.session_state.simulation_completed = True
@@ -244,8 +298,8 @@ class StreamlitDiffusionApp:
         st.rerun()
 
 
-    def _display_live_network(self, step: int):
-        """Display initial simulation state in live visualization"""
+    def _display_live_network(self, step: int, step_results: Dict = None):
+        """Display the simulation state of a step in the live visualization"""
         # Show initial network state
         if self.live_network_placeholder:
             with self.live_network_placeholder.container():
@@ -256,42 +310,26 @@ class StreamlitDiffusionApp:
                     st.markdown(f"### 🌐 Live Network Evolution - Step {step} 🔴 LIVE")
                     st.caption("🎬 Watch the network evolve in real-time as agents adopt the innovation!")
             
-                network_fig = create_network_graph(current_step=step)
+                # The figure is built once and then only receives the adoption changes of each step
+                if self.live_network_view is None:
+                    results = st.session_state.simulation.results
+                    self.live_network_view = LiveNetworkView(results["network_metrics"]["networkx_graph"], results)
+                agents_results = step_results["agents_results"] if step_results else {}
+                network_fig = self.live_network_view.update(step, agents_results)
                 st.plotly_chart(network_fig, use_container_width=True, key=f"live_network_{step}")
+                if self.live_network_view.drawn_edges < self.live_network_view.total_edges:
+                    st.caption(f"Showing {self.live_network_view.drawn_edges:,} of {self.live_network_view.total_edges:,} connections while the simulation runs")
         
         # Show initial metrics
         if self.live_metrics_placeholder:
             with self.live_metrics_placeholder.container():
-                metrics = calculate_adoption_metrics(step)
                 col1, col2, col3 = st.columns(3)
                 with col1:
                     st.metric("Current Step", f"{step}" if step >= 1 else "Initial")
                 with col2:
-                    st.metric("Adoption Rate", f"{metrics['adoption_rate']:.1%}")
+                    st.metric("Adoption Rate", f"{step_results['total_adoption_rate'] if step_results else 0:.1%}")
                 with col3:
-                    st.metric("New Adoptions", f"{metrics['new_adoptions']}")
-
-    async def run_simulation(self):
-        """Run simulation with progress updates and robust error handling"""
-        try:
-            st.session_state.simulation_task = asyncio.current_task()
-            await st.session_state.simulation.run_simulation()
-        except asyncio.CancelledError:
-            self.status_text.text("⚠️ Simulation cancelled by user")
-        except Exception as e:
-            error_msg = str(e)
-            self.status_text.text(f"❌ Simulation failed: {error_msg}")
-            st.error(f"Error during simulation: {error_msg}")
-            logging.error(f"Simulation error: {error_msg}")
-            logging.error(f"Traceback: {traceback.format_exc()}")
-            st.session_state.simulation_running = False
-            st.session_state.simulation_started = False
-            st.session_state.simulation_task = None
-            st.rerun()
-        finally:
-            st.session_state.simulation_running = False
-            st.session_state.simulation_started = False
-            st.session_state.simulation_task = None
+                    st.metric("New Adoptions", f"{step_results['new_adoptions'] if step_results else 0}")
 
     def _cleanup_ui_elements(self):
         """Clean up UI elements and temporary state safely"""
@@ -334,7 +372,7 @@ class StreamlitDiffusionApp:
         
         with tab1:
             st.markdown("### 📈 Innovation Adoption Over Steps")
-            adoption_fig = create_adoption_curve(results)
+            adoption_fig = get_results_figure("adoption_curve")
             config = {
                 'toImageButtonOptions': {
                     'format': 'svg', # one of png, svg, jpeg, webp
@@ -348,7 +386,7 @@ class StreamlitDiffusionApp:
 
         with tab2:
             st.markdown("### 👥 Rogers Category Analysis")
-            category_fig = create_category_analysis(results)
+            category_fig = get_results_figure("category_analysis")
             config = {
                 'toImageButtonOptions': {
                     'format': 'svg', # one of png, svg, jpeg, webp
@@ -360,7 +398,7 @@ class StreamlitDiffusionApp:
             }
             st.plotly_chart(category_fig, use_container_width=True, key="results_category_analysis", config=config)
 
-            category_fig2 = create_category_adoption_rate_over_time(results)
+            category_fig2 = get_results_figure("category_adoption_over_time")
             config = {
                 'toImageButtonOptions': {
                     'format': 'svg', # one of png, svg, jpeg, webp
@@ -385,7 +423,10 @@ class StreamlitDiffusionApp:
                     help="View details for a specific agent",
                     key="selected_agent_network_final"
                 )
-                network_fig = create_network_graph(-1, selected_agent=selected_agent)
+                layout = st.radio("Layout", LAYOUT_ALGORITHMS, horizontal=True, key="network_layout_final")
+                network_fig = get_network_graph(-1, selected_agent=selected_agent, layout=layout)
+                if is_network_layout_pending(layout):
+                    st.caption(f"⏳ Computing the {layout} layout in the background, showing the circular layout meanwhile")
                 config = {
                     'toImageButtonOptions': {
                         'format': 'svg', # one of png, svg, jpeg, webp
@@ -424,8 +465,9 @@ class StreamlitDiffusionApp:
                     with col3:
                         st.metric("Network Density", f"{network_metrics.get('density', 0):.3f}")
                     with col4:
-                        st.metric("Avg Clustering", f"{network_metrics.get('avg_clustering', 0):.3f}")
-                    
+                        avg_clustering = network_metrics.get('avg_clustering', 0)
+                        st.metric("Avg Clustering", self._format_sampled_metric(network_metrics, 'avg_clustering', avg_clustering, 3))
+
                     # Second row of network metrics
                     col1, col2, col3, col4 = st.columns(4)
                     with col1:
@@ -435,10 +477,16 @@ class StreamlitDiffusionApp:
                         st.metric("Components", network_metrics.get('num_components', 0))
                     with col3:
                         avg_path = network_metrics.get('avg_shortest_path', float('inf'))
-                        avg_path_display = f"{avg_path:.2f}" if avg_path != float('inf') else "∞"
+                        avg_path_display = self._format_sampled_metric(network_metrics, 'avg_shortest_path', avg_path, 2) if avg_path != float('inf') else "∞"
                         st.metric("Avg Path Length", avg_path_display)
                     with col4:
-                        st.metric("Diameter", network_metrics.get('diameter', 0))
+                        diameter = network_metrics.get('diameter', 0)
+                        diameter_error = network_metrics.get('metric_errors', {}).get('diameter', {})
+                        if diameter_error.get('method') == 'sampled':
+                            st.metric("Diameter", f"{diameter_error['lower_bound']}–{diameter_error['upper_bound']}",
+                                      help=f"Bounds from {diameter_error['samples']} sampled BFS sources")
+                        else:
+                            st.metric("Diameter", diameter)
             else:
                 st.error("❌ No agent state data available for network visualization")
 
@@ -503,9 +551,12 @@ class StreamlitDiffusionApp:
                         help="View details for a specific agent",
                         key="selected_agent_network_step"
                     )
+                    layout = st.radio("Layout", LAYOUT_ALGORITHMS, horizontal=True, key="network_layout_step")
 
                     # Create network graph for the selected step
-                    step_network_fig = create_network_graph(current_step=selected_step, selected_agent=selected_agent)
+                    step_network_fig = get_network_graph(current_step=selected_step, selected_agent=selected_agent, layout=layout)
+                    if is_network_layout_pending(layout):
+                        st.caption(f"⏳ Computing the {layout} layout in the background, showing the circular layout meanwhile")
                     config = {
                         'toImageButtonOptions': {
                             'format': 'svg', # one of png, svg, jpeg, webp
@@ -527,6 +578,14 @@ class StreamlitDiffusionApp:
 
             self.create_agents_analysis(results, "analysis")
 
+    @staticmethod
+    def _format_sampled_metric(network_metrics: Dict, metric: str, value: float, decimals: int) -> str:
+        """Format a network metric, showing the standard error when it was sampled"""
+        error = network_metrics.get('metric_errors', {}).get(metric, {})
+        if error.get('method') == 'sampled':
+            return f"{value:.{decimals}f} ± {error['stderr']:.{decimals}f}"
+        return f"{value:.{decimals}f}"
+
     def create_agents_analysis(self, results: Dict, key: str = "network"):
             # Get agent states and adoption history from results
             agent_states = results.get('agent_states', [])
@@ -9,6 +9,7 @@ from typing import List
 
 from social.config import SIMULATION_CONFIGS, SimulationConfig
 from social.simulation import SocialDiffusionSimulation
+from app.utils import load_saved_simulation
 
 
 def setup_page():
@@ -68,17 +69,52 @@ def create_sidebar_controls():
             st.sidebar.success(getattr(st.session_state, msg_key))
             delattr(st.session_state, msg_key)
     
-    # Load existing simulation
+    # Load existing simulation (listed from the results catalog, without opening the files)
+    saved_runs = {}
     try:
-        saved_simulations = SocialDiffusionSimulation.get_saved_simulations()
+        catalog = SocialDiffusionSimulation.get_simulation_catalog()
+        try:
+            scenarios = catalog.scenarios()
+            filter_col1, filter_col2 = st.sidebar.columns(2)
+            with filter_col1:
+                scenario_filter = st.selectbox(
+                    "Scenario", ["All"] + scenarios, key="saved_scenario_filter", disabled=disable_sidebar
+                )
+            with filter_col2:
+                sort_options = {
+                    "Newest": ("save_date", True),
+                    "Adoption rate": ("final_adoption_rate", True),
+                    "Steps": ("final_step", False),
+                    "Agents": ("num_agents", True),
+                    "Runtime": ("simulation_time", False),
+                    "Tokens": ("total_tokens", False),
+                    "Tokens/decision": ("tokens_per_decision", False),
+                }
+                sort_by = st.selectbox("Sort by", list(sort_options), key="saved_sort", disabled=disable_sidebar)
+            order_by, descending = sort_options[sort_by]
+            runs = catalog.query(
+                scenario=None if scenario_filter == "All" else scenario_filter,
+                order_by=order_by,
+                descending=descending
+            )
+            saved_runs = {run["file_name"]: run for run in runs}
+        finally:
+            catalog.close()
     except Exception as e:
         st.sidebar.error(f"❌ Error loading saved simulations: {str(e)}")
-        saved_simulations = []
+    saved_simulations = list(saved_runs)
+
+    def format_saved_run(file_name: str) -> str:
+        run = saved_runs.get(file_name)
+        if run is None or run["final_adoption_rate"] is None:
+            return file_name
+        return f"{file_name} · {run['final_adoption_rate']:.0%} · {run['final_step']} steps"
         
     if saved_simulations:
         selected_file = st.sidebar.selectbox(
             "Load saved simulation",
             ["None"] + saved_simulations,
+            format_func=format_saved_run,
             help="Load a previously saved simulation",
             disabled=disable_sidebar
         )
@@ -89,7 +125,7 @@ def create_sidebar_controls():
                 if selected_file != "None":
                     try:
                         filepath = os.path.join("results", selected_file)
-                        simulation = SocialDiffusionSimulation.load_simulation(filepath)
+                        simulation = load_saved_simulation(filepath)
 
                         # Update session state with loaded simulation data
                         st.session_state.simulation = simulation
@@ -229,10 +265,11 @@ def create_sidebar_controls():
     st.session_state.temp_simulation_config.adopter_distribution['Laggard'] = laggards_distribution / 100.0
 
     st.sidebar.markdown("### 🌐 Network Configuration")
+    network_types = ["small_world", "scale_free", "random", "edge_list"]
     network_type = st.sidebar.selectbox(
         "Network Type",
-        ["small_world", "scale_free", "random"],
-        index=["small_world", "scale_free", "random"].index(st.session_state.temp_simulation_config.network_type),
+        network_types,
+        index=network_types.index(st.session_state.temp_simulation_config.network_type),
         disabled=disable_sidebar
     )
     st.session_state.temp_simulation_config.network_type = network_type
@@ -247,10 +284,27 @@ def create_sidebar_controls():
         saved_params = st.session_state.temp_simulation_config.network_params
         m = st.sidebar.slider("Edges per new node (m)", 1, 5, saved_params.get('m', 2), disabled=disable_sidebar)
         network_params = {"m": m}
-    else:  # random
+    elif network_type == "random":
         saved_params = st.session_state.temp_simulation_config.network_params
         p = st.sidebar.slider("Connection Probability", 0.05, 0.5, saved_params.get('p', 0.1), 0.05, disabled=disable_sidebar)
         network_params = {"p": p}
+    else:  # edge_list
+        saved_params = st.session_state.temp_simulation_config.network_params
+        path = st.sidebar.text_input("Edge List File", saved_params.get('path', ''),
+                                     help="SNAP/whitespace text, CSV, NPY or NPZ edge list", disabled=disable_sidebar)
+        category_assignment = st.sidebar.selectbox(
+            "Category Assignment",
+            ["degree", "attribute"],
+            index=["degree", "attribute"].index(saved_params.get('category_assignment', 'degree')),
+            help="Assign adopter categories by degree rank or from a node,category file",
+            disabled=disable_sidebar
+        )
+        network_params = {"path": path, "format": "auto", "category_assignment": category_assignment}
+        if category_assignment == "attribute":
+            network_params["attributes_path"] = st.sidebar.text_input(
+                "Attribute File", saved_params.get('attributes_path', ''), disabled=disable_sidebar
+            )
+        st.sidebar.caption("ℹ️ The number of agents is taken from the edge list")
     st.session_state.temp_simulation_config.network_params = network_params
     
     st.sidebar.markdown("### 💡 Innovation Attributes")
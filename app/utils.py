@@ -7,13 +7,45 @@ import logging
 from typing import List, Dict
 import streamlit as st
 
+from social.config import SimulationConfig
 from social.simulation import SocialDiffusionSimulation
 
+# Loaded results files kept in memory (least recently used are evicted)
+RESULTS_CACHE_SIZE = 4
+
 
 def setup_logging():
     """Setup logging configuration for cleaner Streamlit interface"""
+    logging.basicConfig(level=logging.INFO)
     logging.getLogger('PIL').setLevel(logging.WARNING)
 
+@st.cache_resource(max_entries=RESULTS_CACHE_SIZE, show_spinner=False)
+def _load_results(filepath: str, mtime_ns: int, size: int) -> SocialDiffusionSimulation:
+    """
+    Results of a file, memoized by file identity so changed files are read again
+
+    The results are shared by every session and must not be modified.
+    """
+    return SocialDiffusionSimulation.load_simulation(filepath)
+
+
+def load_saved_simulation(filepath: str) -> SocialDiffusionSimulation:
+    """
+    Load a saved simulation, reusing the results of recently loaded files
+
+    Args:
+        filepath: Path of the results file
+
+    Returns:
+        New simulation (with its own configuration) holding the cached, read-only results
+    """
+    stat = os.stat(filepath)
+    cached = _load_results(filepath, stat.st_mtime_ns, stat.st_size)
+    simulation = SocialDiffusionSimulation(config=SimulationConfig.from_dict(cached.results.get("config", {})))
+    simulation.results = cached.results
+    simulation.results_source = cached.results_source
+    return simulation
+
 def has_completed_simulation():
     """Check if there's a completed simulation available"""
     if 'simulation_data' not in st.session_state:
@@ -22,50 +54,20 @@ def has_completed_simulation():
             st.session_state.simulation_data.get('simulation_object', None) is not None)
 
 def cancel_simulation():
-    """Cancel the currently running simulation task"""    
-    # Cancel the actual task
-    if st.session_state.simulation_task is not None:
-        logging.info("Cancelling simulation task...")
+    """Cancel the currently running simulation"""
+    runner = st.session_state.simulation_runner
+    if runner is not None:
+        logging.info("Cancelling simulation...")
         # Set cancellation flag first
         st.session_state.simulation_cancelled = True
         st.session_state.simulation_running = False
         st.session_state.simulation_started = False
-        st.session_state.simulation_task.cancel()
+        # Cancels the simulation task (and its in-flight LLM requests) on the runner's event loop
+        runner.cancel()
         
-        # Clear task reference
-        st.session_state.simulation_task = None
+        # Clear runner reference
+        st.session_state.simulation_runner = None
     
         logging.info("Simulation cancellation requested by user")
     else:
         st.session_state.wait_for_cancel = True
-
-def calculate_adoption_metrics(step: int) -> Dict:
-    """Calculate adoption metrics for a given step"""
-    simulation = st.session_state.simulation
-    if simulation is None:
-        raise ValueError("No simulation object found in session state")
-
-    if step == 0:
-        return {
-            'total_agents': simulation.agents,
-            'total_adopted': 0,
-            'adoption_rate': 0.0,
-            'new_adoptions': 0
-        }
-    
-    simulation = st.session_state.simulation
-    if step == -1:
-        step = sorted(simulation.results['adoption_history'].keys())[-1]
-
-    total_agents = len(simulation.agents)
-    total_adopted = sum(1 for agent in simulation.agents if agent.has_adopted)
-    adoption_rate = total_adopted / total_agents if total_agents > 0 else 0
-    new_adoptions = sum(1 for agent in simulation.agents 
-                      if agent.has_adopted and agent.adoption_time == step)
-    
-    return {
-        'total_agents': total_agents,
-        'total_adopted': total_adopted,
-        'adoption_rate': adoption_rate,
-        'new_adoptions': new_adoptions
-    }
@@ -10,10 +10,43 @@ from plotly.subplots import make_subplots
 import networkx as nx
 import pandas as pd
 import logging
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from scipy.stats import norm
 
 from social.config import ADOPTER_CATEGORIES
+from social.network_layout import CIRCULAR, LayoutCache
+
+
+@st.cache_resource
+def get_layout_cache() -> LayoutCache:
+    """Layout cache shared by every session of the app"""
+    return LayoutCache()
+
+
+def _get_network_layout(graph: nx.Graph, results: Dict, layout: str) -> np.ndarray:
+    """
+    Node positions from the layout cache
+
+    Layouts stored with loaded results seed the cache. The results are shared
+    between sessions and are only read; computed layouts live in the layout
+    cache (expensive ones are also kept on disk).
+    """
+    layout_cache = get_layout_cache()
+    stored_layouts = results.get("network_layouts")
+    if stored_layouts and layout in stored_layouts and not layout_cache.has(graph, layout):
+        layout_cache.put(graph, layout, stored_layouts[layout], persist=False)
+
+    positions, _ = layout_cache.get(graph, layout)
+    return positions
+
+
+def is_network_layout_pending(layout: str) -> bool:
+    """Whether the requested layout of the current network is still being computed"""
+    simulation = st.session_state.simulation
+    if simulation is None or layout == CIRCULAR:
+        return False
+    graph = simulation.results.get("network_metrics", {}).get("networkx_graph")
+    return graph is not None and get_layout_cache().is_pending(graph, layout)
 
 
 def _create_empty_figure(message: str) -> go.Figure:
@@ -260,44 +293,120 @@ def create_category_adoption_rate_over_time(results: Dict) -> go.Figure:
     fig.update_xaxes(dtick=1)  # Set x-axis ticks to every step
     return fig
 
-def _update_graph_with_agent_attributes(graph: nx.Graph, step: int) -> None:
-    """
-    Update NetworkX graph nodes with current agent attributes.
-    
-    Args:
-        graph: NetworkX graph to update
-        step: Current simulation step
-    """
-    # Create a mapping from agent_id to agent state for quick lookup
-    simulation = st.session_state.simulation
-    if step != 0:
-        adoption_history = simulation.results['adoption_history']
-        agents_results = adoption_history[step]['agents_results']
+# Graphs with more elements than this are drawn with WebGL (Scattergl) traces
+WEBGL_ELEMENT_THRESHOLD = 2000
+
+# Edges drawn by the live view; larger networks show an even sample of them,
+# since Streamlit re-sends the whole figure on every step
+LIVE_EDGE_LIMIT = 20000
+
+CATEGORY_COLORS = {
+    'Innovator': '#ff4757',
+    'EarlyAdopter': '#3742fa',
+    'EarlyMajority': '#2ed573',
+    'LateMajority': '#ffa502',
+    'Laggard': '#747d8c'
+}
 
-    # Update each node with agent attributes
-    for node_idx in graph.nodes():
-        node_data = graph.nodes[node_idx]
-        agent_id = node_data.get('agent_id')
+CATEGORY_SYMBOLS = {
+    'Innovator': 'star',
+    'EarlyAdopter': 'diamond',
+    'EarlyMajority': 'circle',
+    'LateMajority': 'square',
+    'Laggard': 'triangle-up'
+}
 
-        if step != 0:
-            agent_state = agents_results.get(agent_id, {})
-            if agent_state is not None:
-                adoption_time = agent_state.get('adoption_time')
-                has_adopted = agent_state.get('has_adopted', False)
+
+def _step_node_states(agent_ids: List[str], results: Dict, step: int):
+    """
+    Adoption state of every node at a step
+
+    Returns:
+        Tuple (adopted bool array, adoption_time list)
+    """
+    adopted = np.zeros(len(agent_ids), dtype=bool)
+    adoption_times = [None] * len(agent_ids)
+    if step == 0:
+        return adopted, adoption_times
+
+    agents_results = results['adoption_history'][step]['agents_results']
+    for i, agent_id in enumerate(agent_ids):
+        agent_state = agents_results.get(agent_id)
+        if agent_state is not None:
+            adopted[i] = agent_state.get('has_adopted', False)
+            adoption_times[i] = agent_state.get('adoption_time')
+    return adopted, adoption_times
+
+
+def _edge_segments(positions: np.ndarray, sources: np.ndarray, targets: np.ndarray):
+    """Edge line coordinates with NaN separators (rendered as gaps) for a single trace"""
+    x = np.full(len(sources) * 3, np.nan)
+    y = np.full(len(sources) * 3, np.nan)
+    x[0::3], x[1::3] = positions[sources, 0], positions[targets, 0]
+    y[0::3], y[1::3] = positions[sources, 1], positions[targets, 1]
+    return x, y
+
+
+def _node_hover_text(agent_id: str, category: str, adopted: bool, adoption_step, current_step: int) -> str:
+    if adopted:
+        if adoption_step is not None:
+            if adoption_step == current_step:
+                status = f"✅ Status: JUST ADOPTED!<br>⏰ Adoption Step: {adoption_step}<br>🎉 NEW in this step!"
+            elif adoption_step < current_step:
+                status = f"✅ Status: ADOPTED<br>⏰ Adoption Step: {adoption_step}<br>✔️ Adopted {current_step - adoption_step} step(s) ago"
             else:
-                adoption_time = None
-                has_adopted = False
+                status = f"✅ Status: ADOPTED<br>⏰ Adoption Step: {adoption_step}<br>🔥 Innovation Adopted!"
         else:
-            adoption_time = None
-            has_adopted = False
+            status = "✅ Status: ADOPTED<br>⏰ Adoption time unknown"
+        return f"🎯 Agent {agent_id}<br>📊 Category: {category}<br>{status}"
 
-        # Update node attributes
-        graph.nodes[node_idx]['category'] = node_data.get('adopter_category')
-        graph.nodes[node_idx]['adoption_time'] = adoption_time
-        graph.nodes[node_idx]['adopted'] = has_adopted
+    if current_step is not None and adoption_step is not None and adoption_step > current_step:
+        steps_until_adoption = adoption_step - current_step
+        status = f"⏳ Status: WILL ADOPT<br>⏰ Will adopt in step: {adoption_step}<br> - {steps_until_adoption} step(s) to go"
+    else:
+        status = "❌ Status: NOT ADOPTED<br>⏳ Still Evaluating..."
+    return f"👤 Agent {agent_id}<br>📊 Category: {category}<br>{status}"
 
 
-def create_network_graph(current_step: int, selected_agent: str = None) -> go.Figure:
+def _network_figure_layout(title_text: str) -> go.Layout:
+    """Layout shared by the network figures"""
+    return go.Layout(
+        title=dict(
+            text=title_text,
+            font=dict(size=18, color='#2c3e50')
+        ),
+        showlegend=True,
+        hovermode='closest',
+        margin=dict(b=40,l=20,r=20,t=80),
+        annotations=None,
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        height=800,
+        legend=dict(
+            orientation="v",
+            yanchor="top",
+            y=0.98,
+            xanchor="left",
+            x=1.01,
+            font=dict(size=9),
+            itemclick="toggle",
+            itemdoubleclick="toggleothers",
+            title=dict(
+                text="<b>Categories</b>",
+                font=dict(size=10)
+            ),
+            groupclick="toggleitem",
+            bgcolor="rgba(255,255,255,0.9)",
+            bordercolor="rgba(0,0,0,0.1)",
+            borderwidth=1,
+            itemsizing="constant",
+            itemwidth=30,
+            tracegroupgap=2
+        )
+    )
+
+
+def create_network_graph(current_step: int, selected_agent: str = None, layout: str = CIRCULAR) -> go.Figure:
     """Create interactive network graph using Plotly with step-by-step visualization"""
     
     simulation = st.session_state.simulation
@@ -311,191 +420,94 @@ def create_network_graph(current_step: int, selected_agent: str = None) -> go.Fi
     if graph is None:
         raise ValueError("No network graph data available in results")
 
-    # Create NetworkX graph - use saved network data
-    G = graph.copy()  # Create a copy to avoid modifying the original
-    
     if current_step == -1:
         current_step = simulation.results['final_step'] or sorted(simulation.results['adoption_history'])[-1]
-    # Update graph nodes with current agent attributes
-    _update_graph_with_agent_attributes(G, current_step)
-    
-    # Calculate layout - use circular layout for small world networks as requested
-    if G.number_of_nodes() > 1:
-        pos = nx.circular_layout(G)
-    else:
-        pos = {0: (0, 0)} if G.number_of_nodes() == 1 else {}
+
+    # Node and edge arrays in graph node order; the saved graph is never modified
+    nodes = list(graph.nodes())
+    node_index = {node: i for i, node in enumerate(nodes)}
+    agent_ids = [graph.nodes[node].get('agent_id') for node in nodes]
+    category_rank = {category: i for i, category in enumerate(ADOPTER_CATEGORIES)}
+    node_category = np.array([category_rank[graph.nodes[node].get('adopter_category')] for node in nodes], dtype=np.int64)
+    edges = np.array([(node_index[u], node_index[v]) for u, v in graph.edges()], dtype=np.int64).reshape(-1, 2)
+    adopted, adoption_times = _step_node_states(agent_ids, results, current_step)
+
+    # Node positions are computed once per network and cached
+    positions = _get_network_layout(graph, results, layout)
+
+    use_webgl = len(nodes) + len(edges) > WEBGL_ELEMENT_THRESHOLD
+    scatter = go.Scattergl if use_webgl else go.Scatter
     
     # --- Highlight logic ---
-    selected_node = None
-    if selected_agent is not None:
-        for node_idx, node_data in G.nodes(data=True):
-            if node_data.get('agent_id') == selected_agent:
-                selected_node = node_idx
-                break
-
-    highlight_nodes = set()
-    highlight_edges = set()
-    if selected_node is not None and selected_node in G.nodes:
-        # Mark the selected node and its neighbors for highlighting
-        highlight_nodes.add(selected_node)
-        highlight_nodes.update(G.neighbors(selected_node))
-        # Mark edges connecting the selected node to its neighbors for highlighting
-        for neighbor in G.neighbors(selected_node):
-            highlight_edges.add(frozenset((selected_node, neighbor)))
-
-    # Category colors and symbols
-    category_colors = {
-        'Innovator': '#ff4757',        
-        'EarlyAdopter': '#3742fa',     
-        'EarlyMajority': '#2ed573',    
-        'LateMajority': '#ffa502',     
-        'Laggard': '#747d8c'           
-    }
-    
-    category_symbols = {
-        'Innovator': 'star',           
-        'EarlyAdopter': 'diamond',     
-        'EarlyMajority': 'circle',     
-        'LateMajority': 'square',      
-        'Laggard': 'triangle-up'       
-    }
-    
-    # Create edge traces by category for proper show/hide functionality
+    selected_node = agent_ids.index(selected_agent) if selected_agent is not None and selected_agent in agent_ids else None
+    highlighted = np.zeros(len(nodes), dtype=bool)
+    highlight_edges = np.zeros(len(edges), dtype=bool)
+    if selected_node is not None:
+        # Mark the selected node, its neighbors and the edges connecting them for highlighting
+        highlight_edges = (edges[:, 0] == selected_node) | (edges[:, 1] == selected_node)
+        highlighted[edges[highlight_edges].ravel()] = True
+        highlighted[selected_node] = True
+
+    # One edge trace per category; edges between categories take the higher priority one
     node_traces = []
-    
-    for edge in G.edges():
-        node1, node2 = edge
-        cat1 = G.nodes[node1]['category']
-        cat2 = G.nodes[node2]['category']
-        
-        # Determine edge color based on category priority (Innovators > EarlyAdopter > etc.)
-        category_priority = ['Innovator', 'EarlyAdopter', 'EarlyMajority', 'LateMajority', 'Laggard']
-        
-        if cat1 == cat2:
-            # Same category - use that category's color
-            edge_category = cat1
-        else:
-            # Different categories - use the higher priority category
-            if category_priority.index(cat1) <= category_priority.index(cat2):
-                edge_category = cat1
-            else:
-                edge_category = cat2
-        
-        x0, y0 = pos[node1]
-        x1, y1 = pos[node2]
-        is_highlighted = frozenset((node1, node2)) in highlight_edges
-        edge_color = "#e17055" if is_highlighted else category_colors[edge_category]
-        edge_width = 4 if is_highlighted else 1
-        edge_opacity = 1.0 if is_highlighted else 0.4
-
-        edge_trace = go.Scatter(
-            x=[x0, x1, None], y=[y0, y1, None],
-            line=dict(width=edge_width, color=edge_color),
-            opacity=edge_opacity,
+    edge_category = np.minimum(node_category[edges[:, 0]], node_category[edges[:, 1]]) if len(edges) else np.zeros(0, dtype=np.int64)
+    for rank, category in enumerate(ADOPTER_CATEGORIES):
+        mask = (edge_category == rank) & ~highlight_edges
+        if not mask.any():
+            continue
+        x, y = _edge_segments(positions, edges[mask, 0], edges[mask, 1])
+        node_traces.append(scatter(
+            x=x, y=y,
+            line=dict(width=1, color=CATEGORY_COLORS[category]),
+            opacity=0.4,
             hoverinfo='none',
             mode='lines',
             showlegend=False,
-            legendgroup=edge_category,
+            legendgroup=category,
             visible=True
-        )
-        node_traces.append(edge_trace)
-    
-    for category in ADOPTER_CATEGORIES:
-        # Adopted nodes
-        adopted_x, adopted_y, adopted_text = [], [], []
-        adopted_size, adopted_opacity, adopted_line_width = [], [], []
-        for node_idx in G.nodes():
-            node_data = G.nodes[node_idx]
-            if node_data['category'] != category or not node_data.get('adopted', False):
-                continue
-            x, y = pos[node_idx]
-            adopted_x.append(x)
-            adopted_y.append(y)
-            agent_id = node_data['agent_id']
-            adoption_step = node_data.get('adoption_time', None)
-            if adoption_step is not None:
-                if adoption_step == current_step:
-                    status = f"✅ Status: JUST ADOPTED!<br>⏰ Adoption Step: {adoption_step}<br>🎉 NEW in this step!"
-                elif adoption_step < current_step:
-                    status = f"✅ Status: ADOPTED<br>⏰ Adoption Step: {adoption_step}<br>✔️ Adopted {current_step - adoption_step} step(s) ago"
-                else:
-                    status = f"✅ Status: ADOPTED<br>⏰ Adoption Step: {adoption_step}<br>🔥 Innovation Adopted!"
-            else:
-                status = "✅ Status: ADOPTED<br>⏰ Adoption time unknown"
-            adopted_text.append(f"🎯 Agent {agent_id}<br>📊 Category: {category}<br>{status}")
-
-            # Highlight logic
-            if node_idx in highlight_nodes:
-                adopted_size.append(22)
-                adopted_opacity.append(1.0)
-                adopted_line_width.append(6)
-            else:
-                adopted_size.append(18)
-                adopted_opacity.append(0.9 if selected_node is None else 0.2)
-                adopted_line_width.append(3)
+        ))
 
-        if adopted_x:
-            node_traces.append(go.Scatter(
-                x=adopted_x, y=adopted_y,
-                mode='markers',
-                hoverinfo='text',
-                text=adopted_text,
-                marker=dict(
-                    size=adopted_size,
-                    color=category_colors[category],
-                    symbol=category_symbols[category],
-                    line=dict(width=adopted_line_width, color='#00ff00'),
-                    opacity=adopted_opacity
-                ),
-                name=f"{category} (✅ Adopted)",
-                showlegend=True,
-                legendgroup=category,
-                visible=True
-            ))
+    if highlight_edges.any():
+        x, y = _edge_segments(positions, edges[highlight_edges, 0], edges[highlight_edges, 1])
+        node_traces.append(scatter(
+            x=x, y=y,
+            line=dict(width=4, color="#e17055"),
+            opacity=1.0,
+            hoverinfo='none',
+            mode='lines',
+            showlegend=False,
+            visible=True
+        ))
 
-        # Not adopted nodes
-        notadopted_x, notadopted_y, notadopted_text = [], [], []
-        notadopted_size, notadopted_opacity, notadopted_line_width = [], [], []
-        for node_idx in G.nodes():
-            node_data = G.nodes[node_idx]
-            if node_data['category'] != category or node_data.get('adopted', False):
+    for rank, category in enumerate(ADOPTER_CATEGORIES):
+        in_category = node_category == rank
+        for is_adopted in (True, False):
+            members = np.flatnonzero(in_category & (adopted == is_adopted))
+            if len(members) == 0:
                 continue
-            x, y = pos[node_idx]
-            notadopted_x.append(x)
-            notadopted_y.append(y)
-            agent_id = node_data['agent_id']
-            adoption_step = node_data.get('adoption_time', None)
-            if current_step is not None and adoption_step is not None and adoption_step > current_step:
-                steps_until_adoption = adoption_step - current_step
-                status = f"⏳ Status: WILL ADOPT<br>⏰ Will adopt in step: {adoption_step}<br> - {steps_until_adoption} step(s) to go"
-            else:
-                status = "❌ Status: NOT ADOPTED<br>⏳ Still Evaluating..."
-            notadopted_text.append(f"👤 Agent {agent_id}<br>📊 Category: {category}<br>{status}")
-
-            # Highlight logic
-            if node_idx in highlight_nodes:
-                notadopted_size.append(22)
-                notadopted_opacity.append(1.0)
-                notadopted_line_width.append(6)
+
+            is_highlighted = highlighted[members]
+            if is_adopted:
+                size = np.where(is_highlighted, 22, 18)
+                opacity = np.where(is_highlighted, 1.0, 0.9 if selected_node is None else 0.2)
             else:
-                notadopted_size.append(14)
-                notadopted_opacity.append(0.8 if selected_node is None else 0.2)
-                notadopted_line_width.append(3)
+                size = np.where(is_highlighted, 22, 14)
+                opacity = np.where(is_highlighted, 1.0, 0.8 if selected_node is None else 0.2)
+            line_width = np.where(is_highlighted, 6, 3)
 
-        if notadopted_x:
-            node_traces.append(go.Scatter(
-                x=notadopted_x, y=notadopted_y,
+            node_traces.append(scatter(
+                x=positions[members, 0], y=positions[members, 1],
                 mode='markers',
                 hoverinfo='text',
-                text=notadopted_text,
+                text=[_node_hover_text(agent_ids[i], category, is_adopted, adoption_times[i], current_step) for i in members],
                 marker=dict(
-                    size=notadopted_size,
-                    color='white',
-                    symbol=category_symbols[category],
-                    line=dict(width=notadopted_line_width, color=category_colors[category]),
-                    opacity=notadopted_opacity
+                    size=size,
+                    color=CATEGORY_COLORS[category] if is_adopted else 'white',
+                    symbol=CATEGORY_SYMBOLS[category],
+                    line=dict(width=line_width, color='#00ff00' if is_adopted else CATEGORY_COLORS[category]),
+                    opacity=opacity
                 ),
-                name=f"{category} (❌ Not Adopted)",
+                name=f"{category} (✅ Adopted)" if is_adopted else f"{category} (❌ Not Adopted)",
                 showlegend=True,
                 legendgroup=category,
                 visible=True
@@ -512,43 +524,198 @@ def create_network_graph(current_step: int, selected_agent: str = None) -> go.Fi
         title_text += f' (Initial Step)'
     
     # Create figure
-    fig = go.Figure(data=node_traces,
-                   layout=go.Layout(
-                       title=dict(
-                           text=title_text,
-                           font=dict(size=18, color='#2c3e50')
-                       ),
-                       showlegend=True,
-                       hovermode='closest',
-                       margin=dict(b=40,l=20,r=20,t=80),
-                       annotations=None,
-                       xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                       yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                       height=800,
-                       legend=dict(
-                           orientation="v",
-                           yanchor="top",
-                           y=0.98,
-                           xanchor="left",
-                           x=1.01,
-                           font=dict(size=9),
-                           itemclick="toggle",
-                           itemdoubleclick="toggleothers",
-                           title=dict(
-                               text="<b>Categories</b>",
-                               font=dict(size=10)
-                           ),
-                           groupclick="toggleitem",
-                           bgcolor="rgba(255,255,255,0.9)",
-                           bordercolor="rgba(0,0,0,0.1)",
-                           borderwidth=1,
-                           itemsizing="constant",
-                           itemwidth=30,
-                           tracegroupgap=2
-                       )
-                   ))
+    fig = go.Figure(data=node_traces, layout=_network_figure_layout(title_text))
     return fig
 
+class LiveNetworkView:
+    """
+    Network figure of a running simulation, updated in place step by step
+
+    The edge traces are built once; each step only moves the nodes whose
+    adoption state changed between the per-category node traces. The hover
+    text of a node does not depend on the step, and at most max_edges edges
+    are drawn, so per-step work scales with the number of agents and not
+    with the number of edges.
+    """
+
+    def __init__(self, graph: nx.Graph, results: Dict, layout: str = CIRCULAR, max_edges: int = LIVE_EDGE_LIMIT):
+        """
+        Build the static part of the figure
+
+        Args:
+            graph: Network of the simulation
+            results: Simulation results (used for stored layouts)
+            layout: Layout algorithm
+            max_edges: Maximum number of edges drawn
+        """
+        nodes = list(graph.nodes())
+        node_index = {node: i for i, node in enumerate(nodes)}
+        category_rank = {category: i for i, category in enumerate(ADOPTER_CATEGORIES)}
+        self.agent_ids = [graph.nodes[node].get('agent_id') for node in nodes]
+        self._agent_index = {agent_id: i for i, agent_id in enumerate(self.agent_ids)}
+        self._node_category = np.array(
+            [category_rank[graph.nodes[node].get('adopter_category')] for node in nodes], dtype=np.int64
+        )
+        self._positions = _get_network_layout(graph, results, layout)
+        self._adopted = np.zeros(len(nodes), dtype=bool)
+        self._adoption_step = np.zeros(len(nodes), dtype=np.int64)
+        self._node_text = np.array([
+            f"Agent {agent_id}<br>📊 Category: {graph.nodes[node].get('adopter_category')}"
+            for node, agent_id in zip(nodes, self.agent_ids)
+        ], dtype=object)
+        self.step = 0
+
+        edges = np.array([(node_index[u], node_index[v]) for u, v in graph.edges()], dtype=np.int64).reshape(-1, 2)
+        self.total_edges = len(edges)
+        if len(edges) > max_edges:
+            edges = edges[np.sort(np.random.default_rng(0).choice(len(edges), max_edges, replace=False))]
+        self.drawn_edges = len(edges)
+        scatter = go.Scattergl if len(nodes) + len(edges) > WEBGL_ELEMENT_THRESHOLD else go.Scatter
+
+        traces = []
+        edge_category = np.minimum(self._node_category[edges[:, 0]], self._node_category[edges[:, 1]]) \
+            if len(edges) else np.zeros(0, dtype=np.int64)
+        for rank, category in enumerate(ADOPTER_CATEGORIES):
+            mask = edge_category == rank
+            if not mask.any():
+                continue
+            x, y = _edge_segments(self._positions, edges[mask, 0], edges[mask, 1])
+            traces.append(scatter(
+                x=x.astype(np.float32), y=y.astype(np.float32),
+                line=dict(width=1, color=CATEGORY_COLORS[category]),
+                opacity=0.4,
+                hoverinfo='none',
+                mode='lines',
+                showlegend=False,
+                legendgroup=category
+            ))
+
+        # One node trace per (category, adopted) pair, always present so that trace indices stay fixed
+        self._node_traces = {}
+        for rank, category in enumerate(ADOPTER_CATEGORIES):
+            for is_adopted in (True, False):
+                self._node_traces[(rank, is_adopted)] = len(traces)
+                if is_adopted:
+                    hovertemplate = "🎯 %{text}<br>✅ Status: ADOPTED<br>⏰ Adoption Step: %{customdata}<extra></extra>"
+                else:
+                    hovertemplate = "👤 %{text}<br>❌ Status: NOT ADOPTED<br>⏳ Still Evaluating...<extra></extra>"
+                traces.append(scatter(
+                    x=[], y=[],
+                    mode='markers',
+                    hovertemplate=hovertemplate,
+                    marker=dict(
+                        size=18 if is_adopted else 14,
+                        color=CATEGORY_COLORS[category] if is_adopted else 'white',
+                        symbol=CATEGORY_SYMBOLS[category],
+                        line=dict(width=3, color='#00ff00' if is_adopted else CATEGORY_COLORS[category]),
+                        opacity=0.9 if is_adopted else 0.8
+                    ),
+                    name=f"{category} (✅ Adopted)" if is_adopted else f"{category} (❌ Not Adopted)",
+                    showlegend=True,
+                    legendgroup=category
+                ))
+
+        self.figure = go.Figure(data=traces, layout=_network_figure_layout(""))
+        # Keep zoom, pan and legend selections across step updates
+        self.figure.update_layout(uirevision="live_network")
+        self._refresh(range(len(ADOPTER_CATEGORIES)))
+
+    def _refresh(self, ranks):
+        """Rewrite the node traces of the given categories from the adoption state"""
+        with self.figure.batch_update():
+            for rank in ranks:
+                in_category = self._node_category == rank
+                for is_adopted in (True, False):
+                    members = np.flatnonzero(in_category & (self._adopted == is_adopted))
+                    trace = self.figure.data[self._node_traces[(rank, is_adopted)]]
+                    trace.x = self._positions[members, 0]
+                    trace.y = self._positions[members, 1]
+                    trace.text = self._node_text[members]
+                    trace.customdata = self._adoption_step[members] if is_adopted else None
+
+    def update(self, step: int, agents_results: Dict) -> go.Figure:
+        """
+        Apply the adoption state of a step
+
+        Args:
+            step: Simulation step
+            agents_results: Agent results of the step
+
+        Returns:
+            The updated figure
+        """
+        changed = set()
+        for agent_id, agent_state in agents_results.items():
+            i = self._agent_index.get(agent_id)
+            if i is None or self._adopted[i] or not agent_state.get('has_adopted', False):
+                continue
+            self._adopted[i] = True
+            adoption_time = agent_state.get('adoption_time')
+            self._adoption_step[i] = adoption_time if adoption_time is not None else step
+            changed.add(int(self._node_category[i]))
+
+        if changed:
+            self._refresh(sorted(changed))
+        self.step = step
+        title_text = 'Social Network: Innovation Diffusion Visualization'
+        title_text += f' (Step {step})' if step != 0 else ' (Initial Step)'
+        self.figure.layout.title.text = title_text
+        return self.figure
+
+
+# Figures kept in memory (least recently used are evicted)
+FIGURE_CACHE_SIZE = 64
+
+RESULTS_FIGURES = {
+    "adoption_curve": create_adoption_curve,
+    "category_analysis": create_category_analysis,
+    "category_adoption_over_time": create_category_adoption_rate_over_time,
+}
+
+
+def results_cache_key(simulation) -> Tuple:
+    """
+    Identity of a simulation's results for memoization
+
+    Loaded results are identified by their file (path, mtime and size), so a
+    rewritten file is never served from the cache; results of a run made in
+    this session by its configuration and start time.
+    """
+    if simulation.results_source is not None:
+        return simulation.results_source
+    return ("run", simulation.config.config_hash(), simulation.simulation_start_time, simulation.results.get("final_step"))
+
+
+# Cached as data so that every caller gets its own copy of the figure
+@st.cache_data(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def _memoized_results_figure(figure_name: str, results_key: Tuple, _results: Dict) -> go.Figure:
+    return RESULTS_FIGURES[figure_name](_results)
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def _memoized_network_graph(results_key: Tuple, current_step: int, selected_agent, layout: str, layout_ready: bool) -> go.Figure:
+    return create_network_graph(current_step, selected_agent=selected_agent, layout=layout)
+
+
+def get_results_figure(figure_name: str) -> go.Figure:
+    """
+    Figure of the current simulation's results, built once per results
+
+    Args:
+        figure_name: One of RESULTS_FIGURES
+    """
+    simulation = st.session_state.simulation
+    return _memoized_results_figure(figure_name, results_cache_key(simulation), simulation.results)
+
+
+def get_network_graph(current_step: int, selected_agent: str = None, layout: str = CIRCULAR) -> go.Figure:
+    """Memoized create_network_graph (figures drawn with a fallback layout are rebuilt once the layout is ready)"""
+    simulation = st.session_state.simulation
+    graph = simulation.results.get("network_metrics", {}).get("networkx_graph")
+    layout_ready = layout == CIRCULAR or (graph is not None and get_layout_cache().has(graph, layout))
+    return _memoized_network_graph(results_cache_key(simulation), current_step, selected_agent, layout, layout_ready)
+
+
 def display_simulation_summary(results: Dict):
     """Display simulation summary metrics"""
 
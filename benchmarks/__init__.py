@@ -0,0 +1,3 @@
+"""
+Benchmarks of the simulation (run with python -m benchmarks.<module>)
+"""
@@ -0,0 +1,116 @@
+"""
+Deterministic, zero-latency stand-in for the LLM backend
+
+Benchmarks swap the Ollama clients (one per model route, shared by its
+agents) for FakeDecisionClients, so simulation overhead can be timed without
+a model server. Decisions are pseudo-random but reproducible: they depend
+only on the seed, the order in which clients are created and the call count.
+Answers hold the fields the agent's system prompt asks for, in its order,
+so every response profile and streaming mode can be benchmarked.
+"""
+
+import asyncio
+import contextlib
+import json
+import random
+from typing import AsyncGenerator, Iterator, Union
+
+from autogen_core.models import CreateResult, RequestUsage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+import social.agent
+import social.model
+
+
+class FakeDecisionClient(ReplayChatCompletionClient):
+    """Chat completion client answering every request with a valid decision JSON"""
+
+    # Characters per streamed chunk (about one token)
+    CHUNK_SIZE = 4
+
+    def __init__(self, seed: int, adopt_probability: float = 0.2, latency: float = 0.0, token_latency: float = 0.0):
+        """
+        Args:
+            seed: Seed of this client's decisions
+            adopt_probability: Probability of answering ADOPT
+            latency: Seconds to wait before answering
+            token_latency: Seconds to generate each chunk of the answer
+        """
+        super().__init__([])
+        self.adopt_probability = adopt_probability
+        self.latency = latency
+        self.token_latency = token_latency
+        self._random = random.Random(seed)
+
+    # Fields left out of the answer when the system prompt does not ask for them
+    OPTIONAL_FIELDS = ("thinking", "reasoning")
+
+    def _decision(self, system_prompt: str) -> str:
+        adopt = self._random.random() < self.adopt_probability
+        answer = {
+            "thinking": "Weighing the adoption in my network against my own needs.",
+            "decision": "ADOPT" if adopt else "NOT_ADOPT",
+            "reasoning": "Enough of my connections benefit from it." if adopt else "I need more evidence first.",
+            "network_influence_level": self._random.randint(0, 10),
+            "global_influence_level": self._random.randint(0, 10),
+            "confidence_level": self._random.randint(0, 10),
+        }
+        for key in self.OPTIONAL_FIELDS:
+            if f'"{key}"' not in system_prompt:
+                del answer[key]
+        order = sorted(answer, key=lambda key: system_prompt.find(f'"{key}"'))
+        return json.dumps({key: answer[key] for key in order})
+
+    async def create(self, messages, *, cancellation_token=None, **kwargs) -> CreateResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        content = self._decision(messages[0].content if messages else "")
+        if self.token_latency:
+            await asyncio.sleep(self.token_latency * -(-len(content) // self.CHUNK_SIZE))
+        return self._result(messages, content)
+
+    async def create_stream(self, messages, *, cancellation_token=None,
+                            **kwargs) -> AsyncGenerator[Union[str, CreateResult], None]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        content = self._decision(messages[0].content if messages else "")
+        for start in range(0, len(content), self.CHUNK_SIZE):
+            if self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            yield content[start:start + self.CHUNK_SIZE]
+        yield self._result(messages, content)
+
+    def _result(self, messages, content: str) -> CreateResult:
+        # Rough token counts (4 characters per token) without tokenizing the whole context
+        prompt_tokens = sum(len(message.content) for message in messages if isinstance(message.content, str)) // 4
+        self._cur_usage = RequestUsage(prompt_tokens=prompt_tokens, completion_tokens=len(content) // 4)
+        self._update_total_usage()
+        return CreateResult(finish_reason="stop", content=content, usage=self._cur_usage, cached=False)
+
+
+@contextlib.contextmanager
+def fake_llm_backend(seed: int = 0, adopt_probability: float = 0.2, latency: float = 0.0,
+                     token_latency: float = 0.0) -> Iterator[None]:
+    """
+    Give LLM clients created inside the block a FakeDecisionClient
+
+    Args:
+        seed: Base seed; the n-th client created uses seed + n
+        adopt_probability: Probability of answering ADOPT
+        latency: Seconds each request takes
+        token_latency: Seconds each chunk of an answer takes
+    """
+    created = 0
+
+    def create_fake_client(*args, **kwargs):
+        nonlocal created
+        created += 1
+        return FakeDecisionClient(seed + created, adopt_probability=adopt_probability, latency=latency,
+                                  token_latency=token_latency)
+
+    originals = social.agent.create_llm_client, social.model.create_llm_client
+    social.agent.create_llm_client = social.model.create_llm_client = create_fake_client
+    try:
+        yield
+    finally:
+        social.agent.create_llm_client, social.model.create_llm_client = originals
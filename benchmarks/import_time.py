@@ -0,0 +1,109 @@
+"""
+Import-time budget of the light entry points
+
+Configuration handling, result loading and analytics must not pay for the
+LLM backend or NetworkX at import. Every entry point is imported in a fresh
+interpreter; the check fails when an import exceeds its budget or loads one
+of the heavy backends.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --profile social.simulation   # slowest imports
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Entry point -> import budget in seconds (best of the repetitions)
+IMPORT_BUDGETS = {
+    "social.config": 0.25,
+    "social.results_store": 0.5,
+    "social.results_catalog": 0.5,
+    "social.simulation": 0.5,
+    "social.analytics": 0.9,
+}
+
+# Backends only needed to create agents or generate networks
+HEAVY_MODULES = ("autogen_core", "autogen_agentchat", "autogen_ext", "ollama", "networkx")
+
+_MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _environment() -> Dict[str, str]:
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [repo_root, os.environ.get("PYTHONPATH")])))
+
+
+def measure_import(module: str, repeat: int = 5) -> Dict:
+    """
+    Import a module in fresh interpreters
+
+    Args:
+        module: Module to import
+        repeat: Interpreters to start (the best time is kept)
+
+    Returns:
+        Dict with the best import time and the heavy modules it loaded
+    """
+    code = _MEASURE.format(module=module, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-c", code], env=_environment(), capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return {"seconds": min(run["seconds"] for run in runs), "loaded": runs[0]["loaded"]}
+
+
+def profile_import(module: str, top: int = 20) -> List[str]:
+    """Slowest imports (cumulative) triggered by importing a module, from -X importtime"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               env=_environment(), capture_output=True, text=True)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    rows.sort(reverse=True)
+    return [f"{cumulative / 1e6:8.3f}s {name}" for cumulative, name in rows[:top]]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time budget of the light entry points")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per entry point")
+    parser.add_argument("--profile", metavar="MODULE", help="print the slowest imports of MODULE and exit")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        print("\n".join(profile_import(args.profile)))
+        return 0
+
+    failures = 0
+    print(f"{'entry point':<28} {'import':>9} {'budget':>8}  status")
+    for module, budget in IMPORT_BUDGETS.items():
+        result = measure_import(module, args.repeat)
+        problems = []
+        if result["seconds"] > budget:
+            problems.append("over budget")
+        if result["loaded"]:
+            problems.append("loads " + ", ".join(result["loaded"]))
+        failures += bool(problems)
+        print(f"{module:<28} {result['seconds']:8.3f}s {budget:7.2f}s  {'; '.join(problems) or 'ok'}")
+
+    print(f"{failures} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,396 @@
+"""
+Micro-benchmarks of the non-LLM hot paths
+
+Times network generation and validation, step orchestration with a
+zero-latency fake LLM backend, decision parsing, results persistence and
+network figure construction. Every run is compared with the most recent
+stored baseline and can be stored as the new one.
+
+Usage:
+    python -m benchmarks.micro                   # run and compare with the latest baseline
+    python -m benchmarks.micro --save            # ... and store the run as the new baseline
+    python -m benchmarks.micro -k network        # only benchmarks whose name contains "network"
+    python -m benchmarks.micro --fail-on-regression
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.fake_backend import fake_llm_backend
+from social.agent import DecisionStreamParser, SocialAgent
+from social.config import SimulationConfig
+from social.network import NetworkGenerator
+from social.prompts import DiffusionPrompts
+from social.simulation import SocialDiffusionSimulation
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+BASELINE_PREFIX = "micro_"
+
+# Slowdown (ratio of best times) reported as a regression
+DEFAULT_THRESHOLD = 1.25
+# Differences below this many seconds are treated as noise
+NOISE_FLOOR = 0.0005
+
+NETWORK_TYPES = ("small_world", "scale_free", "random")
+NETWORK_SIZES = (100, 1000)
+
+SAMPLE_OUTPUT = """Here is my decision:
+{
+  "thinking": "Three of my five connections adopted and report clear, practical benefits.",
+  "decision": "ADOPT",
+  "reasoning": "The evidence from people I trust outweighs my remaining doubts about cost.",
+  "network_influence_level": 8,
+  "global_influence_level": 4,
+  "confidence_level": 7,
+}"""
+
+
+@dataclass
+class Benchmark:
+    """A timed function and its (untimed) per-repetition setup"""
+    name: str
+    function: Callable[[Any], Any]
+    setup: Optional[Callable[[], Any]] = None
+    # Calls of function per timed repetition (for very fast functions)
+    number: int = 1
+
+
+def _config(num_agents: int, network_type: str = "small_world", **kwargs) -> SimulationConfig:
+    return SimulationConfig(
+        num_agents=num_agents,
+        network_type=network_type,
+        network_seed=42,
+        network_cache_enabled=False,
+        **kwargs
+    )
+
+
+def _agents(config: SimulationConfig) -> List[SocialAgent]:
+    with fake_llm_backend():
+        simulation = SocialDiffusionSimulation(config)
+        simulation._create_agents()
+    return simulation.agents
+
+
+def _simulation(num_agents: int, **kwargs) -> SocialDiffusionSimulation:
+    with fake_llm_backend(seed=num_agents):
+        simulation = SocialDiffusionSimulation(_config(num_agents, stream_results=False, **kwargs))
+        simulation.initialize_simulation()
+    return simulation
+
+
+def _completed_simulation(num_agents: int, max_steps: int) -> SocialDiffusionSimulation:
+    simulation = _simulation(num_agents, max_steps=max_steps, early_stop_no_adoption_steps=None, speed_up=False)
+    asyncio.run(simulation.run_simulation())
+    return simulation
+
+
+def _network_benchmarks() -> List[Benchmark]:
+    benchmarks = []
+    for network_type in NETWORK_TYPES:
+        for size in NETWORK_SIZES:
+            config = _config(size, network_type)
+            agents = _agents(config)
+            benchmarks.append(Benchmark(
+                f"create_network[{network_type}-{size}]",
+                lambda _, agents=agents, config=config: NetworkGenerator.create_network(agents, config)
+            ))
+
+    config = _config(1000)
+    agents = _agents(config)
+    NetworkGenerator.create_network(agents, config)
+    benchmarks.append(Benchmark(
+        "validate_network[1000]",
+        lambda _: NetworkGenerator.validate_network(agents, mode=config.network_validation_mode, seed=42)
+    ))
+    return benchmarks
+
+
+def _orchestration_benchmarks() -> List[Benchmark]:
+    benchmarks = []
+    for size in NETWORK_SIZES:
+        simulation = _simulation(size, speed_up=False)
+        agents = simulation.agents
+
+        def reset(agents=agents):
+            async def clear_contexts():
+                for agent in agents:
+                    await agent.model_context.clear()
+            for agent in agents:
+                agent.has_adopted = False
+                agent.adoption_time = None
+                agent.adoption_attempts = 0
+            asyncio.run(clear_contexts())
+
+        benchmarks.append(Benchmark(
+            f"freeze_state[{size}]",
+            lambda _, agents=agents: [agent.freeze_state(0.1) for agent in agents],
+            number=10
+        ))
+        benchmarks.append(Benchmark(
+            f"orchestrate_group_decision[{size}]",
+            lambda _, simulation=simulation: asyncio.run(simulation.orchestrator.orchestrate_group_decision(1)),
+            setup=reset
+        ))
+    return benchmarks
+
+
+def _stream_parse(chunks: List[str]) -> Dict:
+    parser = DecisionStreamParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.fields
+
+
+def _parsing_benchmarks() -> List[Benchmark]:
+    # Token-sized chunks, as a streamed answer arrives
+    chunks = [SAMPLE_OUTPUT[start:start + 4] for start in range(0, len(SAMPLE_OUTPUT), 4)]
+    return [
+        Benchmark("parse_reasoning", lambda _: SocialAgent.parse_reasoning(SAMPLE_OUTPUT), number=1000),
+        Benchmark("stream_parse_decision", lambda _: _stream_parse(chunks), number=1000),
+    ]
+
+
+def _prompt_benchmarks() -> List[Benchmark]:
+    config = _config(1000)
+    return [
+        Benchmark("create_agents[1000]", lambda _: _agents(config)),
+        Benchmark("create_agent_system_prompt",
+                  lambda _: DiffusionPrompts.create_agent_system_prompt("agent_0", "EarlyAdopter", config), number=1000),
+        Benchmark("create_adoption_decision_prompt",
+                  lambda _: DiffusionPrompts.create_adoption_decision_prompt(0.125, 3, 8, 2, config), number=1000),
+    ]
+
+
+def _persistence_benchmarks() -> List[Benchmark]:
+    simulation = _completed_simulation(1000, max_steps=5)
+    saved = {}
+
+    def save(_):
+        saved["path"] = simulation.save_results("benchmark")
+
+    def load(_):
+        results = SocialDiffusionSimulation.load_simulation(saved["path"]).results
+        # Files are read lazily, touch every step
+        for step in results["adoption_history"]:
+            results["adoption_history"][step]["agents_results"]
+
+    return [
+        Benchmark("save_results[1000x5]", save),
+        Benchmark("load_simulation[1000x5]", load),
+    ]
+
+
+def _visualization_benchmarks() -> List[Benchmark]:
+    import streamlit as st
+    from app.visualizations import create_network_graph
+
+    simulation = _completed_simulation(1000, max_steps=3)
+    st.session_state.simulation = simulation
+    return [
+        Benchmark("create_network_graph[1000]", lambda _: create_network_graph(-1)),
+        Benchmark("create_network_graph[1000-highlight]",
+                  lambda _: create_network_graph(-1, selected_agent=simulation.agents[0].agent_id)),
+    ]
+
+
+BENCHMARK_GROUPS = (
+    _network_benchmarks,
+    _orchestration_benchmarks,
+    _parsing_benchmarks,
+    _prompt_benchmarks,
+    _persistence_benchmarks,
+    _visualization_benchmarks,
+)
+
+
+def run_benchmark(benchmark: Benchmark, repeat: int) -> Dict:
+    """
+    Time a benchmark
+
+    Returns:
+        Dictionary with the best, median and mean time of one call (seconds)
+    """
+    timings = []
+    for _ in range(repeat):
+        state = benchmark.setup() if benchmark.setup else None
+        start = time.perf_counter()
+        for _ in range(benchmark.number):
+            benchmark.function(state)
+        timings.append((time.perf_counter() - start) / benchmark.number)
+    return {
+        "best": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "repeat": repeat,
+        "number": benchmark.number,
+    }
+
+
+def run_suite(pattern: Optional[str] = None, repeat: int = 5) -> Dict:
+    """
+    Run the benchmarks (in a scratch working directory)
+
+    Args:
+        pattern: Only run benchmarks whose name contains this string
+        repeat: Timed repetitions per benchmark
+
+    Returns:
+        Run dictionary (machine info and per-benchmark timings)
+    """
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="benchmarks_") as scratch:
+        os.chdir(scratch)
+        try:
+            for group in BENCHMARK_GROUPS:
+                benchmarks = group()
+                for benchmark in benchmarks:
+                    if pattern and pattern not in benchmark.name:
+                        continue
+                    results[benchmark.name] = run_benchmark(benchmark, repeat)
+                    print(f"  {benchmark.name:<40} {_format_time(results[benchmark.name]['best'])}", flush=True)
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "benchmarks": results,
+    }
+
+
+def latest_baseline(baseline_dir: str = BASELINE_DIR) -> Optional[str]:
+    """Path of the most recent stored baseline"""
+    if not os.path.isdir(baseline_dir):
+        return None
+    files = sorted(f for f in os.listdir(baseline_dir) if f.startswith(BASELINE_PREFIX) and f.endswith(".json"))
+    return os.path.join(baseline_dir, files[-1]) if files else None
+
+
+def save_baseline(run: Dict, baseline_dir: str = BASELINE_DIR) -> str:
+    """Store a run as the new baseline"""
+    os.makedirs(baseline_dir, exist_ok=True)
+    path = os.path.join(baseline_dir, f"{BASELINE_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump(run, f, indent=2)
+    return path
+
+
+def _format_time(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds:8.3f} s "
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Compare the best times of two runs
+
+    Returns:
+        One row per benchmark with its status: "regression", "improvement",
+        "unchanged", "new" or "missing"
+    """
+    rows = []
+    names = list(current["benchmarks"]) + [name for name in baseline["benchmarks"] if name not in current["benchmarks"]]
+    for name in names:
+        before = baseline["benchmarks"].get(name, {}).get("best")
+        after = current["benchmarks"].get(name, {}).get("best")
+        if before is None or after is None:
+            rows.append({"name": name, "baseline": before, "current": after, "ratio": None,
+                         "status": "new" if before is None else "missing"})
+            continue
+        ratio = after / before if before > 0 else float("inf")
+        status = "unchanged"
+        if abs(after - before) > NOISE_FLOOR:
+            if ratio > threshold:
+                status = "regression"
+            elif ratio < 1 / threshold:
+                status = "improvement"
+        rows.append({"name": name, "baseline": before, "current": after, "ratio": ratio, "status": status})
+    return rows
+
+
+def format_report(rows: List[Dict], baseline_path: str) -> str:
+    """Comparison table as text"""
+    lines = [
+        f"Compared with {os.path.basename(baseline_path)}",
+        f"{'benchmark':<40} {'baseline':>11} {'current':>11} {'ratio':>7}  status",
+    ]
+    for row in rows:
+        baseline = _format_time(row["baseline"]) if row["baseline"] is not None else f"{'-':>11}"
+        current = _format_time(row["current"]) if row["current"] is not None else f"{'-':>11}"
+        ratio = f"{row['ratio']:6.2f}x" if row["ratio"] is not None else f"{'-':>7}"
+        status = row["status"].upper() if row["status"] == "regression" else row["status"]
+        lines.append(f"{row['name']:<40} {baseline} {current} {ratio}  {status}")
+    regressions = sum(1 for row in rows if row["status"] == "regression")
+    lines.append(f"{regressions} regression(s)")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the simulation hot paths")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions per benchmark")
+    parser.add_argument("--baseline", help="baseline to compare with (default: the latest stored one)")
+    parser.add_argument("--save", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--output", help="also write this run to a JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown ratio reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on regressions")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    # Keep the simulation's own logging out of the timings
+    logging.disable(logging.WARNING)
+
+    baseline_path = args.baseline or latest_baseline()
+
+    print("Running benchmarks...")
+    run = run_suite(args.pattern, args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+
+    regressions = 0
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        if args.pattern:
+            baseline["benchmarks"] = {
+                name: timing for name, timing in baseline["benchmarks"].items() if args.pattern in name
+            }
+        rows = compare(baseline, run, args.threshold)
+        print()
+        print(format_report(rows, baseline_path))
+        regressions = sum(1 for row in rows if row["status"] == "regression")
+    else:
+        print("No baseline to compare with, store one with --save")
+
+    if args.save:
+        print(f"Baseline stored in {save_baseline(run)}")
+
+    return 1 if args.fail_on_regression and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Population scaling harness
+
+Runs complete simulations with the deterministic fake LLM backend for
+growing populations and records the wall-clock time of every phase and the
+peak resident memory. Each population size runs in its own process, so the
+peak RSS of one size is not inflated by the previous ones.
+
+Usage:
+    python -m benchmarks.scaling                        # N = 100, 1k, 10k, 100k
+    python -m benchmarks.scaling --sizes 100 1000 --steps 5
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from benchmarks.fake_backend import fake_llm_backend
+from social.config import SimulationConfig
+from social.network import NetworkGenerator
+from social.orchestrator import AgentOrchestrator
+from social.simulation import SocialDiffusionSimulation
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+DEFAULT_OUTPUT_DIR = os.path.join("benchmarks", "results")
+
+PHASES = (
+    "agent_creation",
+    "network_generation",
+    "network_validation",
+    "statistics",
+    "steps",
+    "persistence",
+)
+
+COLUMNS = (
+    ["num_agents", "total_edges", "steps", "decisions"]
+    + [f"{phase}_s" for phase in PHASES]
+    + ["step_bookkeeping_s", "decision_calls_s", "total_s", "peak_rss_mb"]
+    + [f"rss_after_{phase}_mb" for phase in PHASES]
+)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(num_agents: int, steps: int, seed: int = 0, adopt_probability: float = 0.1) -> Dict:
+    """
+    Run one simulation and time its phases
+
+    Args:
+        num_agents: Population size
+        steps: Simulation steps (early stopping is disabled)
+        seed: Seed of the network and the fake decisions
+        adopt_probability: Probability of a fake ADOPT decision
+
+    Returns:
+        Row with one value per COLUMNS entry
+    """
+    row = {"num_agents": num_agents}
+    config = SimulationConfig(
+        name=f"scaling_{num_agents}",
+        num_agents=num_agents,
+        network_seed=seed,
+        network_cache_enabled=False,
+        max_steps=steps,
+        early_stop_no_adoption_steps=None,
+        speed_up=False,
+    )
+    start = time.perf_counter()
+
+    def phase(name: str, phase_start: float):
+        row[f"{name}_s"] = time.perf_counter() - phase_start
+        row[f"rss_after_{name}_mb"] = peak_rss_mb()
+
+    with fake_llm_backend(seed=seed, adopt_probability=adopt_probability):
+        simulation = SocialDiffusionSimulation(config)
+
+        # Same sequence as initialize_simulation, timed phase by phase
+        phase_start = time.perf_counter()
+        simulation._create_agents()
+        phase("agent_creation", phase_start)
+
+        phase_start = time.perf_counter()
+        network_metrics = NetworkGenerator.create_network(simulation.agents, config)
+        simulation.results["network_metrics"] = network_metrics
+        phase("network_generation", phase_start)
+
+        phase_start = time.perf_counter()
+        NetworkGenerator.validate_network(simulation.agents, mode=config.network_validation_mode, seed=seed)
+        phase("network_validation", phase_start)
+
+        # Deferred metrics are computed on first access; this is what the app's results
+        # view pays when it shows them. save_results stores only the metrics resolved so
+        # far (cacheable()) and never computes pending ones, so persistence excludes it
+        phase_start = time.perf_counter()
+        for metric in ("avg_clustering", "avg_shortest_path", "diameter"):
+            network_metrics.get(metric)
+        phase("statistics", phase_start)
+
+        simulation.orchestrator = AgentOrchestrator(simulation.agents, config)
+
+        phase_start = time.perf_counter()
+        asyncio.run(simulation.run_simulation())
+        phase("steps", phase_start)
+
+    phase_start = time.perf_counter()
+    simulation.save_results(config.name)
+    phase("persistence", phase_start)
+
+    # Split step time into the LLM calls and the simulation's own bookkeeping
+    history = simulation.results["adoption_history"]
+    decision_calls = 0.0
+    decisions = 0
+    for step in history:
+        for record in history[step]["agents_results"].values():
+            if not record.get("adopted_before"):
+                decision_calls += record["decision_time"]
+                decisions += 1
+
+    row["total_edges"] = network_metrics["total_edges"]
+    row["steps"] = len(history)
+    row["decisions"] = decisions
+    row["decision_calls_s"] = decision_calls
+    row["step_bookkeeping_s"] = row["steps_s"] - decision_calls
+    row["total_s"] = time.perf_counter() - start
+    row["peak_rss_mb"] = peak_rss_mb()
+    return row
+
+
+def run_isolated(num_agents: int, steps: int, seed: int) -> Dict:
+    """Run measure() in a fresh interpreter (in a scratch working directory)"""
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [repo_root, os.environ.get("PYTHONPATH")])))
+    with tempfile.TemporaryDirectory(prefix="scaling_") as scratch:
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.scaling", "--single", str(num_agents),
+             "--steps", str(steps), "--seed", str(seed)],
+            cwd=scratch, env=env, capture_output=True, text=True
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Scaling run for N={num_agents} failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def write_csv(rows: List[Dict], path: str):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({column: row.get(column) for column in COLUMNS})
+
+
+def write_plot(rows: List[Dict], path: str):
+    """Log-log plot of phase times and peak memory against population size"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    sizes = [row["num_agents"] for row in rows]
+    fig = make_subplots(rows=1, cols=2, subplot_titles=("Wall-clock time per phase", "Peak RSS"))
+    for phase in PHASES + ("step_bookkeeping",):
+        fig.add_trace(go.Scatter(x=sizes, y=[row[f"{phase}_s"] for row in rows], mode="lines+markers", name=phase),
+                      row=1, col=1)
+    fig.add_trace(go.Scatter(x=sizes, y=[row["peak_rss_mb"] for row in rows], mode="lines+markers",
+                             name="peak RSS", line=dict(color="black")), row=1, col=2)
+    fig.update_xaxes(type="log", title_text="Agents")
+    fig.update_yaxes(type="log", title_text="Seconds", row=1, col=1)
+    fig.update_yaxes(type="log", title_text="MiB", row=1, col=2)
+    fig.update_layout(title="Simulation scaling (fake zero-latency LLM backend)", height=550)
+    fig.write_html(path, include_plotlyjs="cdn")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Population scaling harness")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="population sizes")
+    parser.add_argument("--steps", type=int, default=3, help="simulation steps per run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="directory for the CSV and the plot")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    logging.disable(logging.WARNING)
+
+    if args.single is not None:
+        # Child process: print the row as JSON
+        print(json.dumps(measure(args.single, args.steps, args.seed)))
+        return 0
+
+    rows = []
+    for size in args.sizes:
+        print(f"N={size:>7} ...", end=" ", flush=True)
+        row = run_isolated(size, args.steps, args.seed)
+        rows.append(row)
+        print(f"{row['total_s']:8.2f}s  peak RSS {row['peak_rss_mb']:8.1f} MiB  "
+              + "  ".join(f"{phase} {row[f'{phase}_s']:.2f}s" for phase in PHASES))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    stem = os.path.join(args.output_dir, f"scaling_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    write_csv(rows, stem + ".csv")
+    write_plot(rows, stem + ".html")
+    print(f"Results written to {stem}.csv and {stem}.html")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
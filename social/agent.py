@@ -2,21 +2,22 @@ import asyncio
 import json
 import logging
 import re
-from typing import List, Dict, Optional
+from typing import AbstractSet, Callable, List, Dict, Optional, Tuple
 import time
 
 import autogen_agentchat
 import autogen_core
 from autogen_core import CancellationToken
 from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.messages import TextMessage
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import ModelClientStreamingChunkEvent, TextMessage
+from autogen_core.models import AssistantMessage, ChatCompletionClient, RequestUsage
 
 from social.config import SimulationConfig
-from social.prompts import DiffusionPrompts
+from social.prompts import DiffusionPrompts, estimate_tokens
 from social.model import create_llm_client
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
 
 logging.getLogger(autogen_agentchat.EVENT_LOGGER_NAME).setLevel(logging.ERROR)
 logging.getLogger(autogen_agentchat.TRACE_LOGGER_NAME).setLevel(logging.ERROR)
@@ -33,6 +34,52 @@ class ReasoningError(Exception):
     pass
 
 
+class DecisionStreamParser:
+    """
+    Incremental parser of the decision fields of a streamed answer
+
+    Each chunk is appended to the text read so far and only the new text
+    (plus a short overlap for fields split across chunks) is searched, so
+    parsing stays linear in the answer length. Numbers count once they are
+    followed by a delimiter, so "1" is not taken from a partial "10".
+    """
+
+    FIELD_PATTERN = re.compile(
+        r'"(' + "|".join(DiffusionPrompts.DECISION_FIELDS) + r')"\s*:\s*'
+        r'("(?:ADOPT|NOT_ADOPT)"|-?\d+(?:\.\d+)?(?=\s*[,}\s]))'
+    )
+    # Characters searched again with the next chunk
+    OVERLAP = 64
+
+    def __init__(self):
+        self.text = ""
+        self.fields: Dict = {}
+        self._scan_from = 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every decision field has been read"""
+        return len(self.fields) == len(DiffusionPrompts.DECISION_FIELDS)
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Read the next chunk of the answer
+
+        Returns:
+            True once every decision field has been read
+        """
+        self.text += chunk
+        if self.complete:
+            return True
+        for match in self.FIELD_PATTERN.finditer(self.text, self._scan_from):
+            name, value = match.groups()
+            # The decision is a string, the levels are numbers
+            if (name == "decision") == value.startswith('"'):
+                self.fields.setdefault(name, json.loads(value))
+        self._scan_from = max(0, len(self.text) - self.OVERLAP)
+        return self.complete
+
+
 class SocialAgent(AssistantAgent):
     """
     Social Agent for Innovation Diffusion Simulation
@@ -42,7 +89,8 @@ class SocialAgent(AssistantAgent):
             self,
             agent_id: str,
             adopter_category: str,
-            config: SimulationConfig
+            config: SimulationConfig,
+            model_client: Optional[ChatCompletionClient] = None
         ):
         """
         Initialize social agent with scientific behavioral modeling
@@ -51,6 +99,8 @@ class SocialAgent(AssistantAgent):
             agent_id: Unique agent identifier
             adopter_category: Rogers' adopter category
             config: Simulation configuration
+            model_client: LLM client, usually shared by many agents (a new
+                client for the default model if None)
         """
         
         # Create scientifically-informed system message
@@ -58,7 +108,7 @@ class SocialAgent(AssistantAgent):
             agent_id, adopter_category, config
         )
 
-        llm_client = create_llm_client()
+        llm_client = model_client or create_llm_client()
 
         # Initialize parent AssistantAgent
         super().__init__(
@@ -66,6 +116,7 @@ class SocialAgent(AssistantAgent):
             model_client=llm_client,
             description="Social Agent for Innovation Diffusion",
             system_message=system_message,
+            model_client_stream=bool(config.stream_decisions),
         )
         
         # Agent identity and characteristics
@@ -81,11 +132,20 @@ class SocialAgent(AssistantAgent):
         self.adoption_time: Optional[int] = None
         self.adoption_attempts = 0
 
+        # LLM requests and token usage
+        self.llm_requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
         # Step State
         self.current_step_state: Optional[Dict] = None
         
         logger.debug(f"Created agent {agent_id}: {adopter_category}")
     
+    def use_model_client(self, model_client: ChatCompletionClient):
+        """Send the next decisions to another LLM client (model routing)"""
+        self._model_client = model_client
+
     def add_connection(self, agent: 'SocialAgent'):
         """Add bidirectional social network connection"""
         if agent not in self.connections and agent.agent_id != self.agent_id:
@@ -105,12 +165,25 @@ class SocialAgent(AssistantAgent):
             "adopted_connections": sum(1 for agent in self.connections if agent.has_adopted),
         }
 
-    async def decide_adoption(self, current_step: int = None, last_attempt: bool = False) -> Optional[Dict]:
+    async def decide_adoption(
+            self,
+            current_step: int = None,
+            last_attempt: bool = False,
+            screening_client: Optional[ChatCompletionClient] = None,
+            confidence_threshold: Optional[float] = None,
+            on_escalation: Optional[Callable[[Dict], None]] = None
+        ) -> Optional[Dict]:
         """
         Make adoption decision using LLM reasoning
         
         Args:
             current_step: Current simulation step for setting adoption_time
+            last_attempt: Accept answers with missing keys as long as they hold a decision
+            screening_client: Small model asked first (model cascade); its answer
+                is kept unless it is invalid or below confidence_threshold
+            confidence_threshold: Lowest screening confidence accepted without escalation
+            on_escalation: Called with the screening record as soon as the screening
+                answer escalates (before the routed answer, which may still fail)
 
         Returns:
             Dict with adoption decision or None if already adopted
@@ -126,61 +199,49 @@ class SocialAgent(AssistantAgent):
             }
         
         cancellation_token = CancellationToken()
+        screening, reasoning_json = None, None
         try:
             decision_start = time.time()
 
-            reasoning_output = await self._get_llm_reasoning(cancellation_token)
+            if screening_client is not None:
+                screening, reasoning_json = await self._screen_decision(
+                    screening_client, confidence_threshold, cancellation_token
+                )
+                if reasoning_json is None and on_escalation is not None:
+                    on_escalation(screening)
+            if reasoning_json is None:
+                reasoning_output, reasoning_json = await self._get_llm_reasoning(cancellation_token)
+            else:
+                reasoning_output = screening.pop("output")
 
             decision_time = time.time() - decision_start
         except asyncio.CancelledError:
+            # Abort the in-flight request and let the cancellation reach the simulation
             cancellation_token.cancel()
             logger.debug(f"LLM reasoning cancelled for {self.agent_id}")
-            return None
+            raise
         except Exception as e:
             logger.debug(f"Error getting LLM reasoning for {self.agent_id}: {e}")
             raise e
 
-        try:
-            reasoning_str = reasoning_output.replace("\n", " ").strip()
-            reasoning_str = re.sub(r',\s*(\}|])', r'\1', reasoning_str)
-            json_obj_start = reasoning_str.find('{')
-            json_obj_end = reasoning_str.rfind('}') + 1
-            reasoning_json: dict = json.loads(reasoning_str[json_obj_start:json_obj_end])
-            if reasoning_json.keys() != DiffusionPrompts.EXPECTED_DECISION_KEYS:
-                logger.error(f"LLM Output: {reasoning_output}")
-                logger.error(f"Invalid LLM reasoning format. Expected: {DiffusionPrompts.EXPECTED_DECISION_KEYS}, Got: {reasoning_json.keys()}")
-                if last_attempt and ["decision", "reasoning"] in reasoning_json.keys():
-                    logger.warning(f"Continuing with missing keys in reasoning: {reasoning_json.keys()}")
-                else:
-                    raise ReasoningError("Invalid LLM reasoning format")
-            if not isinstance(reasoning_json["decision"], str) or reasoning_json["decision"] not in ["ADOPT", "NOT_ADOPT"]:
-                logger.error(f"LLM Output: {reasoning_output}")
-                logger.error(f"Invalid 'decision' type in reasoning: {reasoning_json['decision']}")
-                raise ReasoningError("Invalid 'decision' type in LLM reasoning")
-            if not isinstance(reasoning_json["reasoning"], str):
-                logger.error(f"LLM Output: {reasoning_output}")
-                logger.error(f"Invalid 'reasoning' type in reasoning: {reasoning_json['reasoning']}")
-                raise ReasoningError("Invalid 'reasoning' type in LLM reasoning")
-        except json.JSONDecodeError as e:
-            logger.error(f"LLM Output: {reasoning_output}")
-            logger.error(f"Failed to decode LLM reasoning JSON: {reasoning_str}")
-            raise ReasoningError("Failed to decode LLM reasoning JSON") from e
+        if reasoning_json is None:
+            reasoning_json = self.parse_reasoning(
+                reasoning_output, last_attempt, DiffusionPrompts.expected_decision_keys(self.config)
+            )
 
         # Process adoption decision
         self.adoption_attempts += 1
 
         adopted = reasoning_json["decision"]
-        reasoning_msg = reasoning_json["reasoning"]
-
-        logger.debug(json.dumps(reasoning_json, indent=2, ensure_ascii=False))
 
+        # Per-decision details go to the event log; these lines are formatted only when debugging
         if adopted == "ADOPT":
             self.has_adopted = True
             self.adoption_time = current_step  # Set adoption time when adopting
-            logger.info(f"🎉 Agent {self.agent_id} ({self.adopter_category}) ADOPTED in step {current_step}! ")
+            logger.debug("Agent %s (%s) ADOPTED in step %s", self.agent_id, self.adopter_category, current_step)
         else:
-            logger.info(f"❌ Agent {self.agent_id} ({self.adopter_category}) did NOT adopt.")
-        logger.info(f"🧠 Reasoning: {reasoning_msg}")
+            logger.debug("Agent %s (%s) did NOT adopt", self.agent_id, self.adopter_category)
+        logger.debug("Reasoning: %s", reasoning_json.get("reasoning"))
         
         # Record decision
         decision_record = {
@@ -190,12 +251,120 @@ class SocialAgent(AssistantAgent):
             "full_output": reasoning_output,
             **reasoning_json,
         }
+        if screening is not None:
+            decision_record["screening"] = screening
         
-        logger.debug(f"Agent {self.agent_id} decision completed in {decision_time:.3f}s")
+        logger.debug("Agent %s decision completed in %.3fs", self.agent_id, decision_time)
         return decision_record
 
-    async def _get_llm_reasoning(self, cancellation_token) -> str:
-        """Get LLM reasoning for adoption decision"""
+    async def _screen_decision(
+            self,
+            screening_client: ChatCompletionClient,
+            confidence_threshold: float,
+            cancellation_token: CancellationToken
+        ) -> Tuple[Dict, Optional[Dict]]:
+        """
+        Ask the screening model of a model cascade
+
+        Returns:
+            Screening record and the parsed decision, or None if the decision
+            escalates to the agent's own model (whose answer then starts
+            from the same context)
+        """
+        model_client = self._model_client
+        context_size = len(self.model_context._messages)
+        prompt_tokens, completion_tokens = self.prompt_tokens, self.completion_tokens
+        screening_start = time.time()
+        self._model_client = screening_client
+        try:
+            output, reasoning_json = await self._get_llm_reasoning(cancellation_token)
+        finally:
+            self._model_client = model_client
+
+        if reasoning_json is None:
+            try:
+                reasoning_json = self.parse_reasoning(
+                    output, expected_keys=DiffusionPrompts.expected_decision_keys(self.config)
+                )
+            except ReasoningError:
+                pass
+        confidence = reasoning_json.get("confidence_level") if reasoning_json else None
+        escalated = not isinstance(confidence, (int, float)) or confidence < confidence_threshold
+
+        screening = {
+            "output": output,
+            "valid": reasoning_json is not None,
+            "decision": reasoning_json.get("decision") if reasoning_json else None,
+            "confidence_level": confidence,
+            "escalated": escalated,
+            "decision_time": time.time() - screening_start,
+            "prompt_tokens": self.prompt_tokens - prompt_tokens,
+            "completion_tokens": self.completion_tokens - completion_tokens,
+        }
+        if escalated:
+            del self.model_context._messages[context_size:]
+            logger.debug("Agent %s escalates (screening confidence %s)", self.agent_id, confidence)
+            return screening, None
+        return screening, reasoning_json
+
+    @staticmethod
+    def parse_reasoning(
+            reasoning_output: str,
+            last_attempt: bool = False,
+            expected_keys: Optional[AbstractSet[str]] = None
+        ) -> Dict:
+        """
+        Parse and validate the decision JSON of an LLM response
+
+        Args:
+            reasoning_output: Raw LLM output
+            last_attempt: Accept responses with missing keys as long as they hold a decision
+            expected_keys: Keys of the configured response profile
+                (DiffusionPrompts.EXPECTED_DECISION_KEYS, the full profile, if None)
+
+        Returns:
+            Decision dictionary
+
+        Raises:
+            ReasoningError: If the output holds no valid decision
+        """
+        if expected_keys is None:
+            expected_keys = DiffusionPrompts.EXPECTED_DECISION_KEYS
+        try:
+            reasoning_str = reasoning_output.replace("\n", " ").strip()
+            reasoning_str = re.sub(r',\s*(\}|])', r'\1', reasoning_str)
+            json_obj_start = reasoning_str.find('{')
+            json_obj_end = reasoning_str.rfind('}') + 1
+            reasoning_json: dict = json.loads(reasoning_str[json_obj_start:json_obj_end])
+            if reasoning_json.keys() != expected_keys:
+                logger.error(f"LLM Output: {reasoning_output}")
+                logger.error(f"Invalid LLM reasoning format. Expected: {set(expected_keys)}, Got: {reasoning_json.keys()}")
+                if last_attempt and {"decision"} | (expected_keys & {"reasoning"}) <= reasoning_json.keys():
+                    logger.warning(f"Continuing with missing keys in reasoning: {reasoning_json.keys()}")
+                else:
+                    raise ReasoningError("Invalid LLM reasoning format")
+            if not isinstance(reasoning_json["decision"], str) or reasoning_json["decision"] not in ["ADOPT", "NOT_ADOPT"]:
+                logger.error(f"LLM Output: {reasoning_output}")
+                logger.error(f"Invalid 'decision' type in reasoning: {reasoning_json['decision']}")
+                raise ReasoningError("Invalid 'decision' type in LLM reasoning")
+            if "reasoning" in expected_keys and not isinstance(reasoning_json.get("reasoning"), str):
+                logger.error(f"LLM Output: {reasoning_output}")
+                logger.error(f"Invalid 'reasoning' type in reasoning: {reasoning_json.get('reasoning')}")
+                raise ReasoningError("Invalid 'reasoning' type in LLM reasoning")
+        except json.JSONDecodeError as e:
+            logger.error(f"LLM Output: {reasoning_output}")
+            logger.error(f"Failed to decode LLM reasoning JSON: {reasoning_str}")
+            raise ReasoningError("Failed to decode LLM reasoning JSON") from e
+        return reasoning_json
+
+    async def _get_llm_reasoning(self, cancellation_token) -> Tuple[str, Optional[Dict]]:
+        """
+        Get LLM reasoning for adoption decision
+
+        Returns:
+            LLM output, and the decision fields if generation was stopped as
+            soon as they were complete (config.stream_stop_early), else None
+        """
 
         prompt = DiffusionPrompts.create_adoption_decision_prompt(
             self.current_step_state.get("global_adoption_rate", 0.0),
@@ -204,14 +373,63 @@ class SocialAgent(AssistantAgent):
             self.adoption_attempts,
             self.config
         )
-        
-        response = await self.on_messages(
-            [TextMessage(content=prompt, source="system")], 
-            cancellation_token=cancellation_token
-        )
-        
-        return response.chat_message.content.strip()
-    
+        message = TextMessage(content=prompt, source="system")
+        self.llm_requests += 1
+
+        if self.config.stream_decisions:
+            return await self._stream_llm_reasoning(message, cancellation_token)
+
+        response = await self.on_messages([message], cancellation_token=cancellation_token)
+        self._record_usage(response.chat_message.models_usage)
+        return response.chat_message.content.strip(), None
+
+    async def _stream_llm_reasoning(
+            self,
+            message: TextMessage,
+            cancellation_token: CancellationToken
+        ) -> Tuple[str, Optional[Dict]]:
+        """
+        Read the answer as it is generated
+
+        The decision fields are parsed from the partial output. With
+        config.stream_stop_early the request is cancelled once they are all
+        present, which stops reading before the text fields; the context
+        then keeps the decision fields as the agent's answer. The model
+        client's HTTP stream is released when the event loop finalizes its
+        abandoned generator.
+        """
+        parser = DecisionStreamParser()
+        # The request has its own token so that stopping it early does not
+        # cancel the rest of the decision; cancelling the decision still reaches it
+        request_token = CancellationToken()
+        cancellation_token.add_callback(request_token.cancel)
+        stream = self.on_messages_stream([message], request_token)
+        try:
+            async for event in stream:
+                if isinstance(event, Response):
+                    self._record_usage(event.chat_message.models_usage)
+                    return event.chat_message.content.strip(), None
+                if (isinstance(event, ModelClientStreamingChunkEvent) and parser.feed(event.content)
+                        and self.config.stream_stop_early):
+                    break
+        finally:
+            # Abort the pending model call before closing the agent's stream
+            request_token.cancel()
+            await stream.aclose()
+
+        # No usage is reported for a stopped request, estimate it
+        messages = self._system_messages + await self.model_context.get_messages()
+        self.prompt_tokens += sum(estimate_tokens(str(context_message.content)) for context_message in messages)
+        self.completion_tokens += estimate_tokens(parser.text)
+        await self.model_context.add_message(AssistantMessage(content=json.dumps(parser.fields), source=self.name))
+        logger.debug("Agent %s stopped generation after the decision fields", self.agent_id)
+        return parser.text.strip(), parser.fields
+
+    def _record_usage(self, usage: Optional[RequestUsage]):
+        if usage is not None:
+            self.prompt_tokens += usage.prompt_tokens
+            self.completion_tokens += usage.completion_tokens
+
     def get_state(self) -> Dict:
         return {
             "agent_id": self.agent_id,
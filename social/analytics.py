@@ -0,0 +1,319 @@
+"""
+Cross-run analytics over saved simulation results
+
+Runs are loaded in parallel into one long-format DataFrame with a row per
+(run, step, adopter category):
+
+    run, scenario, config_hash, step, category, agents, decisions,
+    new_adoptions, adopters, adoption_rate, mean_confidence,
+    mean_network_influence, mean_global_influence
+
+A run is identified by the path of its results file (relative to the working
+directory), so same-named files from different directories stay apart.
+Columnar results files are aggregated straight from their decision columns
+(reasoning text is never decoded); legacy pickles are unpickled first.
+The aggregate functions below work on that frame for any number of runs.
+"""
+
+import logging
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from social.config import ADOPTER_CATEGORIES, SimulationConfig
+from social.results_store import LEVEL_COLUMNS, RESULTS_EXTENSION, ResultsArchive
+
+logger = logging.getLogger(__name__)
+
+RUN_COLUMNS = [
+    "run", "scenario", "config_hash", "step", "category", "agents", "decisions", "new_adoptions",
+    "adopters", "adoption_rate", "mean_confidence", "mean_network_influence", "mean_global_influence",
+]
+
+_LEVEL_NAMES = {
+    "confidence_level": "mean_confidence",
+    "network_influence_level": "mean_network_influence",
+    "global_influence_level": "mean_global_influence",
+}
+
+
+def _config_hash(config: Dict) -> Optional[str]:
+    try:
+        return SimulationConfig.from_dict(config).config_hash()
+    except Exception:
+        return None
+
+
+def _archive_tables(path: str):
+    """Decision and agent arrays of a columnar results file"""
+    with ResultsArchive(path) as archive:
+        summary = archive.summary
+        # Older format versions store "adopted before" stubs as rows
+        decision_rows = ~archive.column("adopted_before")
+        decisions = {
+            "step": archive.column("step")[decision_rows],
+            "category": archive.column("category")[decision_rows],
+            "has_adopted": archive.column("has_adopted")[decision_rows],
+        }
+        for column in LEVEL_COLUMNS:
+            decisions[column] = archive.column(column)[decision_rows]
+        agents = {
+            "category": archive.column("agent_category"),
+            "adoption_time": archive.column("agent_adoption_time"),
+        }
+    steps = sorted(int(step) for step in summary.get("steps", {}))
+    return summary, decisions, agents, steps
+
+
+def _pickle_tables(path: str):
+    """Decision and agent arrays of a legacy pickled results file"""
+    with open(path, "rb") as f:
+        results = pickle.load(f)
+
+    category_codes = {category: i for i, category in enumerate(ADOPTER_CATEGORIES)}
+    agent_states = results.get("agent_states", [])
+    agents = {
+        "category": np.array([category_codes.get(state.get("adopter_category"), -1) for state in agent_states], dtype=np.int8),
+        "adoption_time": np.array(
+            [-1 if state.get("adoption_time") is None else state["adoption_time"] for state in agent_states], dtype=np.int32),
+    }
+
+    columns = {"step": [], "category": [], "has_adopted": [], **{column: [] for column in LEVEL_COLUMNS}}
+    adoption_history = results.get("adoption_history", {})
+    for step in sorted(adoption_history):
+        for agent_id, record in adoption_history[step].get("agents_results", {}).items():
+            if record is None or record.get("adopted_before", False):
+                continue
+            columns["step"].append(step)
+            columns["category"].append(category_codes.get(agent_id.split("_agent_")[0], -1))
+            columns["has_adopted"].append(bool(record.get("has_adopted", False)))
+            for column in LEVEL_COLUMNS:
+                value = record.get(column)
+                columns[column].append(value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan)
+    decisions = {
+        "step": np.array(columns["step"], dtype=np.int32),
+        "category": np.array(columns["category"], dtype=np.int8),
+        "has_adopted": np.array(columns["has_adopted"], dtype=bool),
+        **{column: np.array(columns[column], dtype=np.float32) for column in LEVEL_COLUMNS},
+    }
+    summary = {key: results.get(key) for key in ("config", "metadata")}
+    return summary, decisions, agents, sorted(adoption_history)
+
+
+def load_run(path: str) -> pd.DataFrame:
+    """
+    Load one results file as a long-format frame
+
+    Args:
+        path: Path of a results file (.npz or legacy .pkl)
+
+    Returns:
+        DataFrame with RUN_COLUMNS, one row per (step, category)
+    """
+    if path.endswith(RESULTS_EXTENSION):
+        summary, decisions, agents, steps = _archive_tables(path)
+    else:
+        summary, decisions, agents, steps = _pickle_tables(path)
+
+    config = summary.get("config") or {}
+    metadata = summary.get("metadata") or {}
+    num_steps, num_categories = len(steps), len(ADOPTER_CATEGORIES)
+    if num_steps == 0:
+        return pd.DataFrame(columns=RUN_COLUMNS)
+
+    step_index = np.searchsorted(steps, decisions["step"])
+    valid = decisions["category"] >= 0
+    cell = step_index[valid] * num_categories + decisions["category"][valid]
+    size = num_steps * num_categories
+
+    decision_counts = np.bincount(cell, minlength=size)
+    new_adoptions = np.bincount(cell, weights=decisions["has_adopted"][valid], minlength=size)
+
+    level_means = {}
+    for column, name in _LEVEL_NAMES.items():
+        values = decisions[column][valid].astype(np.float64)
+        present = ~np.isnan(values)
+        sums = np.bincount(cell[present], weights=values[present], minlength=size)
+        counts = np.bincount(cell[present], minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            level_means[name] = np.where(counts > 0, sums / counts, np.nan)
+
+    # Cumulative adopters per category from the agents' adoption times
+    category_sizes = np.bincount(agents["category"][agents["category"] >= 0], minlength=num_categories)
+    adopters = np.zeros((num_steps, num_categories), dtype=np.int64)
+    for code in range(num_categories):
+        times = np.sort(agents["adoption_time"][(agents["category"] == code) & (agents["adoption_time"] >= 0)])
+        adopters[:, code] = np.searchsorted(times, steps, side="right")
+
+    agents_grid = np.tile(category_sizes, num_steps)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        adoption_rate = np.where(agents_grid > 0, adopters.ravel() / agents_grid, np.nan)
+
+    frame = pd.DataFrame({
+        "run": os.path.relpath(path),
+        "scenario": metadata.get("config_name"),
+        "config_hash": _config_hash(config),
+        "step": np.repeat(np.asarray(steps, dtype=np.int32), num_categories),
+        "category": pd.Categorical(np.tile(ADOPTER_CATEGORIES, num_steps), categories=ADOPTER_CATEGORIES),
+        "agents": agents_grid,
+        "decisions": decision_counts,
+        "new_adoptions": new_adoptions.astype(np.int64),
+        "adopters": adopters.ravel(),
+        "adoption_rate": adoption_rate,
+        **level_means,
+    })
+    # Categories absent from the run carry no information
+    return frame[frame["agents"] > 0].reset_index(drop=True)
+
+
+def load_runs(paths: Iterable[str], max_workers: Optional[int] = None, processes: bool = True) -> pd.DataFrame:
+    """
+    Load many results files in parallel into one long-format frame
+
+    Args:
+        paths: Results file paths
+        max_workers: Number of workers (CPU count by default)
+        processes: Use worker processes (pickles are CPU bound) instead of threads
+
+    Returns:
+        Concatenated DataFrame with RUN_COLUMNS; unreadable files are skipped
+    """
+    # One entry per file, however its path is spelled
+    paths = list(dict.fromkeys(os.path.relpath(path) for path in paths))
+    if not paths:
+        return pd.DataFrame(columns=RUN_COLUMNS)
+
+    executor_class = ProcessPoolExecutor if processes and len(paths) > 1 else ThreadPoolExecutor
+    frames: List[pd.DataFrame] = []
+    with executor_class(max_workers=max_workers) as executor:
+        futures = {path: executor.submit(load_run, path) for path in paths}
+        for path, future in futures.items():
+            try:
+                frames.append(future.result())
+            except Exception as e:
+                logger.warning(f"Skipping {path}: {e}")
+
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=RUN_COLUMNS)
+    frame["category"] = pd.Categorical(frame["category"], categories=ADOPTER_CATEGORIES)
+    return frame
+
+
+def load_catalog_runs(results_dir: str = "results", max_workers: Optional[int] = None, **filters) -> pd.DataFrame:
+    """
+    Load the runs of the results catalog that match the given filters
+
+    Args:
+        results_dir: Directory holding results files
+        max_workers: Number of workers
+        **filters: Filters passed to ResultsCatalog.query (scenario, config_hash, ...)
+
+    Returns:
+        Long-format DataFrame of the matching runs
+    """
+    from social.results_catalog import ResultsCatalog
+
+    catalog = ResultsCatalog(os.path.join(results_dir, "catalog.sqlite"))
+    try:
+        catalog.sync(results_dir)
+        paths = [os.path.join(results_dir, run["file_name"]) for run in catalog.query(**filters)]
+    finally:
+        catalog.close()
+    return load_runs(paths, max_workers=max_workers)
+
+
+def adoption_curves(frame: pd.DataFrame, per_category: bool = False, fill: bool = True) -> pd.DataFrame:
+    """
+    Cumulative adoption rate by step
+
+    Args:
+        frame: Long-format frame from load_runs
+        per_category: One column per (run, category) instead of per run
+        fill: Carry the final rate of runs that stopped early forward
+
+    Returns:
+        DataFrame indexed by step with one column per run (or run and category)
+    """
+    if per_category:
+        curves = frame.pivot_table(index="step", columns=["run", "category"], values="adoption_rate", observed=True)
+    else:
+        totals = frame.groupby(["run", "step"], observed=True)[["adopters", "agents"]].sum()
+        curves = (totals["adopters"] / totals["agents"]).unstack("run")
+    return curves.ffill() if fill else curves
+
+
+def category_rates(frame: pd.DataFrame, step: Optional[int] = None) -> pd.DataFrame:
+    """
+    Adoption rate per run and category at a given step
+
+    Args:
+        frame: Long-format frame from load_runs
+        step: Step to report (the final step of each run if None)
+
+    Returns:
+        DataFrame indexed by run with one column per category
+    """
+    if step is None:
+        last_step = frame.groupby("run")["step"].transform("max")
+        selected = frame[frame["step"] == last_step]
+    else:
+        # Runs that stopped before the requested step keep their final state
+        eligible = frame[frame["step"] <= step]
+        last_step = eligible.groupby("run")["step"].transform("max")
+        selected = eligible[eligible["step"] == last_step]
+    return selected.pivot_table(index="run", columns="category", values="adoption_rate", observed=True)
+
+
+def time_to_adoption(frame: pd.DataFrame, threshold: float = 0.5, per_category: bool = False) -> pd.Series:
+    """
+    First step at which the adoption rate reaches a threshold
+
+    Args:
+        frame: Long-format frame from load_runs
+        threshold: Adoption rate to reach (e.g. 0.5 for time-to-50%)
+        per_category: Report per (run, category) instead of per run
+
+    Returns:
+        Series of steps (NaN for runs that never reach the threshold)
+    """
+    if per_category:
+        rates = frame.set_index(["run", "category", "step"])["adoption_rate"]
+        keys = ["run", "category"]
+    else:
+        totals = frame.groupby(["run", "step"], observed=True)[["adopters", "agents"]].sum()
+        rates = totals["adopters"] / totals["agents"]
+        keys = ["run"]
+
+    reached = rates[rates >= threshold].reset_index()
+    first = reached.groupby(keys, observed=True)["step"].min()
+    all_keys = rates.reset_index().groupby(keys, observed=True).size().index
+    return first.reindex(all_keys).rename(f"time_to_{threshold:.0%}")
+
+
+def summarize(frame: pd.DataFrame, by: str = "scenario", threshold: float = 0.5) -> pd.DataFrame:
+    """
+    Compare groups of runs (scenarios or configurations)
+
+    Args:
+        frame: Long-format frame from load_runs
+        by: Run attribute to group by ("scenario" or "config_hash")
+        threshold: Adoption rate for the time-to-adoption statistic
+
+    Returns:
+        DataFrame with the number of runs, final adoption rate and time to
+        threshold (mean and standard deviation) per group
+    """
+    last_step = frame.groupby("run")["step"].transform("max")
+    final = frame[frame["step"] == last_step].groupby(["run", by], observed=True, dropna=False)[["adopters", "agents"]].sum()
+    runs = (final["adopters"] / final["agents"]).rename("final_adoption_rate").reset_index()
+    runs = runs.merge(time_to_adoption(frame, threshold).rename("time_to_threshold").reset_index(), on="run")
+    return runs.groupby(by, dropna=False).agg(
+        runs=("run", "count"),
+        final_adoption_rate=("final_adoption_rate", "mean"),
+        final_adoption_rate_std=("final_adoption_rate", "std"),
+        time_to_threshold=("time_to_threshold", "mean"),
+        time_to_threshold_std=("time_to_threshold", "std"),
+    )
@@ -3,13 +3,13 @@ Configuration and Constants for Social Innovation Diffusion Model
 Based on Rogers' Diffusion of Innovation Theory
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-)
+from social.model import validate_cascade, validate_routes
+
 logger = logging.getLogger(__name__)
 
 # Rogers' adopter categories with theoretical distributions
@@ -21,6 +21,17 @@ ADOPTER_CATEGORIES = [
     "Laggard"         # 16% - Traditional, suspicious of change
 ]
 
+# Answer schemas the agents are asked for (see DiffusionPrompts.RESPONSE_SCHEMAS)
+RESPONSE_PROFILES = (
+    "full",           # thinking, reasoning and the decision fields
+    "compact",        # one-sentence reasoning, no thinking
+    "decision_only"   # decision and the numeric levels only
+)
+
+# Codecs of the reasoning text in results files (see social.text_store);
+# zstd needs the optional zstandard package to write and to read the files
+RESULTS_TEXT_CODECS = ("zlib", "zstd")
+
 # Default distribution based on Rogers (2003)
 DEFAULT_ADOPTER_DISTRIBUTION = {
     "Innovator": 0.025,
@@ -56,17 +67,33 @@ class SimulationConfig:
         innovation_attributes: Dict[str, float] = None,
 
         # Network structure
-        network_type: str = "small_world",  # "small_world", "scale_free", "random"
+        network_type: str = "small_world",  # "small_world", "scale_free", "random", "edge_list"
         network_params: Dict = None,
         network_seed: int = None,
         network_shuffle: bool = True,
+        network_statistics_mode: str = "deferred",  # "exact", "sampled", "deferred"
+        network_statistics_samples: int = 64,
+        network_validation_mode: str = "strict",  # "strict", "sampled"
+        network_cache_enabled: bool = True,
 
         # Simulation parameters
         max_steps: int = 25,
         early_stop_threshold: float = 1.0,
         early_stop_no_adoption_steps: int = 2,
         enable_devils_advocate: bool = False,
-        speed_up: bool = True
+        speed_up: bool = True,
+        response_profile: str = "full",  # "full", "compact", "decision_only"
+        stream_decisions: bool = False,  # Ask for the decision fields first and parse the answer as it streams
+        stream_stop_early: bool = False,  # Stop generating once the decision fields are complete
+        model_routes: List[Dict[str, Any]] = None,  # Model per adopter category / phase (see social.model)
+        model_cascade: Dict[str, Any] = None,  # Screening model asked first, escalating on low confidence
+        stream_results: bool = True,  # Append each step to an on-disk log
+        stream_fsync: bool = False,  # fsync the log after every step
+        results_text_codec: str = "zlib",  # "zlib", or "zstd" (requires zstandard to write and read)
+        event_log: bool = True,  # Write decisions, retries and steps to a JSON lines event log
+        event_log_sample_rate: float = 1.0,  # Fraction of decision events written
+        metrics_port: int = None,  # Serve live OpenMetrics at http://127.0.0.1:<port>/metrics
+        metrics_file: str = None  # Rewrite live OpenMetrics to this file every few seconds
     ):
         self.name = name or "unnamed_simulation"
         self.num_agents = num_agents
@@ -77,12 +104,28 @@ class SimulationConfig:
         self.network_params = network_params or self._get_default_network_params()
         self.network_seed = network_seed
         self.network_shuffle = network_shuffle
+        self.network_statistics_mode = network_statistics_mode
+        self.network_statistics_samples = network_statistics_samples
+        self.network_validation_mode = network_validation_mode
+        self.network_cache_enabled = network_cache_enabled
 
         self.max_steps = max_steps
         self.early_stop_threshold = early_stop_threshold
         self.early_stop_no_adoption_steps = early_stop_no_adoption_steps
         self.enable_devils_advocate = enable_devils_advocate
         self.speed_up = speed_up
+        self.response_profile = response_profile
+        self.stream_decisions = stream_decisions
+        self.stream_stop_early = stream_stop_early
+        self.model_routes = model_routes
+        self.model_cascade = model_cascade
+        self.stream_results = stream_results
+        self.stream_fsync = stream_fsync
+        self.results_text_codec = results_text_codec
+        self.event_log = event_log
+        self.event_log_sample_rate = event_log_sample_rate
+        self.metrics_port = metrics_port
+        self.metrics_file = metrics_file
         
         # Validate configuration
         self._validate_config()
@@ -97,11 +140,27 @@ class SimulationConfig:
             "network_params": self.network_params,
             "network_seed": self.network_seed,
             "network_shuffle": self.network_shuffle,
+            "network_statistics_mode": self.network_statistics_mode,
+            "network_statistics_samples": self.network_statistics_samples,
+            "network_validation_mode": self.network_validation_mode,
+            "network_cache_enabled": self.network_cache_enabled,
             "max_steps": self.max_steps,
             "early_stop_threshold": self.early_stop_threshold,
             "early_stop_no_adoption_steps": self.early_stop_no_adoption_steps,
             "enable_devils_advocate": self.enable_devils_advocate,
-            "speed_up": self.speed_up
+            "speed_up": self.speed_up,
+            "response_profile": self.response_profile,
+            "stream_decisions": self.stream_decisions,
+            "stream_stop_early": self.stream_stop_early,
+            "model_routes": self.model_routes,
+            "model_cascade": self.model_cascade,
+            "stream_results": self.stream_results,
+            "stream_fsync": self.stream_fsync,
+            "results_text_codec": self.results_text_codec,
+            "event_log": self.event_log,
+            "event_log_sample_rate": self.event_log_sample_rate,
+            "metrics_port": self.metrics_port,
+            "metrics_file": self.metrics_file
         }
     
     @staticmethod
@@ -115,19 +174,55 @@ class SimulationConfig:
             network_params=config_dict.get("network_params", None),
             network_seed=config_dict.get("network_seed", None),
             network_shuffle=config_dict.get("network_shuffle", True),
+            network_statistics_mode=config_dict.get("network_statistics_mode", "deferred"),
+            network_statistics_samples=config_dict.get("network_statistics_samples", 64),
+            network_validation_mode=config_dict.get("network_validation_mode", "strict"),
+            network_cache_enabled=config_dict.get("network_cache_enabled", True),
             max_steps=config_dict.get("max_steps", 25),
             early_stop_threshold=config_dict.get("early_stop_threshold", 1),
             early_stop_no_adoption_steps=config_dict.get("early_stop_no_adoption_steps", 2),
             enable_devils_advocate=config_dict.get("enable_devils_advocate", False),
-            speed_up=config_dict.get("speed_up", True)
+            speed_up=config_dict.get("speed_up", True),
+            response_profile=config_dict.get("response_profile", "full"),
+            stream_decisions=config_dict.get("stream_decisions", False),
+            stream_stop_early=config_dict.get("stream_stop_early", False),
+            model_routes=config_dict.get("model_routes"),
+            model_cascade=config_dict.get("model_cascade"),
+            stream_results=config_dict.get("stream_results", True),
+            stream_fsync=config_dict.get("stream_fsync", False),
+            results_text_codec=config_dict.get("results_text_codec", "zlib"),
+            event_log=config_dict.get("event_log", True),
+            event_log_sample_rate=config_dict.get("event_log_sample_rate", 1.0),
+            metrics_port=config_dict.get("metrics_port"),
+            metrics_file=config_dict.get("metrics_file")
         )
 
+    # Options that change how a run is executed or stored, not its outcome
+    RUNTIME_OPTIONS = (
+        "network_statistics_mode", "network_statistics_samples", "network_validation_mode",
+        "network_cache_enabled", "stream_results", "stream_fsync", "results_text_codec", "event_log",
+        "event_log_sample_rate", "metrics_port", "metrics_file",
+    )
+
+    def config_hash(self) -> str:
+        """Short hash identifying runs with the same scientific configuration"""
+        payload = {key: value for key, value in self.to_dict().items() if key not in self.RUNTIME_OPTIONS}
+        # Runs without model routing, with the full response profile and without
+        # streaming keep the hash they had before these options existed
+        for key, default in (("model_routes", None), ("model_cascade", None), ("response_profile", "full"),
+                             ("stream_decisions", False), ("stream_stop_early", False)):
+            if payload[key] == default:
+                del payload[key]
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
     def _get_default_network_params(self) -> Dict:
         """Get default network parameters by type"""
         defaults = {
             "small_world": {"k": 4, "rewiring_prob": 0.3},
             "scale_free": {"m": 2, "alpha": 2.5},
-            "random": {"p": 0.1}
+            "random": {"p": 0.1},
+            "edge_list": {"path": "", "format": "auto", "category_assignment": "degree"}
         }
         return defaults.get(self.network_type, defaults["small_world"])
     
@@ -154,6 +249,18 @@ class SimulationConfig:
             raise ValueError(f"max_steps must be positive, got {self.max_steps}")
         if not 0 <= self.early_stop_threshold <= 1:
             raise ValueError(f"early_stop_threshold must be in [0,1], got {self.early_stop_threshold}")
+        if self.response_profile not in RESPONSE_PROFILES:
+            raise ValueError(f"response_profile must be one of {RESPONSE_PROFILES}, got {self.response_profile}")
+        if self.stream_stop_early and not self.stream_decisions:
+            raise ValueError("stream_stop_early requires stream_decisions")
+        if self.model_routes is not None:
+            validate_routes(self.model_routes, ADOPTER_CATEGORIES)
+        if self.model_cascade is not None:
+            validate_cascade(self.model_cascade)
+        if self.results_text_codec not in RESULTS_TEXT_CODECS:
+            raise ValueError(f"results_text_codec must be one of {RESULTS_TEXT_CODECS}, got {self.results_text_codec}")
+        if not 0 <= self.event_log_sample_rate <= 1:
+            raise ValueError(f"event_log_sample_rate must be in [0,1], got {self.event_log_sample_rate}")
     
     def _validate_network_params(self):
         """Validate network-specific parameters"""
@@ -180,23 +287,44 @@ class SimulationConfig:
             if not 0 <= p <= 1:
                 raise ValueError(f"Random network p must be in [0,1], got {p}")
         
+        elif self.network_type == "edge_list":
+            assignment = params.get("category_assignment", "degree")
+            if assignment not in ("degree", "attribute"):
+                raise ValueError(f"Edge list category_assignment must be 'degree' or 'attribute', got {assignment}")
+            if assignment == "attribute" and not params.get("attributes_path"):
+                raise ValueError("Edge list category_assignment 'attribute' requires attributes_path")
+        
+        if self.network_statistics_mode not in ("exact", "sampled", "deferred"):
+            raise ValueError(f"network_statistics_mode must be 'exact', 'sampled' or 'deferred', got {self.network_statistics_mode}")
+        if self.network_statistics_samples < 1:
+            raise ValueError(f"network_statistics_samples must be positive, got {self.network_statistics_samples}")
+        if self.network_validation_mode not in ("strict", "sampled"):
+            raise ValueError(f"network_validation_mode must be 'strict' or 'sampled', got {self.network_validation_mode}")
+        
         # Validate positive parameters
         if self.num_agents <= 0:
             raise ValueError("Number of agents must be positive")
         if self.max_steps <= 0:
             raise ValueError("Max steps must be positive")
     
-    def get_agents_per_category(self) -> Dict[str, int]:
-        """Calculate number of agents per category based strictly on distribution"""
+    def get_agents_per_category(self, num_agents: Optional[int] = None) -> Dict[str, int]:
+        """
+        Calculate number of agents per category based strictly on distribution
+
+        Args:
+            num_agents: Population size (config.num_agents if None)
+        """
+        if num_agents is None:
+            num_agents = self.num_agents
         agents_per_category = {}
         total_assigned = 0
         categories = list(self.adopter_distribution.keys())
         # Assign agents by rounding down, last category gets the remainder
         for i, (category, proportion) in enumerate(self.adopter_distribution.items()):
             if i == len(categories) - 1:
-                count = self.num_agents - total_assigned
+                count = num_agents - total_assigned
             else:
-                count = int(round(self.num_agents * proportion))
+                count = int(round(num_agents * proportion))
                 total_assigned += count
             agents_per_category[category] = count
         return agents_per_category
@@ -0,0 +1,251 @@
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from social.config import ADOPTER_CATEGORIES, SimulationConfig
+
+logger = logging.getLogger(__name__)
+
+
+class EdgeList:
+    """
+    Undirected edge list of an empirical social network
+
+    Nodes are relabelled to 0..N-1 (original ids kept in node_ids); self-loops
+    and duplicate edges are removed. Each node carries an adopter category.
+    """
+
+    def __init__(self, node_ids: np.ndarray, sources: np.ndarray, targets: np.ndarray):
+        self.node_ids = node_ids
+        self.sources = sources
+        self.targets = targets
+        self.num_nodes = len(node_ids)
+        self.categories: Optional[np.ndarray] = None
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.sources)
+
+    def degrees(self) -> np.ndarray:
+        """Degree of every node"""
+        return np.bincount(np.concatenate([self.sources, self.targets]), minlength=self.num_nodes)
+
+    def adjacency(self):
+        """
+        Symmetric CSR adjacency arrays
+
+        Returns:
+            Tuple (indptr, indices)
+        """
+        rows = np.concatenate([self.sources, self.targets])
+        cols = np.concatenate([self.targets, self.sources])
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.num_nodes), out=indptr[1:])
+        return indptr, cols[order]
+
+    def category_counts(self) -> Dict[str, int]:
+        """Number of nodes per adopter category, in ADOPTER_CATEGORIES order"""
+        if self.categories is None:
+            raise ValueError("Adopter categories have not been assigned")
+        return {category: int(np.count_nonzero(self.categories == category)) for category in ADOPTER_CATEGORIES}
+
+    def agent_order(self) -> np.ndarray:
+        """
+        Node index for each agent, with agents created grouped by category
+
+        Agents are created category by category (ADOPTER_CATEGORIES order),
+        so the k-th agent is mapped to the k-th node of this ordering.
+        """
+        ranks = {category: i for i, category in enumerate(ADOPTER_CATEGORIES)}
+        category_rank = np.fromiter((ranks[c] for c in self.categories), dtype=np.int64, count=self.num_nodes)
+        return np.argsort(category_rank, kind="stable")
+
+
+def _detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".npz", ".npy"):
+        return extension[1:]
+    if extension == ".csv":
+        return "csv"
+    return "snap"
+
+
+def _has_header(path: str, delimiter: Optional[str], comment: str) -> bool:
+    """Check whether the first non-comment line holds column names"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(comment):
+                continue
+            tokens = line.split(delimiter)[:2]
+            try:
+                [int(token) for token in tokens]
+                return False
+            except ValueError:
+                return True
+    return False
+
+
+def _read_raw_edges(path: str, fmt: str, delimiter: Optional[str], comment: str) -> np.ndarray:
+    """Read raw (E, 2) edge endpoints without building Python tuples"""
+    if fmt == "npy":
+        return np.load(path, mmap_mode="r")
+
+    if fmt == "npz":
+        with np.load(path) as data:
+            if "edges" in data:
+                return data["edges"]
+            return np.column_stack([data["sources"], data["targets"]])
+
+    if fmt == "csv" and delimiter is None:
+        delimiter = ","
+    skiprows = 1 if _has_header(path, delimiter, comment) else 0
+
+    # NumPy's C tokenizer streams the file and fills the array directly
+    try:
+        return np.loadtxt(path, dtype=np.int64, comments=comment, delimiter=delimiter,
+                          skiprows=skiprows, usecols=(0, 1), ndmin=2)
+    except ValueError:
+        logger.debug("Non-integer node ids found, parsing edge list as strings")
+        return np.loadtxt(path, dtype=str, comments=comment, delimiter=delimiter,
+                          skiprows=skiprows, usecols=(0, 1), ndmin=2)
+
+
+def _read_attributes(path: str, node_ids: np.ndarray, delimiter: Optional[str], comment: str) -> np.ndarray:
+    """Read a node -> adopter category file"""
+    if delimiter is None and path.lower().endswith(".csv"):
+        delimiter = ","
+    skiprows = 1 if _has_header(path, delimiter, comment) else 0
+    raw = np.loadtxt(path, dtype=str, comments=comment, delimiter=delimiter,
+                     skiprows=skiprows, usecols=(0, 1), ndmin=2)
+
+    unknown = set(np.unique(raw[:, 1])) - set(ADOPTER_CATEGORIES)
+    if unknown:
+        raise ValueError(f"Unknown adopter categories in {path}: {sorted(unknown)}")
+
+    attribute_ids = raw[:, 0].astype(node_ids.dtype) if node_ids.dtype.kind in "iu" else raw[:, 0]
+    order = np.argsort(attribute_ids)
+    positions = np.searchsorted(attribute_ids, node_ids, sorter=order)
+    positions = np.clip(positions, 0, len(attribute_ids) - 1)
+    matched = attribute_ids[order[positions]] == node_ids
+    if not matched.all():
+        raise ValueError(f"{int((~matched).sum())} nodes have no adopter category in {path}")
+    return raw[order[positions], 1]
+
+
+def assign_categories_by_degree(edge_list: EdgeList, config: SimulationConfig) -> np.ndarray:
+    """
+    Assign adopter categories by degree rank
+
+    The best connected nodes become Innovators, then Early Adopters and so
+    on, following the configured adopter distribution.
+
+    Args:
+        edge_list: Loaded edge list
+        config: Simulation configuration (adopter distribution)
+
+    Returns:
+        Array with the adopter category of every node
+    """
+    counts = config.get_agents_per_category(edge_list.num_nodes)
+    ranked = np.argsort(-edge_list.degrees(), kind="stable")
+
+    categories = np.empty(edge_list.num_nodes, dtype=object)
+    start = 0
+    for category in ADOPTER_CATEGORIES:
+        count = counts.get(category, 0)
+        categories[ranked[start:start + count]] = category
+        start += count
+    return categories
+
+
+def load_edge_list(config: SimulationConfig) -> EdgeList:
+    """
+    Load an external edge list described by the network parameters
+
+    Supported network_params:
+        path: Edge list file (SNAP whitespace text, CSV, NPY or NPZ)
+        format: "auto", "snap", "csv", "npy" or "npz"
+        delimiter: Column delimiter for text formats (whitespace by default)
+        category_assignment: "degree" or "attribute"
+        attributes_path: node,category file used with "attribute" assignment
+
+    Args:
+        config: Simulation configuration with network_type "edge_list"
+
+    Returns:
+        EdgeList with adopter categories assigned; the configuration is not
+        modified, callers size the population with edge_list.num_nodes
+    """
+    params = config.network_params
+    path = params["path"]
+    fmt = params.get("format", "auto")
+    if fmt == "auto":
+        fmt = _detect_format(path)
+    delimiter = params.get("delimiter")
+    comment = params.get("comment", "#")
+
+    load_start = time.time()
+    raw = _read_raw_edges(path, fmt, delimiter, comment)
+    if raw.ndim != 2 or raw.shape[1] < 2:
+        raise ValueError(f"Edge list {path} must have two columns, got shape {raw.shape}")
+
+    # Relabel node ids to 0..N-1
+    num_raw = raw.shape[0]
+    node_ids, inverse = np.unique(np.concatenate([raw[:, 0], raw[:, 1]]), return_inverse=True)
+    num_nodes = len(node_ids)
+    index_dtype = np.int32 if num_nodes < np.iinfo(np.int32).max else np.int64
+    sources = inverse[:num_raw].astype(index_dtype)
+    targets = inverse[num_raw:].astype(index_dtype)
+
+    # Drop self-loops and duplicate undirected edges
+    low = np.minimum(sources, targets).astype(np.int64)
+    high = np.maximum(sources, targets).astype(np.int64)
+    keep = low != high
+    keys = np.unique(low[keep] * num_nodes + high[keep])
+    edge_list = EdgeList(node_ids, (keys // num_nodes).astype(index_dtype), (keys % num_nodes).astype(index_dtype))
+
+    if edge_list.num_nodes < 2:
+        raise ValueError(f"Edge list {path} must contain at least 2 nodes, got {edge_list.num_nodes}")
+
+    assignment = params.get("category_assignment", "degree")
+    if assignment == "attribute":
+        edge_list.categories = _read_attributes(params["attributes_path"], node_ids, delimiter, comment)
+    elif assignment == "degree":
+        edge_list.categories = assign_categories_by_degree(edge_list, config)
+    else:
+        raise ValueError(f"Unknown category_assignment {assignment}, expected 'degree' or 'attribute'")
+
+    logger.info(f"Loaded edge list {path} in {time.time() - load_start:.3f}s: "
+                f"{edge_list.num_nodes} nodes, {edge_list.num_edges} edges "
+                f"({num_raw - edge_list.num_edges} self-loops/duplicates dropped)")
+    return edge_list
+
+
+def map_edge_list_to_agents(edge_list: EdgeList, agents: List):
+    """
+    Set agent connections straight from the CSR adjacency of an edge list
+
+    Args:
+        edge_list: Loaded edge list with categories assigned
+        agents: Agents created from edge_list.category_counts(), grouped by category
+
+    Returns:
+        Array mapping node index -> agent index
+    """
+    agent_order = edge_list.agent_order()
+    node_to_agent = np.empty(edge_list.num_nodes, dtype=np.int64)
+    node_to_agent[agent_order] = np.arange(edge_list.num_nodes)
+
+    indptr, indices = edge_list.adjacency()
+    agent_indices = node_to_agent[indices]
+    for node in range(edge_list.num_nodes):
+        agent = agents[node_to_agent[node]]
+        # Edges are deduplicated, so the O(k) checks of add_connection are not needed
+        agent.connections = [agents[j] for j in agent_indices[indptr[node]:indptr[node + 1]].tolist()]
+
+    return node_to_agent
@@ -0,0 +1,110 @@
+"""
+Structured event log of simulation runs
+
+Decisions, retries and step summaries are written as JSON lines, one event
+per line:
+
+    {"time": 1760000000.12, "event": "decision", "step": 3, "agent_id": "Innovator_agent_001", ...}
+
+The simulation only builds a small dict per event and puts it on a queue
+(logging.handlers.QueueHandler); serialization and file writes happen on a
+QueueListener thread, off the event loop. Decision events can be sampled,
+run and step events are always written. Logs are read back with
+read_events().
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOG_DIR = os.path.join("results", "events")
+EVENT_LOGGER_NAME = "social.events"
+
+
+class _EventQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves all formatting to the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _JsonLinesFormatter(logging.Formatter):
+    """One JSON object per event"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({"time": record.created, "event": record.msg, **record.fields},
+                          default=str, ensure_ascii=False)
+
+
+class EventLog:
+    """
+    JSON lines event log written on a background thread
+    """
+
+    def __init__(self, log_dir: str = EVENT_LOG_DIR, sample_rate: float = 1.0, seed: Optional[int] = None):
+        """
+        Create a new event log and start its writer thread
+
+        Args:
+            log_dir: Directory holding the event logs
+            sample_rate: Fraction of decision events to write (0-1)
+            seed: Seed of the decision sampling
+        """
+        os.makedirs(log_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.path = os.path.join(log_dir, f"events_{timestamp}.jsonl")
+        self.sample_rate = sample_rate
+        self._random = random.Random(seed)
+
+        self._file_handler = logging.FileHandler(self.path, encoding="utf-8")
+        self._file_handler.setFormatter(_JsonLinesFormatter())
+        self._queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self._queue_handler = _EventQueueHandler(self._queue)
+        self._listener = logging.handlers.QueueListener(self._queue, self._file_handler)
+        self._listener.start()
+
+    def sampled(self) -> bool:
+        """Whether the next decision event should be written"""
+        return self.sample_rate >= 1.0 or self._random.random() < self.sample_rate
+
+    def emit(self, event: str, **fields: Any):
+        """
+        Queue an event
+
+        Args:
+            event: Event name
+            **fields: JSON-serializable event fields
+        """
+        # Records are built directly: no caller lookup, no message formatting
+        record = logging.LogRecord(EVENT_LOGGER_NAME, logging.INFO, "", 0, event, None, None)
+        record.fields = fields
+        self._queue_handler.handle(record)
+
+    def close(self):
+        """Write the queued events and stop the writer thread"""
+        self._listener.stop()
+        self._file_handler.close()
+        logger.info(f"Event log written to {self.path}")
+
+
+def read_events(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read the events of an event log
+
+    Args:
+        path: Event log path
+
+    Yields:
+        Event dictionaries in the order they were written
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,285 @@
+"""
+Live operational metrics of running simulations
+
+SocialDiffusionSimulation and AgentOrchestrator record decisions, retries,
+parse failures, LLM requests in flight, token usage and progress in a
+SimulationMetrics object. The metrics are exposed in OpenMetrics text
+format by a local HTTP endpoint (MetricsServer, GET /metrics) and/or a file
+rewritten periodically (MetricsFileWriter, e.g. for the node_exporter
+textfile collector), both enabled through the simulation configuration:
+
+    SimulationConfig(metrics_port=9464, metrics_file="results/metrics.prom")
+
+Recording happens on the simulation's event loop and only updates counters;
+the text is rendered on the exporter threads.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Seconds covered by the decisions/sec and tokens/sec gauges
+RATE_WINDOW = 60
+# Most recent decisions used for the latency quantiles
+LATENCY_WINDOW = 1024
+LATENCY_QUANTILES = (0.5, 0.95)
+# Seconds between rewrites of the metrics file
+METRICS_FILE_INTERVAL = 5.0
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class SimulationMetrics:
+    """
+    Counters and gauges of one simulation run
+    """
+
+    def __init__(self, name: str = "", config_hash: str = "", num_agents: int = 0, max_steps: int = 0):
+        """
+        Args:
+            name: Simulation name (run info label)
+            config_hash: Configuration hash (run info label)
+            num_agents: Population size
+            max_steps: Maximum number of steps
+        """
+        self.name = name
+        self.config_hash = config_hash
+        self.num_agents = num_agents
+        self.max_steps = max_steps
+
+        self.start_time = time.time()
+        self.running = False
+        self.current_step = 0
+        self.total_adoptions = 0
+        self.adoption_rate = 0.0
+
+        self.decisions = 0
+        self.in_flight = 0
+        self.retries = 0
+        self.parse_failures = 0
+        self.decision_failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency_sum = 0.0
+
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        # [second, decisions, tokens] per second of the rate window
+        self._buckets: Deque[List[int]] = deque()
+
+    # Recording (simulation event loop)
+
+    def request_started(self):
+        self.in_flight += 1
+
+    def request_finished(self):
+        self.in_flight -= 1
+
+    def record_decision(self, latency: float, prompt_tokens: int = 0, completion_tokens: int = 0):
+        """
+        Record a completed decision
+
+        Args:
+            latency: Seconds from the first attempt to the accepted answer
+            prompt_tokens: Prompt tokens of all attempts
+            completion_tokens: Completion tokens of all attempts
+        """
+        tokens = prompt_tokens + completion_tokens
+        second = int(time.time())
+        with self._lock:
+            self.decisions += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.latency_sum += latency
+            self._latencies.append(latency)
+            if self._buckets and self._buckets[-1][0] == second:
+                self._buckets[-1][1] += 1
+                self._buckets[-1][2] += tokens
+            else:
+                self._buckets.append([second, 1, tokens])
+                while self._buckets[0][0] <= second - RATE_WINDOW:
+                    self._buckets.popleft()
+
+    def record_parse_failure(self, retried: bool):
+        """Record an invalid LLM answer (retried or not)"""
+        self.parse_failures += 1
+        if retried:
+            self.retries += 1
+
+    def record_decision_failure(self):
+        """Record a decision that failed after all retries"""
+        self.decision_failures += 1
+
+    def record_step(self, step: int, total_adoptions: int, adoption_rate: float):
+        """Record the state after a step"""
+        self.current_step = step
+        self.total_adoptions = total_adoptions
+        self.adoption_rate = adoption_rate
+
+    # Reading (exporter threads)
+
+    def rates(self, now: Optional[float] = None) -> Tuple[float, float]:
+        """Decisions and tokens per second over the last RATE_WINDOW seconds"""
+        now = time.time() if now is None else now
+        with self._lock:
+            buckets = [bucket for bucket in self._buckets if bucket[0] > now - RATE_WINDOW]
+        span = min(RATE_WINDOW, max(now - self.start_time, 1.0))
+        return sum(bucket[1] for bucket in buckets) / span, sum(bucket[2] for bucket in buckets) / span
+
+    def latency_quantiles(self) -> Dict[float, float]:
+        """Decision latency quantiles over the last LATENCY_WINDOW decisions"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return {quantile: float("nan") for quantile in LATENCY_QUANTILES}
+        return {
+            quantile: latencies[min(len(latencies) - 1, int(quantile * len(latencies)))]
+            for quantile in LATENCY_QUANTILES
+        }
+
+    def render(self) -> str:
+        """Metrics in OpenMetrics text format"""
+        decisions_per_second, tokens_per_second = self.rates()
+        lines = [
+            "# TYPE social_run info",
+            "# HELP social_run Simulation run",
+            f'social_run_info{{name="{_escape_label(self.name)}",config_hash="{_escape_label(self.config_hash)}"}} 1',
+        ]
+
+        def metric(name: str, metric_type: str, help_text: str, value, suffix: str = ""):
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"{name}{suffix} {value}")
+
+        metric("social_running", "gauge", "1 while the simulation is stepping", int(self.running))
+        metric("social_agents", "gauge", "Agents in the simulation", self.num_agents)
+        metric("social_max_steps", "gauge", "Maximum number of steps", self.max_steps)
+        metric("social_step", "gauge", "Last completed step", self.current_step)
+        metric("social_adoptions", "gauge", "Agents that have adopted", self.total_adoptions)
+        metric("social_adoption_rate", "gauge", "Fraction of agents that have adopted", self.adoption_rate)
+        metric("social_decisions", "counter", "Completed adoption decisions", self.decisions, "_total")
+        metric("social_decisions_per_second", "gauge",
+               f"Decisions per second over the last {RATE_WINDOW} seconds", round(decisions_per_second, 6))
+        metric("social_llm_requests_in_flight", "gauge", "LLM requests awaiting an answer", self.in_flight)
+        metric("social_decision_retries", "counter", "Decisions retried after an invalid answer", self.retries, "_total")
+        metric("social_parse_failures", "counter", "LLM answers without a valid decision", self.parse_failures, "_total")
+        metric("social_decision_failures", "counter", "Decisions that failed after all retries",
+               self.decision_failures, "_total")
+        metric("social_prompt_tokens", "counter", "Prompt tokens", self.prompt_tokens, "_total")
+        metric("social_completion_tokens", "counter", "Completion tokens", self.completion_tokens, "_total")
+        metric("social_tokens_per_second", "gauge",
+               f"Prompt and completion tokens per second over the last {RATE_WINDOW} seconds",
+               round(tokens_per_second, 6))
+
+        lines.append("# TYPE social_decision_latency_seconds summary")
+        lines.append("# UNIT social_decision_latency_seconds seconds")
+        lines.append(f"# HELP social_decision_latency_seconds Decision latency including retries "
+                     f"(quantiles over the last {LATENCY_WINDOW} decisions)")
+        for quantile, value in self.latency_quantiles().items():
+            lines.append(f'social_decision_latency_seconds{{quantile="{quantile}"}} {value:.6f}')
+        lines.append(f"social_decision_latency_seconds_sum {self.latency_sum:.6f}")
+        lines.append(f"social_decision_latency_seconds_count {self.decisions}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Local HTTP endpoint serving the metrics of a simulation at /metrics
+    """
+
+    def __init__(self, metrics: SimulationMetrics, port: int, host: str = "127.0.0.1"):
+        """
+        Start serving on a background thread
+
+        Args:
+            metrics: Metrics to serve
+            port: TCP port (0 picks a free port, see self.port)
+            host: Interface to bind (local only by default)
+        """
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split("?")[0] not in ("/", "/metrics"):
+                    handler.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                handler.send_response(200)
+                handler.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                logger.debug("Metrics request: " + format, *args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Serving simulation metrics on http://{host}:{self.port}/metrics")
+
+    def close(self):
+        """Stop serving"""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class MetricsFileWriter:
+    """
+    Rewrites a metrics file periodically (atomically, by renaming a temporary file)
+    """
+
+    def __init__(self, metrics: SimulationMetrics, path: str, interval: float = METRICS_FILE_INTERVAL):
+        """
+        Start writing on a background thread
+
+        Args:
+            metrics: Metrics to write
+            path: Metrics file
+            interval: Seconds between rewrites
+        """
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-file", daemon=True)
+        self._thread.start()
+        logger.info(f"Writing simulation metrics to {path} every {interval:g}s")
+
+    def write(self):
+        """Write the current metrics"""
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.metrics.render())
+        os.replace(temporary, self.path)
+
+    def _run(self):
+        while True:
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning(f"Failed to write metrics file {self.path}: {e}")
+            if self._stop.wait(self.interval):
+                break
+
+    def close(self):
+        """Write the final metrics and stop"""
+        self._stop.set()
+        self._thread.join()
+        self.write()
@@ -1,10 +1,249 @@
-from autogen_ext.models.ollama import OllamaChatCompletionClient
-from autogen_core.models import ChatCompletionClient
+"""
+LLM clients and model routing
 
+A simulation can send different adopter categories or phases to different
+models with a routing table (SimulationConfig.model_routes). Rules are
+checked in order and the first match wins; agents without a matching rule
+use DEFAULT_MODEL:
 
-def create_llm_client() -> ChatCompletionClient:
-    """Get or create LLM client instance"""
-    return OllamaChatCompletionClient(
-        #model="mistral:7b",
-        model="llama3.1:8b",
-    )
+    model_routes=[
+        {"category": ["EarlyMajority", "LateMajority"], "model": "llama3.2:3b"},
+        {"phase": "first_step", "model": "llama3.2:3b", "options": {"temperature": 0.7}},
+        {"name": "large", "model": "llama3.1:8b"},
+    ]
+
+Match keys: "category" (name or list of names), "phase" ("first_step" or
+"later_steps") and the optional route "name". Every other key (model, host,
+options, model_info, timeout, ...) configures the Ollama client. One client
+is created per distinct client configuration and shared by all its agents.
+
+With a model cascade (SimulationConfig.model_cascade) every decision is first
+asked to a small screening model; it escalates to the agent's routed model
+only when the screening answer is invalid or its confidence_level is below
+the threshold:
+
+    model_cascade={"model": "llama3.2:3b", "confidence_threshold": 7}
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from autogen_core.models import ChatCompletionClient
+
+DEFAULT_MODEL = "llama3.1:8b"
+
+FIRST_STEP = "first_step"
+LATER_STEPS = "later_steps"
+ROUTE_PHASES = (FIRST_STEP, LATER_STEPS)
+# Route keys that select agents rather than configure the client
+ROUTE_MATCH_KEYS = ("name", "category", "phase")
+
+DEFAULT_ROUTE = "default"
+SCREENING_ROUTE = "screening"
+# Route names used by the router itself
+RESERVED_ROUTE_NAMES = (DEFAULT_ROUTE, SCREENING_ROUTE)
+DEFAULT_CONFIDENCE_THRESHOLD = 7
+
+
+def create_llm_client(model: str = DEFAULT_MODEL, **client_options: Any) -> "ChatCompletionClient":
+    """
+    Create an LLM client
+
+    Args:
+        model: Ollama model name
+        **client_options: Further OllamaChatCompletionClient arguments (host, options, ...)
+    """
+    # Imported on first use, the Ollama client pulls in httpx and pydantic models
+    from autogen_ext.models.ollama import OllamaChatCompletionClient
+
+    return OllamaChatCompletionClient(model=model, **client_options)
+
+
+def route_phase(step: int) -> str:
+    """Routing phase of a simulation step"""
+    return FIRST_STEP if step <= 1 else LATER_STEPS
+
+
+def validate_routes(routes: List[Dict[str, Any]], categories: List[str]):
+    """
+    Check a routing table
+
+    Raises:
+        ValueError: If a rule is malformed or route names are not unique
+    """
+    if not isinstance(routes, list):
+        raise ValueError(f"model_routes must be a list of rules, got {type(routes).__name__}")
+    names = set()
+    for index, rule in enumerate(routes):
+        if not isinstance(rule, dict):
+            raise ValueError(f"Model route {index} must be a dict, got {type(rule).__name__}")
+        # Routes (and their statistics) are keyed by name
+        name = rule.get("name", f"route_{index}")
+        if name in RESERVED_ROUTE_NAMES:
+            raise ValueError(f"Model route {index} cannot use the reserved name {name}")
+        if name in names:
+            raise ValueError(f"Model route {index} has duplicate name {name}")
+        names.add(name)
+        rule_categories = rule.get("category", [])
+        for category in [rule_categories] if isinstance(rule_categories, str) else rule_categories:
+            if category not in categories:
+                raise ValueError(f"Model route {index} has unknown category {category}")
+        if "phase" in rule and rule["phase"] not in ROUTE_PHASES:
+            raise ValueError(f"Model route {index} phase must be one of {ROUTE_PHASES}, got {rule['phase']}")
+
+
+def validate_cascade(cascade: Dict[str, Any]):
+    """
+    Check a model cascade configuration
+
+    Raises:
+        ValueError: If the cascade is malformed
+    """
+    if not isinstance(cascade, dict) or "model" not in cascade:
+        raise ValueError("model_cascade must be a dict with the screening 'model'")
+    threshold = cascade.get("confidence_threshold", DEFAULT_CONFIDENCE_THRESHOLD)
+    if not isinstance(threshold, (int, float)) or not 0 <= threshold <= 10:
+        raise ValueError(f"model_cascade confidence_threshold must be in [0,10], got {threshold}")
+
+
+@dataclass
+class ModelRoute:
+    """A routed model with its client and usage statistics"""
+    name: str
+    client_config: Dict[str, Any]
+    client: Any = field(default=None, repr=False)
+
+    # LLM requests answered by the route and their total duration
+    requests: int = 0
+    request_time: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Accepted decisions
+    decisions: int = 0
+    adoptions: int = 0
+    confidence_sum: float = 0.0
+    parse_failures: int = 0
+    decision_failures: int = 0
+    # Screening answers passed on to the routed model (cascade)
+    escalations: int = 0
+
+    def _record_requests(self, requests: int, request_time: float, prompt_tokens: int, completion_tokens: int):
+        self.requests += requests
+        self.request_time += request_time
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+    def record_decision(self, requests: int, request_time: float, prompt_tokens: int, completion_tokens: int,
+                        decision: Optional[str], confidence_level: Any):
+        """Record an accepted decision and the requests it took (including retries)"""
+        self._record_requests(requests, request_time, prompt_tokens, completion_tokens)
+        self.decisions += 1
+        self.adoptions += decision == "ADOPT"
+        if isinstance(confidence_level, (int, float)):
+            self.confidence_sum += confidence_level
+
+    def record_failure(self, requests: int, request_time: float, prompt_tokens: int, completion_tokens: int):
+        """Record a decision that failed after all its retries and the requests it took"""
+        self._record_requests(requests, request_time, prompt_tokens, completion_tokens)
+        self.decision_failures += 1
+
+    def record_escalation(self, request_time: float, prompt_tokens: int, completion_tokens: int, valid: bool):
+        """Record a screening answer that was escalated"""
+        self._record_requests(1, request_time, prompt_tokens, completion_tokens)
+        self.escalations += 1
+        self.parse_failures += not valid
+
+    def stats(self) -> Dict[str, Any]:
+        """Throughput and answer quality of the route"""
+        return {
+            "model": self.client_config.get("model"),
+            "requests": self.requests,
+            "decisions": self.decisions,
+            "adoptions": self.adoptions,
+            "escalations": self.escalations,
+            "escalation_rate": self.escalations / self.requests if self.requests else None,
+            "parse_failures": self.parse_failures,
+            "parse_failure_rate": self.parse_failures / self.requests if self.requests else None,
+            "decision_failures": self.decision_failures,
+            "mean_request_time": self.request_time / self.requests if self.requests else None,
+            "requests_per_second": self.requests / self.request_time if self.request_time else None,
+            "mean_confidence": self.confidence_sum / self.decisions if self.decisions else None,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "tokens_per_second": ((self.prompt_tokens + self.completion_tokens) / self.request_time
+                                  if self.request_time else None),
+        }
+
+
+class ModelRouter:
+    """
+    Resolves the model route of an agent and shares one client per client configuration
+    """
+
+    def __init__(self, routes: Optional[List[Dict[str, Any]]] = None, cascade: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            routes: Routing rules (see module docstring); None routes everything to DEFAULT_MODEL
+            cascade: Screening model and confidence_threshold of a model cascade (None disables it)
+        """
+        self.rules = routes or []
+        self.cascade = cascade
+        self.confidence_threshold = (cascade or {}).get("confidence_threshold", DEFAULT_CONFIDENCE_THRESHOLD)
+        self.routes: Dict[str, ModelRoute] = {}
+        self._clients: Dict[str, "ChatCompletionClient"] = {}
+        self._resolved: Dict[Tuple[str, str], ModelRoute] = {}
+
+    @property
+    def screening(self) -> Optional[ModelRoute]:
+        """Route of the cascade's screening model (None without a cascade)"""
+        if self.cascade is None:
+            return None
+        rule = {key: value for key, value in self.cascade.items() if key != "confidence_threshold"}
+        return self._get_route({**rule, "name": SCREENING_ROUTE}, SCREENING_ROUTE)
+
+    def route(self, adopter_category: str, step: int) -> ModelRoute:
+        """
+        Route of an agent category at a simulation step
+
+        Clients are created on first use of a route.
+        """
+        key = (adopter_category, route_phase(step))
+        route = self._resolved.get(key)
+        if route is None:
+            route = self._resolved[key] = self._match(*key)
+        return route
+
+    def _match(self, adopter_category: str, phase: str) -> ModelRoute:
+        for index, rule in enumerate(self.rules):
+            rule_categories = rule.get("category")
+            if isinstance(rule_categories, str):
+                rule_categories = [rule_categories]
+            if rule_categories is not None and adopter_category not in rule_categories:
+                continue
+            if "phase" in rule and rule["phase"] != phase:
+                continue
+            return self._get_route(rule, f"route_{index}")
+        return self._get_route({}, DEFAULT_ROUTE)
+
+    def _get_route(self, rule: Dict[str, Any], default_name: str) -> ModelRoute:
+        name = rule.get("name", default_name)
+        route = self.routes.get(name)
+        if route is None:
+            client_config = {key: value for key, value in rule.items() if key not in ROUTE_MATCH_KEYS}
+            client_config.setdefault("model", DEFAULT_MODEL)
+            client_key = json.dumps(client_config, sort_keys=True, default=str)
+            if client_key not in self._clients:
+                self._clients[client_key] = create_llm_client(**client_config)
+            route = self.routes[name] = ModelRoute(name, client_config, self._clients[client_key])
+        return route
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics of every route used so far, by route name"""
+        return {name: route.stats() for name, route in self.routes.items()}
+
+    async def close(self):
+        """Close the shared clients"""
+        for client in self._clients.values():
+            await client.close()
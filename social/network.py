@@ -1,11 +1,17 @@
 import random
-import numpy as np
 import networkx as nx
+import numpy as np
 import logging
 import time
-from typing import List, Dict, Optional
-from social.agent import SocialAgent
+from typing import TYPE_CHECKING, List, Dict, Optional
 from social.config import SimulationConfig
+from social.edge_list import EdgeList, load_edge_list, map_edge_list_to_agents
+from social.network_cache import NetworkCache
+from social.network_statistics import EdgeArrayGraph, NetworkMetrics, NetworkStatistics, calculate_network_statistics
+from social.network_validation import NetworkValidator, agents_to_adjacency
+
+if TYPE_CHECKING:
+    from social.agent import SocialAgent
 
 logger = logging.getLogger(__name__)
 
@@ -18,16 +24,20 @@ class NetworkGenerator:
     - Watts & Strogatz (1998) - Small-world networks
     - Barabási & Albert (1999) - Scale-free networks  
     - Erdős-Rényi (1960) - Random networks
+    
+    Empirical networks can be loaded from external edge lists ("edge_list").
     """
     
     @staticmethod
-    def create_network(agents: List[SocialAgent], config: SimulationConfig) -> Dict:
+    def create_network(agents: List["SocialAgent"], config: SimulationConfig,
+                       edge_list: Optional[EdgeList] = None) -> Dict:
         """
         Create social network based on configuration using NetworkX
         
         Args:
             agents: List of social agents
             config: Simulation configuration
+            edge_list: Preloaded edge list for the "edge_list" network type
             
         Returns:
             Dict with network statistics
@@ -48,17 +58,51 @@ class NetworkGenerator:
             for agent in agents:
                 agent.connections = []
 
-            # Generate NetworkX graph based on type
-            nx_graph = NetworkGenerator._create_networkx_graph(num_agents, config)
+            # Reuse a previously generated network for reproducible (seeded) configurations
+            cache = NetworkCache() if config.network_cache_enabled else None
+            cache_key = NetworkCache.cache_key(config) if cache else None
+            cached = cache.load(cache_key) if cache_key else None
+            cached_metrics = None
+            graph_source = None
 
-            # Map NetworkX graph to agent connections with proper shuffling support
-            NetworkGenerator._map_networkx_to_agents(nx_graph, agents, config.network_shuffle, config.network_seed)
-            
-            # Calculate network statistics using NetworkX
-            stats = NetworkGenerator._calculate_networkx_statistics(nx_graph)
+            if config.network_type == "edge_list":
+                # Empirical network: connections come straight from the edge list adjacency,
+                # the NetworkX graph is only built if visualization or statistics need it
+                if edge_list is None:
+                    edge_list = load_edge_list(config)
+                graph_source = NetworkGenerator._edge_list_graph_source(edge_list, agents)
+                nx_graph = None
+            else:
+                if cached is not None:
+                    nx_graph, cached_metrics = cached
+                    logger.info(f"Loaded {config.network_type} network from cache")
+                else:
+                    # Generate NetworkX graph based on type
+                    nx_graph = NetworkGenerator._create_networkx_graph(num_agents, config)
+
+                # Map NetworkX graph to agent connections with proper shuffling support
+                NetworkGenerator._map_networkx_to_agents(nx_graph, agents, config.network_shuffle, config.network_seed)
+            
+            # Calculate network statistics using NetworkX (expensive metrics may be deferred)
+            stats = NetworkGenerator._calculate_networkx_statistics(
+                nx_graph,
+                mode=config.network_statistics_mode,
+                sample_size=config.network_statistics_samples,
+                seed=config.network_seed,
+                known=cached_metrics,
+                graph_source=graph_source
+            )
+
+            if cache_key:
+                if cached is None:
+                    cache.store(cache_key, nx_graph, stats.cacheable())
+                if stats.pending:
+                    # Deferred metrics are written back to the entry once computed
+                    stats.on_resolve = lambda metrics: cache.update_metrics(cache_key, metrics.cacheable())
             
-            # Include networkx graph data for visualization consistency
-            stats["networkx_graph"] = nx_graph
+            # Include networkx graph data for visualization consistency (pending for edge lists)
+            if nx_graph is not None:
+                stats["networkx_graph"] = nx_graph
             
             network_time = time.time() - network_start
             logger.info(f"Network created in {network_time:.3f}s: "
@@ -173,7 +217,30 @@ class NetworkGenerator:
         return graph
     
     @staticmethod
-    def _map_networkx_to_agents(nx_graph: nx.Graph, agents: List[SocialAgent], 
+    def _edge_list_graph_source(edge_list: EdgeList, agents: List["SocialAgent"]) -> EdgeArrayGraph:
+        """
+        Map an empirical edge list to agent connections
+        
+        Args:
+            edge_list: Loaded edge list with adopter categories assigned
+            agents: Agents created from edge_list.category_counts()
+            
+        Returns:
+            Edge arrays of the network with the agent of every node
+        """
+        if len(agents) != edge_list.num_nodes:
+            raise ValueError(f"Edge list has {edge_list.num_nodes} nodes but {len(agents)} agents were created")
+
+        node_to_agent = map_edge_list_to_agents(edge_list, agents)
+        node_agents = [agents[agent_idx] for agent_idx in node_to_agent.tolist()]
+        return EdgeArrayGraph(
+            np.column_stack([edge_list.sources, edge_list.targets]),
+            [agent.agent_id for agent in node_agents],
+            [agent.adopter_category for agent in node_agents]
+        )
+    
+    @staticmethod
+    def _map_networkx_to_agents(nx_graph: nx.Graph, agents: List["SocialAgent"], 
                                 shuffle: bool = False, seed: Optional[int] = None):
         """
         Map NetworkX graph edges to agent connections with improved shuffling
@@ -226,7 +293,7 @@ class NetworkGenerator:
                     agent2.add_connection(agent1)
     
     @staticmethod
-    def _agents_to_networkx(agents: List[SocialAgent]) -> nx.Graph:
+    def _agents_to_networkx(agents: List["SocialAgent"]) -> nx.Graph:
         """
         Convert agent connections to NetworkX graph
         
@@ -242,22 +309,24 @@ class NetworkGenerator:
         for i, agent in enumerate(agents):
             graph.add_node(i, agent_id=agent.agent_id)
         
-        # Add edges
-        for i, agent in enumerate(agents):
-            for connection in agent.connections:
-                j = agents.index(connection)
-                if not graph.has_edge(i, j):
-                    graph.add_edge(i, j)
+        # Add edges using the id -> index map instead of list lookups
+        indptr, indices = agents_to_adjacency(agents)
+        for i in range(len(agents)):
+            graph.add_edges_from((i, int(j)) for j in indices[indptr[i]:indptr[i + 1]] if j >= 0)
         
         return graph
     
     @staticmethod
-    def validate_network(agents: List[SocialAgent]) -> Dict:
+    def validate_network(agents: List["SocialAgent"], mode: str = NetworkValidator.STRICT,
+                         sample_size: int = 1024, seed: Optional[int] = None) -> Dict:
         """
         Validate network structure and agent connections
         
         Args:
             agents: List of agents
+            mode: "strict" to check every connection, "sampled" for huge graphs
+            sample_size: Number of agents checked in sampled mode
+            seed: Random seed for sampling
             
         Returns:
             Dictionary with validation results
@@ -271,66 +340,8 @@ class NetworkGenerator:
                     "total_connections": 0
                 }
             
-            issues = []
-            total_connections = 0
-            symmetric_issues = 0
-            
-            # Check for basic issues
-            for i, agent in enumerate(agents):
-                if not hasattr(agent, 'connections'):
-                    issues.append(f"Agent {i} missing connections attribute")
-                    continue
-                
-                if not isinstance(agent.connections, list):
-                    issues.append(f"Agent {i} connections is not a list")
-                    continue
-                
-                total_connections += len(agent.connections)
-                
-                # Check for symmetric connections
-                for connection in agent.connections:
-                    if connection not in agents:
-                        issues.append(f"Agent {i} connected to non-existent agent")
-                        continue
-                    
-                    if agent not in connection.connections:
-                        symmetric_issues += 1
-            
-            # Check network connectivity using NetworkX
-            if len(agents) > 1:
-                try:
-                    nx_graph = NetworkGenerator._agents_to_networkx(agents)
-                    is_connected = nx.is_connected(nx_graph)
-                    num_components = nx.number_connected_components(nx_graph)
-                    
-                    if not is_connected and num_components > 1:
-                        issues.append(f"Network has {num_components} disconnected components")
-                        
-                except Exception as e:
-                    issues.append(f"NetworkX validation failed: {str(e)}")
-            
-            # Report symmetric connection issues
-            if symmetric_issues > 0:
-                issues.append(f"{symmetric_issues} asymmetric connections found")
-            
-            validation_result = {
-                "valid": len(issues) == 0,
-                "issues": issues,
-                "total_agents": len(agents),
-                "total_connections": total_connections // 2,  # Each connection counted twice
-                "symmetric_issues": symmetric_issues,
-                "warnings": []
-            }
-            
-            # Add warnings for potential issues
-            if total_connections == 0:
-                validation_result["warnings"].append("No connections found - isolated network")
-            
-            avg_connections = total_connections / len(agents) if agents else 0
-            if avg_connections < 2:
-                validation_result["warnings"].append(f"Low average connectivity: {avg_connections:.1f}")
-            
-            return validation_result
+            validator = NetworkValidator(mode=mode, sample_size=sample_size, seed=seed)
+            return validator.validate(agents)
             
         except Exception as e:
             logger.error(f"Network validation error: {e}")
@@ -342,74 +353,27 @@ class NetworkGenerator:
             }
     
     @staticmethod
-    def _calculate_networkx_statistics(nx_graph: nx.Graph) -> Dict:
+    def _calculate_networkx_statistics(nx_graph: Optional[nx.Graph], mode: str = NetworkStatistics.EXACT,
+                                       sample_size: int = 64, seed: Optional[int] = None,
+                                       known: Optional[Dict] = None,
+                                       graph_source: Optional[EdgeArrayGraph] = None) -> NetworkMetrics:
         """
-        Calculate comprehensive network statistics using NetworkX
+        Calculate network statistics using NetworkX
         
         Args:
-            nx_graph: NetworkX graph
+            nx_graph: NetworkX graph (None for edge lists, built from graph_source on demand)
+            mode: Statistics mode ("exact", "sampled" or "deferred")
+            sample_size: Number of sampled nodes for sampled statistics
+            seed: Random seed for sampling
+            known: Previously computed metrics to reuse
+            graph_source: Edge arrays of the network when nx_graph is None
 
         Returns:
-            Dictionary with network statistics
+            Dictionary with network statistics (expensive metrics computed lazily in deferred mode)
         """
         try:
-            num_nodes = nx_graph.number_of_nodes()
-            num_edges = nx_graph.number_of_edges()
-            
-            if num_nodes == 0:
-                return {
-                    "total_edges": 0,
-                    "avg_degree": 0,
-                    "density": 0,
-                    "avg_clustering": 0,
-                    "avg_shortest_path": float('inf'),
-                    "diameter": 0,
-                    "is_connected": False,
-                    "num_components": 0
-                }
-            
-            # Basic metrics
-            density = nx.density(nx_graph)
-            avg_degree = 2 * num_edges / num_nodes if num_nodes > 0 else 0
-            
-            # Clustering coefficient
-            avg_clustering = nx.average_clustering(nx_graph)
-            
-            # Connectivity metrics
-            is_connected = nx.is_connected(nx_graph)
-            num_components = nx.number_connected_components(nx_graph)
-            
-            # Path length metrics (only for connected graphs)
-            if is_connected and num_nodes > 1:
-                try:
-                    avg_shortest_path = nx.average_shortest_path_length(nx_graph)
-                    diameter = nx.diameter(nx_graph)
-                except:
-                    avg_shortest_path = float('inf')
-                    diameter = 0
-            else:
-                avg_shortest_path = float('inf')
-                diameter = 0
-            
-            # Degree statistics
-            degrees = dict(nx_graph.degree())
-            degree_values = list(degrees.values())
-            
-            return {
-                "total_edges": num_edges,
-                "avg_degree": avg_degree,
-                "density": density,
-                "avg_clustering": avg_clustering,
-                "avg_shortest_path": avg_shortest_path,
-                "diameter": diameter,
-                "is_connected": is_connected,
-                "num_components": num_components,
-                "min_degree": min(degree_values) if degree_values else 0,
-                "max_degree": max(degree_values) if degree_values else 0,
-                "std_degree": np.std(degree_values) if degree_values else 0,
-                "isolated_nodes": sum(1 for d in degree_values if d == 0)
-            }
-            
+            return calculate_network_statistics(nx_graph, mode=mode, sample_size=sample_size, seed=seed, known=known,
+                                                graph_source=graph_source)
         except Exception as e:
             logger.error(f"Error calculating network statistics: {e}")
             raise e
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join("cache", "networks")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class NetworkCache:
+    """
+    On-disk content-addressed cache of generated networks and their statistics
+
+    Entries are stored as compact int32 edge arrays plus a JSON blob of the
+    resolved metrics, keyed by a hash of the generator parameters. Every entry
+    carries a checksum that is verified on load; corrupted entries are dropped.
+    The cache is bounded in size and evicts least recently used entries.
+    """
+
+    FORMAT_VERSION = 1
+
+    # Generator inputs that fully determine the generated graph
+    KEY_FIELDS = ("network_type", "network_params", "network_seed", "num_agents", "network_shuffle")
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize network cache
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Maximum total size of the cache before eviction
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def cache_key(config) -> Optional[str]:
+        """
+        Compute the cache key for a configuration
+
+        Args:
+            config: Simulation configuration
+
+        Returns:
+            Hex digest, or None if the network is not generated from a seed
+        """
+        if config.network_seed is None or config.network_type == "edge_list":
+            return None
+
+        payload = {field: getattr(config, field) for field in NetworkCache.KEY_FIELDS}
+        payload["format_version"] = NetworkCache.FORMAT_VERSION
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    @staticmethod
+    def _checksum(edges: np.ndarray, num_nodes: int, metrics_json: bytes) -> str:
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(edges, dtype=np.int32).tobytes())
+        digest.update(str(num_nodes).encode("utf-8"))
+        digest.update(metrics_json)
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[Tuple[nx.Graph, Dict[str, Any]]]:
+        """
+        Load a cached network
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple (graph, metrics) or None on miss or failed integrity check
+        """
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                edges = entry["edges"]
+                num_nodes = int(entry["num_nodes"])
+                metrics_json = entry["metrics"].tobytes()
+                stored_key = entry["key"].tobytes().decode("utf-8")
+                stored_checksum = entry["checksum"].tobytes().decode("utf-8")
+
+            if stored_key != key or stored_checksum != self._checksum(edges, num_nodes, metrics_json):
+                raise ValueError("checksum mismatch")
+
+            metrics = json.loads(metrics_json.decode("utf-8"))
+        except Exception as e:
+            logger.warning(f"Dropping corrupted network cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        graph = nx.Graph()
+        graph.add_nodes_from(range(num_nodes))
+        graph.add_edges_from(edges.tolist())
+
+        # Mark entry as recently used for eviction
+        os.utime(path)
+        logger.debug(f"Network cache hit {key[:12]}: {num_nodes} nodes, {len(edges)} edges")
+        return graph, metrics
+
+    def store(self, key: str, nx_graph: nx.Graph, metrics: Dict[str, Any]):
+        """
+        Store a generated network and its resolved metrics
+
+        Args:
+            key: Cache key
+            nx_graph: Generated graph (nodes labelled 0..N-1)
+            metrics: Resolved, JSON-serializable metrics
+        """
+        num_nodes = nx_graph.number_of_nodes()
+        edges = np.array(list(nx_graph.edges()), dtype=np.int32).reshape(-1, 2)
+        self._write(key, edges, num_nodes, metrics)
+
+    def update_metrics(self, key: str, metrics: Dict[str, Any]):
+        """
+        Replace the metrics of a cached network (e.g. once deferred metrics are computed)
+
+        Args:
+            key: Cache key
+            metrics: Resolved, JSON-serializable metrics
+        """
+        path = self._entry_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                edges = entry["edges"]
+                num_nodes = int(entry["num_nodes"])
+                stored_checksum = entry["checksum"].tobytes().decode("utf-8")
+                if stored_checksum != self._checksum(edges, num_nodes, entry["metrics"].tobytes()):
+                    raise ValueError("checksum mismatch")
+        except Exception as e:
+            logger.debug(f"Cannot update network cache entry {key[:12]}: {e}")
+            return
+        self._write(key, edges, num_nodes, metrics)
+
+    def _write(self, key: str, edges: np.ndarray, num_nodes: int, metrics: Dict[str, Any]):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        metrics_json = json.dumps(metrics, sort_keys=True).encode("utf-8")
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    edges=edges,
+                    num_nodes=np.int64(num_nodes),
+                    metrics=np.frombuffer(metrics_json, dtype=np.uint8),
+                    key=np.frombuffer(key.encode("utf-8"), dtype=np.uint8),
+                    checksum=np.frombuffer(self._checksum(edges, num_nodes, metrics_json).encode("utf-8"), dtype=np.uint8)
+                )
+            os.replace(tmp_path, self._entry_path(key))
+        except Exception as e:
+            logger.warning(f"Failed to store network cache entry {key[:12]}: {e}")
+            self._remove(tmp_path)
+            return
+
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npz"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            logger.debug(f"Evicted network cache entry {path}")
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove every cache entry"""
+        if not os.path.exists(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npz"):
+                self._remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,194 @@
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LAYOUT_DIR = os.path.join("cache", "layouts")
+
+CIRCULAR = "circular"
+SPRING = "spring"
+LAYOUT_ALGORITHMS = (CIRCULAR, SPRING)
+
+# Layouts cheap enough to compute on the spot; the others run in the background
+FAST_ALGORITHMS = (CIRCULAR,)
+
+
+def graph_hash(graph: nx.Graph) -> str:
+    """
+    Structural hash of a graph (node order and edges), cached on the graph
+
+    Args:
+        graph: NetworkX graph
+
+    Returns:
+        Hex digest
+    """
+    cached = graph.graph.get("structure_hash")
+    if cached is not None:
+        return cached
+
+    nodes = list(graph.nodes())
+    node_position = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(node_position[u], node_position[v]) for u, v in graph.edges()], dtype=np.int64).reshape(-1, 2)
+    keys = np.sort(np.minimum(edges[:, 0], edges[:, 1]) * len(nodes) + np.maximum(edges[:, 0], edges[:, 1]))
+
+    digest = hashlib.sha256()
+    digest.update(str(len(nodes)).encode("utf-8"))
+    digest.update(keys.tobytes())
+    graph.graph["structure_hash"] = digest.hexdigest()
+    return graph.graph["structure_hash"]
+
+
+def compute_layout(graph: nx.Graph, algorithm: str = CIRCULAR, seed: int = 42) -> np.ndarray:
+    """
+    Compute node positions
+
+    Args:
+        graph: NetworkX graph
+        algorithm: One of LAYOUT_ALGORITHMS
+        seed: Random seed for force-directed layouts
+
+    Returns:
+        (N, 2) float32 array of positions in graph node order
+    """
+    num_nodes = graph.number_of_nodes()
+    if num_nodes <= 1:
+        return np.zeros((num_nodes, 2), dtype=np.float32)
+
+    if algorithm == CIRCULAR:
+        # Same placement as nx.circular_layout, without building a dict per node
+        theta = np.linspace(0, 1, num_nodes + 1)[:-1] * 2 * np.pi
+        return np.column_stack([np.cos(theta), np.sin(theta)]).astype(np.float32)
+
+    if algorithm == SPRING:
+        positions = nx.spring_layout(graph, seed=seed)
+        return np.array([positions[node] for node in graph.nodes()], dtype=np.float32)
+
+    raise ValueError(f"Unknown layout algorithm {algorithm}, expected one of {LAYOUT_ALGORITHMS}")
+
+
+class LayoutCache:
+    """
+    Cache of node positions keyed by graph hash and layout algorithm
+
+    Layouts are kept in memory and on disk, so they are computed once per
+    network and reused across renders and sessions. Expensive (force-directed)
+    layouts are computed in a background thread; until they are ready the
+    circular layout is returned.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_LAYOUT_DIR):
+        """
+        Initialize layout cache
+
+        Args:
+            cache_dir: Directory holding cached layouts
+        """
+        self.cache_dir = cache_dir
+        self._layouts: Dict[Tuple[str, str], np.ndarray] = {}
+        self._pending: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="layout")
+
+    def _entry_path(self, key: Tuple[str, str]) -> str:
+        return os.path.join(self.cache_dir, f"{key[0]}_{key[1]}.npy")
+
+    def _load(self, key: Tuple[str, str], num_nodes: int) -> Optional[np.ndarray]:
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            positions = np.load(path, allow_pickle=False)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable layout cache entry {path}: {e}")
+            positions = None
+        if positions is None or positions.shape != (num_nodes, 2):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return positions
+
+    def put(self, graph: nx.Graph, algorithm: str, positions: np.ndarray, persist: bool = True):
+        """
+        Add a layout (e.g. one stored with saved results)
+
+        Args:
+            graph: Graph the positions belong to
+            algorithm: Layout algorithm
+            positions: (N, 2) positions in graph node order
+            persist: Also write the layout to the disk cache
+        """
+        key = (graph_hash(graph), algorithm)
+        positions = np.asarray(positions, dtype=np.float32)
+        with self._lock:
+            self._layouts[key] = positions
+        if persist:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = self._entry_path(key) + ".tmp.npy"
+                np.save(tmp_path, positions)
+                os.replace(tmp_path, self._entry_path(key))
+            except OSError as e:
+                logger.warning(f"Failed to store layout {key[0][:12]}/{algorithm}: {e}")
+
+    def _compute(self, graph: nx.Graph, algorithm: str) -> np.ndarray:
+        positions = compute_layout(graph, algorithm)
+        self.put(graph, algorithm, positions, persist=algorithm not in FAST_ALGORITHMS)
+        with self._lock:
+            self._pending.pop((graph_hash(graph), algorithm), None)
+        return positions
+
+    def get(self, graph: nx.Graph, algorithm: str = CIRCULAR, background: bool = True) -> Tuple[np.ndarray, str]:
+        """
+        Get node positions for a graph
+
+        Args:
+            graph: NetworkX graph
+            algorithm: One of LAYOUT_ALGORITHMS
+            background: Compute expensive layouts in the background (returning
+                the circular layout meanwhile) instead of blocking
+
+        Returns:
+            Tuple (positions in graph node order, algorithm actually used)
+        """
+        key = (graph_hash(graph), algorithm)
+        with self._lock:
+            positions = self._layouts.get(key)
+        if positions is not None:
+            return positions, algorithm
+
+        if algorithm not in FAST_ALGORITHMS:
+            positions = self._load(key, graph.number_of_nodes())
+            if positions is not None:
+                with self._lock:
+                    self._layouts[key] = positions
+                return positions, algorithm
+
+        if algorithm in FAST_ALGORITHMS or not background:
+            return self._compute(graph, algorithm), algorithm
+
+        with self._lock:
+            if key not in self._pending:
+                # The worker gets its own copy so renders may keep annotating the graph
+                self._pending[key] = self._executor.submit(self._compute, graph.copy(), algorithm)
+                logger.info(f"Computing {algorithm} layout for {graph.number_of_nodes()} nodes in the background")
+        return self.get(graph, CIRCULAR)[0], CIRCULAR
+
+    def has(self, graph: nx.Graph, algorithm: str) -> bool:
+        """Whether a layout is in the in-memory cache"""
+        with self._lock:
+            return (graph_hash(graph), algorithm) in self._layouts
+
+    def is_pending(self, graph: nx.Graph, algorithm: str) -> bool:
+        """Whether a background layout computation is still running"""
+        with self._lock:
+            return (graph_hash(graph), algorithm) in self._pending
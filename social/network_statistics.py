@@ -0,0 +1,504 @@
+import logging
+import math
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+
+def _basic_metrics(num_nodes: int, num_edges: int, density: float, num_components: int,
+                   degree_values: np.ndarray) -> Dict:
+    if num_nodes == 0:
+        return {
+            "total_edges": 0,
+            "avg_degree": 0,
+            "density": 0,
+            "is_connected": False,
+            "num_components": 0
+        }
+    return {
+        "total_edges": num_edges,
+        "avg_degree": 2 * num_edges / num_nodes,
+        "density": density,
+        "is_connected": num_components == 1,
+        "num_components": num_components,
+        "min_degree": int(degree_values.min()),
+        "max_degree": int(degree_values.max()),
+        "std_degree": float(np.std(degree_values)),
+        "isolated_nodes": int(np.count_nonzero(degree_values == 0))
+    }
+
+
+class EdgeArrayGraph:
+    """
+    Network kept as an edge array, converted to a NetworkX graph on first use
+
+    Empirical networks and networks loaded from results files are simulated
+    and saved from their arrays; the NetworkX graph (Python objects for every
+    node and edge) is only built when visualization or path and clustering
+    statistics ask for it.
+    """
+
+    def __init__(self, edges: np.ndarray, node_agent_ids: List[Optional[str]],
+                 node_categories: List[Optional[str]]):
+        """
+        Args:
+            edges: (E, 2) array of node indices 0..N-1, without duplicate edges
+            node_agent_ids: Agent id of every node (None for nodes without agent)
+            node_categories: Adopter category of every node
+        """
+        self.edges = edges
+        self.node_agent_ids = node_agent_ids
+        self.node_categories = node_categories
+        self.num_nodes = len(node_agent_ids)
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph) -> 'EdgeArrayGraph':
+        """Edge arrays of a NetworkX graph (nodes renumbered in graph order, agent attributes kept)"""
+        nodes = list(graph.nodes())
+        node_position = {node: i for i, node in enumerate(nodes)}
+        edges = np.array([(node_position[u], node_position[v]) for u, v in graph.edges()],
+                         dtype=np.int32).reshape(-1, 2)
+        return cls(edges, [graph.nodes[node].get("agent_id") for node in nodes],
+                   [graph.nodes[node].get("adopter_category") for node in nodes])
+
+    def basic_statistics(self) -> Dict:
+        """O(N+E) network statistics computed on the arrays"""
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        num_nodes, num_edges = self.num_nodes, len(self.edges)
+        degree_values = np.bincount(self.edges.ravel(), minlength=num_nodes)
+        density = 2 * num_edges / (num_nodes * (num_nodes - 1)) if num_nodes > 1 else 0
+        num_components = 0
+        if num_nodes:
+            adjacency = csr_matrix((np.ones(num_edges, dtype=np.int8), (self.edges[:, 0], self.edges[:, 1])),
+                                   shape=(num_nodes, num_nodes))
+            num_components, _ = connected_components(adjacency, directed=False)
+        return _basic_metrics(num_nodes, num_edges, density, int(num_components), degree_values)
+
+    def to_networkx(self) -> nx.Graph:
+        """NetworkX graph with agent_id and adopter_category on every agent node"""
+        graph = nx.Graph()
+        graph.add_nodes_from(
+            (node, {"agent_id": agent_id, "adopter_category": category}) if agent_id is not None else (node, {})
+            for node, (agent_id, category) in enumerate(zip(self.node_agent_ids, self.node_categories))
+        )
+        graph.add_edges_from(self.edges.tolist())
+        return graph
+
+
+class NetworkStatistics:
+    """
+    Network statistics engine with exact, sampled and deferred modes
+
+    Cheap O(N+E) metrics (degrees, density, components) are always computed
+    exactly. Expensive metrics (clustering and all-pairs path lengths) are
+    computed according to the mode:
+    - exact: full NetworkX algorithms at creation time
+    - sampled: k-source BFS and sampled clustering at creation time
+    - deferred: nothing at creation time, computed on first access
+      (exactly for small graphs, sampled above EXACT_NODE_LIMIT)
+    """
+
+    EXACT = "exact"
+    SAMPLED = "sampled"
+    DEFERRED = "deferred"
+    MODES = (EXACT, SAMPLED, DEFERRED)
+
+    BASIC_METRICS = (
+        "total_edges", "avg_degree", "density", "is_connected", "num_components",
+        "min_degree", "max_degree", "std_degree", "isolated_nodes"
+    )
+    EXPENSIVE_METRICS = ("avg_clustering", "avg_shortest_path", "diameter")
+    # Pending entry of the NetworkX graph when statistics start from a graph source
+    GRAPH = "networkx_graph"
+
+    # Deferred metrics fall back to sampling above this many nodes
+    EXACT_NODE_LIMIT = 2000
+
+    def __init__(self, nx_graph: Optional[nx.Graph], mode: str = DEFERRED,
+                 sample_size: int = 64, seed: Optional[int] = None,
+                 graph_source: Optional[EdgeArrayGraph] = None):
+        """
+        Initialize statistics engine
+
+        Args:
+            nx_graph: NetworkX graph (None to build it from graph_source when needed)
+            mode: One of "exact", "sampled", "deferred"
+            sample_size: Number of BFS sources / clustering nodes when sampling
+            seed: Random seed for sampling
+            graph_source: Edge arrays of the network when nx_graph is None
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown statistics mode {mode}, expected one of {self.MODES}")
+        if nx_graph is None and graph_source is None:
+            raise ValueError("A NetworkX graph or a graph source is required")
+
+        self._graph = nx_graph
+        self.graph_source = graph_source
+        self.num_nodes = nx_graph.number_of_nodes() if nx_graph is not None else graph_source.num_nodes
+        self.mode = mode
+        self.sample_size = max(1, sample_size)
+        self.seed = seed
+        self.errors: Dict[str, Dict[str, Any]] = {}
+        self.is_connected: Optional[bool] = None
+
+    @property
+    def graph(self) -> nx.Graph:
+        """NetworkX graph, built from the graph source on first use"""
+        if self._graph is None:
+            start = time.time()
+            self._graph = self.graph_source.to_networkx()
+            logger.debug(f"Built NetworkX graph from edge arrays in {time.time() - start:.3f}s")
+        return self._graph
+
+    def _resolve_method(self) -> str:
+        """Algorithm used for expensive metrics (exact or sampled)"""
+        if self.mode == self.DEFERRED:
+            if self.num_nodes > self.EXACT_NODE_LIMIT:
+                return self.SAMPLED
+            return self.EXACT
+        return self.mode
+
+    def basic_statistics(self) -> Dict:
+        """
+        Calculate O(N+E) network statistics
+
+        Returns:
+            Dictionary with degree, density and connectivity statistics
+        """
+        if self._graph is None:
+            values = self.graph_source.basic_statistics()
+        else:
+            num_nodes = self._graph.number_of_nodes()
+            degree_values = np.fromiter((d for _, d in self._graph.degree()), dtype=np.int64, count=num_nodes)
+            values = _basic_metrics(
+                num_nodes, self._graph.number_of_edges(), nx.density(self._graph) if num_nodes else 0,
+                nx.number_connected_components(self._graph) if num_nodes else 0, degree_values
+            )
+        self.is_connected = values["is_connected"]
+        return values
+
+    def compute(self, metric: str) -> Dict[str, Any]:
+        """
+        Compute an expensive metric (and any metric sharing its traversal)
+
+        Args:
+            metric: One of EXPENSIVE_METRICS, or GRAPH
+
+        Returns:
+            Dictionary of computed metric values
+        """
+        if metric == self.GRAPH:
+            return {self.GRAPH: self.graph}
+        if metric not in self.EXPENSIVE_METRICS:
+            raise KeyError(f"Unknown network metric: {metric}")
+
+        start = time.time()
+        method = self._resolve_method()
+
+        if metric == "avg_clustering":
+            values = self._clustering(method)
+        else:
+            values = self._path_lengths(method)
+
+        logger.debug(f"Computed {list(values)} ({method}) in {time.time() - start:.3f}s")
+        return values
+
+    def _sample_nodes(self, k: int) -> List:
+        """Deterministically sample k nodes of the graph"""
+        nodes = list(self.graph.nodes())
+        if k >= len(nodes):
+            return nodes
+        return random.Random(self.seed).sample(nodes, k)
+
+    def _clustering(self, method: str) -> Dict[str, Any]:
+        """Average clustering coefficient, exact or sampled"""
+        num_nodes = self.graph.number_of_nodes()
+        if num_nodes == 0:
+            return {"avg_clustering": 0}
+
+        if method == self.EXACT or self.sample_size >= num_nodes:
+            self.errors["avg_clustering"] = {"method": self.EXACT}
+            return {"avg_clustering": nx.average_clustering(self.graph)}
+
+        sample = self._sample_nodes(self.sample_size)
+        coefficients = np.fromiter(nx.clustering(self.graph, sample).values(), dtype=float)
+        k = len(coefficients)
+
+        # Standard error with finite population correction
+        fpc = math.sqrt((num_nodes - k) / (num_nodes - 1)) if num_nodes > 1 else 0.0
+        stderr = float(np.std(coefficients, ddof=1) / math.sqrt(k) * fpc) if k > 1 else float("inf")
+
+        self.errors["avg_clustering"] = {
+            "method": self.SAMPLED,
+            "samples": k,
+            "stderr": stderr
+        }
+        return {"avg_clustering": float(coefficients.mean())}
+
+    def _path_lengths(self, method: str) -> Dict[str, Any]:
+        """Average shortest path length and diameter, exact or via k-source BFS"""
+        if self.is_connected is None:
+            self.is_connected = self.graph.number_of_nodes() > 0 and nx.is_connected(self.graph)
+
+        num_nodes = self.graph.number_of_nodes()
+        # Path length metrics (only for connected graphs)
+        if not self.is_connected or num_nodes < 2:
+            return {"avg_shortest_path": float('inf'), "diameter": 0}
+
+        if method == self.EXACT or self.sample_size >= num_nodes:
+            self.errors["avg_shortest_path"] = {"method": self.EXACT}
+            self.errors["diameter"] = {"method": self.EXACT}
+            return {
+                "avg_shortest_path": nx.average_shortest_path_length(self.graph),
+                "diameter": nx.diameter(self.graph)
+            }
+
+        sources = self._sample_nodes(self.sample_size)
+        source_means = []
+        eccentricities = []
+        for source in sources:
+            lengths = nx.single_source_shortest_path_length(self.graph, source)
+            distances = np.fromiter(lengths.values(), dtype=np.int64, count=len(lengths))
+            source_means.append(distances.sum() / (num_nodes - 1))
+            eccentricities.append(int(distances.max()))
+
+        source_means = np.asarray(source_means)
+        k = len(source_means)
+        fpc = math.sqrt((num_nodes - k) / (num_nodes - 1))
+        stderr = float(np.std(source_means, ddof=1) / math.sqrt(k) * fpc) if k > 1 else float("inf")
+
+        # Any eccentricity is a lower bound on the diameter, 2 * ecc(v) an upper bound
+        diameter_lower = max(eccentricities)
+        diameter_upper = min(2 * min(eccentricities), num_nodes - 1)
+
+        self.errors["avg_shortest_path"] = {
+            "method": self.SAMPLED,
+            "samples": k,
+            "stderr": stderr
+        }
+        self.errors["diameter"] = {
+            "method": self.SAMPLED,
+            "samples": k,
+            "lower_bound": diameter_lower,
+            "upper_bound": diameter_upper
+        }
+        return {
+            "avg_shortest_path": float(source_means.mean()),
+            "diameter": diameter_lower
+        }
+
+
+class NetworkMetrics(dict):
+    """
+    Network statistics dictionary that computes pending metrics on first access
+
+    Behaves like the plain statistics dictionary used throughout the app, but
+    expensive metrics left pending by the statistics engine are computed the
+    first time they are requested through [], get() or resolve(). Reading the
+    whole dictionary (iteration, keys(), values(), items(), dict(), json,
+    comparison) resolves every pending metric first, so all reads agree;
+    cacheable() is the explicit export of what is resolved so far. Pickles
+    keep pending metrics pending and hold the network as edge arrays, from
+    which the graph is rebuilt when it is requested.
+    """
+
+    def __init__(self, values: Dict, statistics: Optional[NetworkStatistics] = None,
+                 pending: Optional[List[str]] = None,
+                 on_resolve: Optional[Callable[['NetworkMetrics'], None]] = None):
+        """
+        Args:
+            values: Computed metrics
+            statistics: Engine computing the pending metrics
+            pending: Metrics not yet computed
+            on_resolve: Called with the metrics after pending metrics were
+                computed (e.g. to update the network cache)
+        """
+        super().__init__(values)
+        self._statistics = statistics
+        self._pending = set(pending or [])
+        self.on_resolve = on_resolve
+        self.setdefault("metric_errors", {})
+
+    @property
+    def pending(self) -> List[str]:
+        """Metrics not yet computed"""
+        return sorted(self._pending)
+
+    @property
+    def graph_source(self) -> Optional[EdgeArrayGraph]:
+        """Edge arrays of the network when its NetworkX graph is built lazily"""
+        return self._statistics.graph_source if self._statistics is not None else None
+
+    def resolve(self, metric: str) -> Any:
+        """
+        Compute a pending metric and store it with its error bounds
+
+        Args:
+            metric: Metric name
+
+        Returns:
+            Metric value
+        """
+        if self._compute(metric) and self.on_resolve is not None:
+            self.on_resolve(self)
+        return dict.__getitem__(self, metric)
+
+    def _compute(self, metric: str) -> bool:
+        """Compute a pending metric, returns whether anything was computed"""
+        if metric in self._pending:
+            if self._statistics is None:
+                raise KeyError(f"Metric {metric} is pending but no statistics engine is attached")
+            values = self._statistics.compute(metric)
+            for key, value in values.items():
+                dict.__setitem__(self, key, value)
+                self._pending.discard(key)
+            dict.__getitem__(self, "metric_errors").update(
+                {key: self._statistics.errors[key] for key in values if key in self._statistics.errors}
+            )
+            return True
+        return False
+
+    def resolve_all(self) -> 'NetworkMetrics':
+        """Compute every pending metric"""
+        computed = False
+        for metric in list(self._pending):
+            computed |= self._compute(metric)
+        if computed and self.on_resolve is not None:
+            self.on_resolve(self)
+        return self
+
+    def __getitem__(self, key):
+        if key in self._pending:
+            return self.resolve(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self._pending:
+            return self.resolve(key)
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        return key in self._pending or dict.__contains__(self, key)
+
+    def __len__(self):
+        return dict.__len__(self) + len(self._pending)
+
+    def __iter__(self):
+        return dict.__iter__(self.resolve_all())
+
+    def keys(self):
+        return dict.keys(self.resolve_all())
+
+    def values(self):
+        return dict.values(self.resolve_all())
+
+    def items(self):
+        return dict.items(self.resolve_all())
+
+    def __eq__(self, other):
+        return dict.__eq__(self.resolve_all(), other)
+
+    def __ne__(self, other):
+        return dict.__ne__(self.resolve_all(), other)
+
+    __hash__ = None
+
+    def __setitem__(self, key, value):
+        self._pending.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def cacheable(self) -> Dict[str, Any]:
+        """Resolved metrics and their error bounds, without pending or non-serializable entries"""
+        keys = NetworkStatistics.BASIC_METRICS + NetworkStatistics.EXPENSIVE_METRICS + ("metric_errors",)
+        return {key: dict.__getitem__(self, key) for key in keys if dict.__contains__(self, key)}
+
+    def copy(self) -> 'NetworkMetrics':
+        return NetworkMetrics(dict(dict.items(self)), self._statistics, list(self._pending), self.on_resolve)
+
+    def __reduce__(self):
+        # Pickled without the NetworkX graph and the callback: the engine is
+        # rebuilt around the network's edge arrays, so the graph and pending
+        # metrics are still computed lazily after unpickling
+        graph = dict.get(self, NetworkStatistics.GRAPH)
+        values = {key: value for key, value in dict.items(self) if key != NetworkStatistics.GRAPH}
+        pending = sorted(self._pending - {NetworkStatistics.GRAPH})
+        engine = None
+        if self._statistics is not None or graph is not None:
+            source = self.graph_source
+            if source is None:
+                source = EdgeArrayGraph.from_networkx(graph if graph is not None else self._statistics.graph)
+            statistics = self._statistics
+            engine = (statistics.mode, statistics.sample_size, statistics.seed) if statistics is not None \
+                else (NetworkStatistics.DEFERRED, 64, None)
+            engine += (source,)
+            pending.append(NetworkStatistics.GRAPH)
+        return (_restore_metrics, (values, pending, engine))
+
+
+def _restore_metrics(values: Dict, pending: List[str], engine: Optional[Tuple]) -> NetworkMetrics:
+    """Unpickle NetworkMetrics (see NetworkMetrics.__reduce__)"""
+    statistics = None
+    if engine is not None:
+        mode, sample_size, seed, source = engine
+        statistics = NetworkStatistics(None, mode=mode, sample_size=sample_size, seed=seed, graph_source=source)
+        statistics.is_connected = values.get("is_connected")
+    return NetworkMetrics(values, statistics, pending)
+
+
+def calculate_network_statistics(nx_graph: Optional[nx.Graph], mode: str = NetworkStatistics.DEFERRED,
+                                 sample_size: int = 64, seed: Optional[int] = None,
+                                 known: Optional[Dict[str, Any]] = None,
+                                 graph_source: Optional[EdgeArrayGraph] = None) -> NetworkMetrics:
+    """
+    Calculate network statistics according to the requested mode
+
+    Args:
+        nx_graph: NetworkX graph (None to start from graph_source; the graph
+            is then a pending "networkx_graph" entry built on first access)
+        mode: One of "exact", "sampled", "deferred"
+        sample_size: Number of sampled BFS sources / clustering nodes
+        seed: Random seed for sampling
+        known: Previously computed metrics (e.g. from the network cache) to reuse
+        graph_source: Edge arrays of the network when nx_graph is None
+
+    Returns:
+        NetworkMetrics dictionary (expensive metrics pending in deferred mode)
+    """
+    statistics = NetworkStatistics(nx_graph, mode=mode, sample_size=sample_size, seed=seed,
+                                   graph_source=graph_source)
+
+    known = dict(known or {})
+    known_errors = known.pop("metric_errors", {})
+
+    if all(key in known for key in NetworkStatistics.BASIC_METRICS):
+        values = {key: known[key] for key in NetworkStatistics.BASIC_METRICS}
+        statistics.is_connected = values["is_connected"]
+    else:
+        values = statistics.basic_statistics()
+    values["statistics_mode"] = mode
+    values["metric_errors"] = {}
+
+    pending = []
+    for metric in NetworkStatistics.EXPENSIVE_METRICS:
+        error = known_errors.get(metric, {})
+        # Sampled values are only reused when exact values were not requested
+        if metric in known and (mode != NetworkStatistics.EXACT or error.get("method") == NetworkStatistics.EXACT):
+            values[metric] = known[metric]
+            if error:
+                values["metric_errors"][metric] = error
+        else:
+            pending.append(metric)
+    if nx_graph is None:
+        pending.append(NetworkStatistics.GRAPH)
+
+    metrics = NetworkMetrics(values, statistics, pending=pending)
+    if mode != NetworkStatistics.DEFERRED:
+        metrics.resolve_all()
+    return metrics
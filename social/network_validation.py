@@ -0,0 +1,192 @@
+import logging
+import random
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+logger = logging.getLogger(__name__)
+
+
+def build_agent_index(agents: List) -> Dict[str, int]:
+    """
+    Build agent_id -> list index map
+
+    Args:
+        agents: List of agents
+
+    Returns:
+        Dictionary mapping agent ids to their position in the list
+    """
+    return {agent.agent_id: i for i, agent in enumerate(agents)}
+
+
+def agents_to_adjacency(agents: List, agent_index: Optional[Dict[str, int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert agent connection lists to CSR adjacency arrays
+
+    Connections to agents that are not part of the list are encoded as -1.
+
+    Args:
+        agents: List of agents
+        agent_index: Optional precomputed agent_id -> index map
+
+    Returns:
+        Tuple (indptr, indices) of the directed adjacency in CSR layout
+    """
+    if agent_index is None:
+        agent_index = build_agent_index(agents)
+
+    indptr = np.zeros(len(agents) + 1, dtype=np.int64)
+    for i, agent in enumerate(agents):
+        connections = getattr(agent, 'connections', None)
+        indptr[i + 1] = len(connections) if isinstance(connections, list) else 0
+    np.cumsum(indptr, out=indptr)
+
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    for i, agent in enumerate(agents):
+        connections = getattr(agent, 'connections', None)
+        if not isinstance(connections, list) or not connections:
+            continue
+        row = indices[indptr[i]:indptr[i + 1]]
+        for j, connection in enumerate(connections):
+            idx = agent_index.get(getattr(connection, 'agent_id', None), -1)
+            # The id must resolve to this very object, not a foreign agent with the same id
+            row[j] = idx if idx >= 0 and agents[idx] is connection else -1
+
+    return indptr, indices
+
+
+class NetworkValidator:
+    """
+    Network validation over id -> index maps and CSR adjacency arrays
+
+    Checks symmetry, self-loops, duplicate and dangling connections and
+    connected components in O(N+E) (plus a sort of the edge keys). In
+    sampled mode the per-edge checks only look at the connections of a
+    random subset of agents, while components are always counted exactly.
+    """
+
+    STRICT = "strict"
+    SAMPLED = "sampled"
+    MODES = (STRICT, SAMPLED)
+
+    def __init__(self, mode: str = STRICT, sample_size: int = 1024, seed: Optional[int] = None):
+        """
+        Initialize validator
+
+        Args:
+            mode: "strict" (check every connection) or "sampled"
+            sample_size: Number of agents whose connections are checked in sampled mode
+            seed: Random seed for sampling
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown validation mode {mode}, expected one of {self.MODES}")
+        self.mode = mode
+        self.sample_size = max(1, sample_size)
+        self.seed = seed
+
+    def validate(self, agents: List) -> Dict:
+        """
+        Validate network structure and agent connections
+
+        Args:
+            agents: List of agents
+
+        Returns:
+            Dictionary with validation results
+        """
+        issues = []
+        num_agents = len(agents)
+
+        for i, agent in enumerate(agents):
+            if not hasattr(agent, 'connections'):
+                issues.append(f"Agent {i} missing connections attribute")
+            elif not isinstance(agent.connections, list):
+                issues.append(f"Agent {i} connections is not a list")
+
+        indptr, indices = agents_to_adjacency(agents)
+        degrees = np.diff(indptr)
+        rows = np.repeat(np.arange(num_agents, dtype=np.int64), degrees)
+        total_connections = int(indices.size)
+
+        # Restrict per-edge checks to the sampled agents
+        checked_agents = num_agents
+        if self.mode == self.SAMPLED and self.sample_size < num_agents:
+            sample = np.asarray(random.Random(self.seed).sample(range(num_agents), self.sample_size), dtype=np.int64)
+            mask = np.zeros(num_agents, dtype=bool)
+            mask[sample] = True
+            edge_mask = mask[rows]
+            check_rows, check_cols = rows[edge_mask], indices[edge_mask]
+            checked_agents = self.sample_size
+        else:
+            check_rows, check_cols = rows, indices
+
+        # Dangling connections
+        dangling = check_cols < 0
+        for i in np.unique(check_rows[dangling])[:10]:
+            issues.append(f"Agent {i} connected to non-existent agent")
+        dangling_count = int(dangling.sum())
+        if dangling_count > 10:
+            issues.append(f"{dangling_count} connections to non-existent agents in total")
+
+        valid_edges = ~dangling
+        check_rows, check_cols = check_rows[valid_edges], check_cols[valid_edges]
+
+        # Self-loops
+        self_loops = int(np.count_nonzero(check_rows == check_cols))
+        if self_loops > 0:
+            issues.append(f"{self_loops} self-loop connections found")
+
+        # Duplicates and symmetry via sorted edge keys
+        all_valid = indices >= 0
+        all_keys = np.sort(rows[all_valid] * num_agents + indices[all_valid])
+        check_keys = np.sort(check_rows * num_agents + check_cols)
+
+        duplicate_connections = int(np.count_nonzero(check_keys[1:] == check_keys[:-1]))
+        if duplicate_connections > 0:
+            issues.append(f"{duplicate_connections} duplicate connections found")
+
+        reverse_keys = check_cols * num_agents + check_rows
+        symmetric_issues = int(np.count_nonzero(~np.isin(reverse_keys, all_keys, assume_unique=False)))
+        if symmetric_issues > 0:
+            issues.append(f"{symmetric_issues} asymmetric connections found")
+
+        # Check network connectivity over the adjacency arrays
+        num_components = 0
+        if num_agents > 0:
+            try:
+                graph = csr_matrix(
+                    (np.ones(int(all_valid.sum()), dtype=np.int8), (rows[all_valid], indices[all_valid])),
+                    shape=(num_agents, num_agents)
+                )
+                num_components, _ = connected_components(graph, directed=False)
+                if num_agents > 1 and num_components > 1:
+                    issues.append(f"Network has {num_components} disconnected components")
+            except Exception as e:
+                issues.append(f"Connectivity validation failed: {str(e)}")
+
+        validation_result = {
+            "valid": len(issues) == 0,
+            "issues": issues,
+            "total_agents": num_agents,
+            "total_connections": total_connections // 2,  # Each connection counted twice
+            "symmetric_issues": symmetric_issues,
+            "self_loops": self_loops,
+            "duplicate_connections": duplicate_connections,
+            "num_components": int(num_components),
+            "mode": self.mode,
+            "checked_agents": checked_agents,
+            "warnings": []
+        }
+
+        # Add warnings for potential issues
+        if total_connections == 0:
+            validation_result["warnings"].append("No connections found - isolated network")
+
+        avg_connections = total_connections / num_agents if num_agents else 0
+        if avg_connections < 2:
+            validation_result["warnings"].append(f"Low average connectivity: {avg_connections:.1f}")
+
+        return validation_result
@@ -1,11 +1,13 @@
 import logging
 import time
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 from social.agent import ReasoningError, SocialAgent  
 from social.config import SimulationConfig
+from social.event_log import EventLog
+from social.metrics import SimulationMetrics
+from social.model import ModelRoute, ModelRouter
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
 
 class AgentOrchestrator:
     """
@@ -26,6 +28,11 @@ class AgentOrchestrator:
         # Build agent lookup
         self.agent_lookup = {agent.agent_id: agent for agent in agents}
         self.message_history = []
+
+        # Structured event log, live metrics and model routing (set by the simulation)
+        self.event_log: Optional[EventLog] = None
+        self.metrics: Optional[SimulationMetrics] = None
+        self.model_router: Optional[ModelRouter] = None
         
         logger.debug(f"Orchestrator initialized for {len(agents)} agents")
     
@@ -109,6 +116,34 @@ class AgentOrchestrator:
 
         return results
     
+    @staticmethod
+    def _record_route_decision(route: ModelRoute, screening_route: Optional[ModelRoute], result: Optional[Dict[str, Any]],
+                               escalations: List[Dict[str, Any]], requests: int, request_time: float,
+                               prompt_tokens: int, completion_tokens: int):
+        """
+        Attribute a decision's requests to the screening and routed models
+
+        Escalated screening answers have already been charged to the screening
+        route; their requests, time and tokens are taken out of the totals
+        before the rest is charged to the routed model. A result of None
+        records a decision that failed after all its retries.
+        """
+        screening = result.get("screening") if result else None
+        if screening is not None and not screening["escalated"]:
+            screening_route.record_decision(requests, request_time, prompt_tokens, completion_tokens,
+                                            result.get("decision"), result.get("confidence_level"))
+            return
+        for escalated in escalations:
+            requests -= 1
+            request_time -= escalated["decision_time"]
+            prompt_tokens -= escalated["prompt_tokens"]
+            completion_tokens -= escalated["completion_tokens"]
+        if result is None:
+            route.record_failure(requests, request_time, prompt_tokens, completion_tokens)
+        else:
+            route.record_decision(requests, request_time, prompt_tokens, completion_tokens,
+                                  result.get("decision"), result.get("confidence_level"))
+
     async def _decide_adoption_with_retry(self, agent: SocialAgent, step: int, max_retries: int = 3) -> Dict[str, Any]:
         """
         Execute agent adoption decision with robust retry mechanism
@@ -125,31 +160,99 @@ class AgentOrchestrator:
             Exception: After all retry attempts are exhausted
         """        
         last_exception = None
+        llm_requests = agent.llm_requests
+        prompt_tokens = agent.prompt_tokens
+        completion_tokens = agent.completion_tokens
+        decision_start = time.perf_counter()
+
+        route, screening_route = None, None
+        if self.model_router and not agent.has_adopted:
+            route = self.model_router.route(agent.adopter_category, step)
+            screening_route = self.model_router.screening
+            agent.use_model_client(route.client)
+
+        # Escalated screening answers are charged as soon as they are made, even if the routed answer then fails
+        escalations: List[Dict[str, Any]] = []
+
+        def record_escalation(screening: Dict[str, Any]):
+            screening_route.record_escalation(screening["decision_time"], screening["prompt_tokens"],
+                                              screening["completion_tokens"], screening["valid"])
+            escalations.append(screening)
         
         for attempt in range(max_retries + 1):
             try:
-                logger.debug(f"Agent {agent.agent_id} decision attempt {attempt + 1}/{max_retries + 1}")
-                result = await agent.decide_adoption(step, last_attempt=(attempt == max_retries))
+                logger.debug("Agent %s decision attempt %d/%d", agent.agent_id, attempt + 1, max_retries + 1)
+                # Agents that adopted earlier answer without an LLM request
+                requesting = self.metrics is not None and not agent.has_adopted
+                if requesting:
+                    self.metrics.request_started()
+                try:
+                    # Only the first attempt is screened, retries go to the routed model
+                    result = await agent.decide_adoption(
+                        step,
+                        last_attempt=(attempt == max_retries),
+                        screening_client=screening_route.client if screening_route and attempt == 0 else None,
+                        confidence_threshold=self.model_router.confidence_threshold if screening_route else None,
+                        on_escalation=record_escalation if screening_route else None,
+                    )
+                finally:
+                    if requesting:
+                        self.metrics.request_finished()
+
+                if requesting:
+                    self.metrics.record_decision(time.perf_counter() - decision_start,
+                                                 agent.prompt_tokens - prompt_tokens,
+                                                 agent.completion_tokens - completion_tokens)
+                if route:
+                    self._record_route_decision(route, screening_route, result, escalations,
+                                                agent.llm_requests - llm_requests,
+                                                time.perf_counter() - decision_start,
+                                                agent.prompt_tokens - prompt_tokens,
+                                                agent.completion_tokens - completion_tokens)
                 
                 if attempt > 0:
                     logger.info(f"✅ Agent {agent.agent_id} succeeded on attempt {attempt + 1}")
+
+                if self.event_log and not result.get("adopted_before") and self.event_log.sampled():
+                    self.event_log.emit(
+                        "decision",
+                        step=step,
+                        agent_id=agent.agent_id,
+                        category=agent.adopter_category,
+                        decision=result.get("decision"),
+                        confidence_level=result.get("confidence_level"),
+                        network_influence_level=result.get("network_influence_level"),
+                        global_influence_level=result.get("global_influence_level"),
+                        attempts=attempt + 1,
+                        route=route.name if route else None,
+                        escalated=result["screening"]["escalated"] if "screening" in result else None,
+                        decision_time=result.get("decision_time"),
+                        prompt_tokens=agent.prompt_tokens - prompt_tokens,
+                        completion_tokens=agent.completion_tokens - completion_tokens,
+                    )
                 
                 return result
                 
             except ReasoningError as e:
-                logger.warning(f"Before pop: {len(agent.model_context._messages)} messages")
+                logger.debug("Before pop: %d messages", len(agent.model_context._messages))
                 if agent.model_context._messages:
                     # Pop agent reasoning messages
                     agent.model_context._messages.pop()
                     # Pop system messages
                     agent.model_context._messages.pop()
-                    logger.warning(f"After pop: {len(agent.model_context._messages)} messages")
+                    logger.debug("After pop: %d messages", len(agent.model_context._messages))
                 else:
                     logger.warning("No messages to pop from model context!")
                 last_exception = e
                 attempt_type = "initial" if attempt == 0 else f"retry {attempt}"
                 
                 logger.warning(f"⚠️ Agent {agent.agent_id} failed on {attempt_type} attempt: {type(e).__name__}: {e}")
+                if self.metrics:
+                    self.metrics.record_parse_failure(retried=attempt < max_retries)
+                if route:
+                    route.parse_failures += 1
+                if self.event_log:
+                    self.event_log.emit("retry", step=step, agent_id=agent.agent_id, attempt=attempt + 1, error=str(e))
                 
                 # If this was the last attempt, we'll raise the exception
                 if attempt == max_retries:
@@ -160,4 +263,15 @@ class AgentOrchestrator:
         
         # All attempts failed
         logger.error(f"❌ Agent {agent.agent_id} failed after {max_retries + 1} attempts. Last error: {last_exception}")
+        if self.metrics:
+            self.metrics.record_decision_failure()
+        if route:
+            self._record_route_decision(route, screening_route, None, escalations,
+                                        agent.llm_requests - llm_requests,
+                                        time.perf_counter() - decision_start,
+                                        agent.prompt_tokens - prompt_tokens,
+                                        agent.completion_tokens - completion_tokens)
+        if self.event_log:
+            self.event_log.emit("decision_failed", step=step, agent_id=agent.agent_id,
+                                attempts=max_retries + 1, error=str(last_exception))
         raise last_exception
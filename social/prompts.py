@@ -1,6 +1,77 @@
+import string
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
 from social.config import SimulationConfig
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a prompt (about 4 characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+
+class PromptTemplate:
+    """
+    Prompt compiled once into literal text segments and named fields
+
+    The template is parsed once and rendering is a single C-level
+    substitution, the fixed text is never formatted again. Placeholders are
+    plain {field} names; literal braces are written {{ and }} as in str.format.
+    """
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        segments = []
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(text):
+            if format_spec or conversion:
+                raise ValueError(f"Prompt template '{name}' only supports plain {{field}} placeholders")
+            segments.append((literal, field_name))
+        self._set_segments(segments)
+
+    def _set_segments(self, segments: List[Tuple[str, Optional[str]]]):
+        self._segments = segments
+        self.fields = tuple(field_name for _, field_name in segments if field_name is not None)
+        # Tokens of the fixed text, sent with every rendered prompt
+        self.static_tokens = estimate_tokens("".join(literal for literal, _ in segments))
+        self._format = "".join(
+            literal.replace("%", "%%") + (f"%({field_name})s" if field_name is not None else "")
+            for literal, field_name in segments
+        )
+
+    def partial(self, name: str, **values: str) -> "PromptTemplate":
+        """
+        Fill some fields once and keep the others as placeholders
+
+        Args:
+            name: Name of the new template
+            **values: Values of the fields to fill
+
+        Returns:
+            Compiled template of the remaining fields
+        """
+        segments = []
+        pending = ""
+        for literal, field_name in self._segments:
+            pending += literal
+            if field_name is None:
+                continue
+            if field_name in values:
+                pending += values[field_name]
+            else:
+                segments.append((pending, field_name))
+                pending = ""
+        segments.append((pending, None))
+
+        template = PromptTemplate.__new__(PromptTemplate)
+        template.name = name
+        template._set_segments(segments)
+        return template
+
+    def render(self, **values: str) -> str:
+        """Prompt text with every field filled in"""
+        return self._format % values
+
+
 class DiffusionPrompts:
     """
     LLM Prompts for Social Innovation Diffusion
@@ -14,80 +85,172 @@ class DiffusionPrompts:
         "confidence_level"
     }
 
-    @staticmethod
-    def create_agent_system_prompt(
-        agent_id: str,
-        adopter_category: str, 
-        config: SimulationConfig,
-    ) -> str:
-        """
-        Create system prompt with clear profiles
-        """
+    # Keys of a valid answer, by config.response_profile
+    RESPONSE_PROFILE_KEYS = {
+        "full": frozenset(EXPECTED_DECISION_KEYS),
+        "compact": frozenset(EXPECTED_DECISION_KEYS - {"thinking"}),
+        "decision_only": frozenset(EXPECTED_DECISION_KEYS - {"thinking", "reasoning"}),
+    }
+
+    # Fields of every profile, asked for before the text fields when answers
+    # are streamed (config.stream_decisions)
+    DECISION_FIELDS = ("decision", "network_influence_level", "global_influence_level", "confidence_level")
+
+    # JSON answer format shown in the system prompt, by config.response_profile.
+    # Shorter answers trade explanations for generation time.
+    RESPONSE_SCHEMAS = {
+        "full": """{
+  "thinking": "Describe your thought process, considerations and confidence in this decision.",
+  "decision": "ADOPT" or "NOT_ADOPT",
+  "reasoning": "Explain the main factors and reasoning behind your decision.",
+  "network_influence_level": <integer from 0 to 10 indicating how much your network influenced your decision>,
+  "global_influence_level": <integer from 0 to 10 indicating how much the global adoption rate influenced your decision>,
+  "confidence_level": <integer from 0 to 10 indicating your confidence in this decision>
+}""",
+        "compact": """{
+  "decision": "ADOPT" or "NOT_ADOPT",
+  "reasoning": "One short sentence with the main reason for your decision.",
+  "network_influence_level": <integer from 0 to 10 indicating how much your network influenced your decision>,
+  "global_influence_level": <integer from 0 to 10 indicating how much the global adoption rate influenced your decision>,
+  "confidence_level": <integer from 0 to 10 indicating your confidence in this decision>
+}""",
+        "decision_only": """{
+  "decision": "ADOPT" or "NOT_ADOPT",
+  "network_influence_level": <integer from 0 to 10 indicating how much your network influenced your decision>,
+  "global_influence_level": <integer from 0 to 10 indicating how much the global adoption rate influenced your decision>,
+  "confidence_level": <integer from 0 to 10 indicating your confidence in this decision>
+}""",
+    }
+
+    # Concise profiles with clear values and motivations
+    CATEGORY_PROFILES = {
+        "Innovator": "You're naturally drawn to cutting-edge possibilities and breakthrough potential. You have the financial resources and risk tolerance to experiment with uncertain outcomes. You maintain diverse networks that span beyond your local community and actively seek information from experts, researchers and technical sources, but not to follow others' choices. You get excited about transformative innovations and are comfortable being first to try something, even without social validation or widespread proof of success. You are willing to adopt promising innovations early, relying on your own judgment and expert information, even if no one else has adopted yet. While you consider practical uses and tangible value, your openness to risk and future potential often leads you to act before others.",
+
+        "EarlyAdopter": "You're well-respected in your community and others often seek your opinion on new developments. You have established social status and resources that you want to protect while staying ahead of important trends. You carefully balance being forward-thinking with maintaining your reputation for sound judgment. You value clear benefits and accessible solutions, prefer innovations you can test thoroughly and pay attention to both expert opinions and market signals. You're comfortable being early when you see genuine promise and validation.",
         
-        # Concise profiles with clear values and motivations
-        category_profiles = {
-            "Innovator": "You're naturally drawn to cutting-edge possibilities and breakthrough potential. You have the financial resources and risk tolerance to experiment with uncertain outcomes. You maintain diverse networks that span beyond your local community and actively seek information from experts, researchers and technical sources, but not to follow others' choices. You get excited about transformative innovations and are comfortable being first to try something, even without social validation or widespread proof of success. You are willing to adopt promising innovations early, relying on your own judgment and expert information, even if no one else has adopted yet. While you consider practical uses and tangible value, your openness to risk and future potential often leads you to act before others.",
-
-            "EarlyAdopter": "You're well-respected in your community and others often seek your opinion on new developments. You have established social status and resources that you want to protect while staying ahead of important trends. You carefully balance being forward-thinking with maintaining your reputation for sound judgment. You value clear benefits and accessible solutions, prefer innovations you can test thoroughly and pay attention to both expert opinions and market signals. You're comfortable being early when you see genuine promise and validation.",
-            
-            "EarlyMajority": "You represent practical, mainstream thinking and are successful with established methods but open to proven improvements. You highly value social proof and peer experiences-especially when several trusted people in your immediate network have succeeded. You feel most comfortable adopting when you see substantial, widespread success among people in similar situations, not just a small number of initial users. You prefer methodical decision-making with clear evidence of practical benefits. You want innovations that integrate smoothly into your existing routines and have been demonstrated to work reliably by others you trust.",
-            
-            "LateMajority": "You're naturally cautious about change and prefer stability over novelty. You have limited resources that make you risk-averse and very concerned about potential complications or problems. You need to see widespread success in your trusted network and substantial global adoption before feeling safe to proceed. You're motivated more by necessity and avoiding disadvantages than by seeking opportunities. You require extensive proof that innovations work smoothly without causing the problems that earlier users often experience.",
-            
-            "Laggard": "You strongly value traditional approaches that have proven reliable over time. You have established methods that work well for you and see little reason to change unless absolutely necessary. You're comfortable being different from trend-followers and aren't influenced by popular movements. Your information comes primarily from family and close local contacts rather than external sources. You change only when current methods fail or create concrete problems in your daily life, not because others are succeeding with alternatives."
-        }
+        "EarlyMajority": "You represent practical, mainstream thinking and are successful with established methods but open to proven improvements. You highly value social proof and peer experiences-especially when several trusted people in your immediate network have succeeded. You feel most comfortable adopting when you see substantial, widespread success among people in similar situations, not just a small number of initial users. You prefer methodical decision-making with clear evidence of practical benefits. You want innovations that integrate smoothly into your existing routines and have been demonstrated to work reliably by others you trust.",
+        
+        "LateMajority": "You're naturally cautious about change and prefer stability over novelty. You have limited resources that make you risk-averse and very concerned about potential complications or problems. You need to see widespread success in your trusted network and substantial global adoption before feeling safe to proceed. You're motivated more by necessity and avoiding disadvantages than by seeking opportunities. You require extensive proof that innovations work smoothly without causing the problems that earlier users often experience.",
+        
+        "Laggard": "You strongly value traditional approaches that have proven reliable over time. You have established methods that work well for you and see little reason to change unless absolutely necessary. You're comfortable being different from trend-followers and aren't influenced by popular movements. Your information comes primarily from family and close local contacts rather than external sources. You change only when current methods fail or create concrete problems in your daily life, not because others are succeeding with alternatives."
+    }
+    DEFAULT_CATEGORY = "EarlyMajority"
+
+    INNOVATION_ATTRIBUTES = ("relative_advantage", "compatibility", "complexity", "trialability", "observability")
 
-        profile = category_profiles.get(adopter_category, category_profiles["EarlyMajority"])
+    SYSTEM_PROMPT = PromptTemplate("agent_system", """You are a human, making an adoption decision about an innovation.
+
+WHO YOU ARE:
+{profile}
 
-        # Score interpretation without bias
-        def format_score(score):
-            return f"{int(score * 10)}"
 
-        innovation_context = f"""
 INNOVATION CHARACTERISTICS:
 These scores (0-10) represent available information about this innovation.
 
-- Relative Advantage: {format_score(config.innovation_attributes['relative_advantage'])}
+- Relative Advantage: {relative_advantage}
   (How much better this might be compared to current alternatives - 0: not at all, 10: revolutionary)
 
-- Compatibility: {format_score(config.innovation_attributes['compatibility'])}
+- Compatibility: {compatibility}
   (How well this fits with existing practices and values - 0: not at all, 10: perfectly)
 
-- Complexity: {format_score(config.innovation_attributes['complexity'])}
+- Complexity: {complexity}
   (Difficulty to understand and use - 0: very easy, 10: very hard)
 
-- Trialability: {format_score(config.innovation_attributes['trialability'])}
+- Trialability: {trialability}
   (How easy it is to test before full commitment - 0: not at all, 10: very easy)
 
-- Observability: {format_score(config.innovation_attributes['observability'])}
+- Observability: {observability}
   (How visible and demonstrable the results are - 0: not at all, 10: very clear)
 
-Interpret these scores through your own lens - what seems high, low or concerning to someone with your characteristics?"""
-
-        return f"""You are a human, making an adoption decision about an innovation.
-
-WHO YOU ARE:
-{profile}
-
-{innovation_context}
+Interpret these scores through your own lens - what seems high, low or concerning to someone with your characteristics?
 
 Each step you will be asked if you want to adopt this innovation. Think through this decision authentically based on your characteristics and situation. Consider what matters most to someone like you, but avoid predetermined responses.
 
 Always provide your answer as a valid JSON object.
 Your response must include all of the following fields exactly as shown:
 
-{{
-  "thinking": "Describe your thought process, considerations and confidence in this decision.",
-  "decision": "ADOPT" or "NOT_ADOPT",
-  "reasoning": "Explain the main factors and reasoning behind your decision.",
-  "network_influence_level": <integer from 0 to 10 indicating how much your network influenced your decision>,
-  "global_influence_level": <integer from 0 to 10 indicating how much the global adoption rate influenced your decision>,
-  "confidence_level": <integer from 0 to 10 indicating your confidence in this decision>
-}}
+{response_schema}
 
 Do not include any explanation, commentary or formatting outside the JSON object. Only output the JSON.
+""")
+
+    DECISION_PROMPT = PromptTemplate("adoption_decision", """
+You are deciding {again} if you want to adopt this innovation.
+
+CURRENT CONTEXT:
+{global_context}
+{network_context}
+
+{reflection_prompt}
+""")
+
+    # Optional critical thinking prompt
+    DEVILS_ADVOCATE_REFLECTION = """
+Before deciding, challenge your initial thinking:
+- If leaning ADOPT: What could go wrong? What risks or downsides might you be overlooking?
+- If leaning NOT ADOPT: What opportunities might you miss? What are the costs of waiting?
+Now ask yourself: Do these counterpoints shift your perspective or confidence? Are you still making the best decision?
 """
 
+    # Decision prompts with the reflection block rendered, by config.enable_devils_advocate
+    DECISION_PROMPTS = {
+        False: DECISION_PROMPT.partial("adoption_decision", reflection_prompt=""),
+        True: DECISION_PROMPT.partial("adoption_decision_devils_advocate", reflection_prompt=DEVILS_ADVOCATE_REFLECTION),
+    }
+
+    @staticmethod
+    def _innovation_scores(config: SimulationConfig) -> Tuple[str, ...]:
+        """Innovation attributes as shown to the agents (0-10 scale)"""
+        return tuple(str(int(config.innovation_attributes[attribute] * 10))
+                     for attribute in DiffusionPrompts.INNOVATION_ATTRIBUTES)
+
+    @staticmethod
+    def expected_decision_keys(config: SimulationConfig) -> frozenset:
+        """Keys of a valid answer under the configured response profile"""
+        return DiffusionPrompts.RESPONSE_PROFILE_KEYS[config.response_profile]
+
+    @staticmethod
+    def _decision_first(schema: str) -> str:
+        """Answer format with the DECISION_FIELDS moved before the text fields"""
+        lines = [line.rstrip(",") for line in schema.strip("{}\n").split("\n")]
+        lines.sort(key=lambda line: line.split(":", 1)[0].strip(' "') not in DiffusionPrompts.DECISION_FIELDS)
+        return "{\n" + ",\n".join(lines) + "\n}"
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _render_system_prompt(adopter_category: str, innovation_scores: Tuple[str, ...],
+                              response_profile: str = "full", decision_first: bool = False) -> str:
+        profile = DiffusionPrompts.CATEGORY_PROFILES.get(
+            adopter_category, DiffusionPrompts.CATEGORY_PROFILES[DiffusionPrompts.DEFAULT_CATEGORY]
+        )
+        response_schema = DiffusionPrompts.RESPONSE_SCHEMAS[response_profile]
+        if decision_first:
+            response_schema = DiffusionPrompts._decision_first(response_schema)
+        return DiffusionPrompts.SYSTEM_PROMPT.render(
+            profile=profile,
+            response_schema=response_schema,
+            **dict(zip(DiffusionPrompts.INNOVATION_ATTRIBUTES, innovation_scores))
+        )
+
+    @staticmethod
+    def create_agent_system_prompt(
+        agent_id: str,
+        adopter_category: str, 
+        config: SimulationConfig,
+    ) -> str:
+        """
+        Create system prompt with clear profiles
+
+        The prompt depends only on the category, the innovation scores and the
+        response format, it is rendered once per combination and the same
+        string is shared by all agents of that category (a stable prefix for
+        prompt caching).
+        """
+        return DiffusionPrompts._render_system_prompt(
+            adopter_category, DiffusionPrompts._innovation_scores(config),
+            config.response_profile, bool(config.stream_decisions)
+        )
+
     @staticmethod
     def create_adoption_decision_prompt(
         global_adoption_rate: float,
@@ -116,22 +279,25 @@ Do not include any explanation, commentary or formatting outside the JSON object
         else:
             network_context = f"Your network: {adopted_connections}/{total_connections} connections have adopted"
 
-        # Optional critical thinking prompt
-        reflection_prompt = ""
-        if config.enable_devils_advocate:
-            reflection_prompt = """
-Before deciding, challenge your initial thinking:
-- If leaning ADOPT: What could go wrong? What risks or downsides might you be overlooking?
-- If leaning NOT ADOPT: What opportunities might you miss? What are the costs of waiting?
-Now ask yourself: Do these counterpoints shift your perspective or confidence? Are you still making the best decision?
-"""
-
-        return f"""
-You are deciding {"again" if adoption_attempts > 1 else ""} if you want to adopt this innovation.
+        return DiffusionPrompts.DECISION_PROMPTS[bool(config.enable_devils_advocate)].render(
+            again="again" if adoption_attempts > 1 else "",
+            global_context=global_context,
+            network_context=network_context,
+        )
 
-CURRENT CONTEXT:
-{global_context}
-{network_context}
+    @staticmethod
+    def prompt_token_counts(config: SimulationConfig) -> Dict:
+        """
+        Estimated prompt tokens per template
 
-{reflection_prompt}
-"""
\ No newline at end of file
+        Returns:
+            Dict with the system prompt tokens per adopter category and the
+            fixed tokens of the decision prompt (sent with every decision)
+        """
+        return {
+            "system": {
+                category: estimate_tokens(DiffusionPrompts.create_agent_system_prompt(None, category, config))
+                for category in DiffusionPrompts.CATEGORY_PROFILES
+            },
+            "adoption_decision": DiffusionPrompts.DECISION_PROMPTS[bool(config.enable_devils_advocate)].static_tokens,
+        }
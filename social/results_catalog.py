@@ -0,0 +1,251 @@
+import logging
+import os
+import pickle
+import sqlite3
+from typing import Dict, List, Optional
+
+from social.config import SimulationConfig
+from social.results_store import RESULTS_EXTENSION, ResultsArchive
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = os.path.join("results", "catalog.sqlite")
+
+
+class ResultsCatalog:
+    """
+    SQLite index of saved simulation runs
+
+    Holds one row of summary fields per results file so that runs can be
+    listed, filtered and sorted without opening them. Rows are added on save
+    and files added or changed outside the app are picked up by sync().
+    """
+
+    SCHEMA_VERSION = 2
+
+    COLUMNS = (
+        "file_name", "path", "config_hash", "scenario", "final_adoption_rate", "final_step",
+        "num_agents", "simulation_time", "prompt_tokens", "completion_tokens", "total_tokens",
+        "response_profile", "tokens_per_decision", "network_type", "save_date", "file_mtime", "file_size",
+    )
+
+    # Columns runs can be sorted by
+    SORT_COLUMNS = (
+        "save_date", "final_adoption_rate", "final_step", "num_agents", "simulation_time", "total_tokens",
+        "tokens_per_decision",
+    )
+
+    def __init__(self, db_path: str = DEFAULT_CATALOG_PATH):
+        """
+        Open (and create if needed) a catalog
+
+        Args:
+            db_path: Path of the SQLite database
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(db_path)
+        self._connection.row_factory = sqlite3.Row
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            # The catalog is derived data, rebuild it on schema changes
+            self._connection.execute("DROP TABLE IF EXISTS runs")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                file_name TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                config_hash TEXT,
+                scenario TEXT,
+                final_adoption_rate REAL,
+                final_step INTEGER,
+                num_agents INTEGER,
+                simulation_time REAL,
+                prompt_tokens INTEGER,
+                completion_tokens INTEGER,
+                total_tokens INTEGER,
+                response_profile TEXT,
+                tokens_per_decision REAL,
+                network_type TEXT,
+                save_date TEXT,
+                file_mtime REAL,
+                file_size INTEGER
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS runs_config_hash ON runs (config_hash)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS runs_scenario ON runs (scenario)")
+        self._connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+    @staticmethod
+    def _summary_row(path: str, results: Dict) -> Dict:
+        """Catalog row from a results dictionary (only scalar entries are read)"""
+        config = results.get("config", {}) or {}
+        metadata = results.get("metadata", {}) or {}
+        token_usage = results.get("token_usage", {}) or {}
+
+        try:
+            config_hash = SimulationConfig.from_dict(config).config_hash()
+        except Exception as e:
+            logger.debug(f"Cannot hash configuration of {path}: {e}")
+            config_hash = None
+
+        prompt_tokens = token_usage.get("prompt_tokens")
+        completion_tokens = token_usage.get("completion_tokens")
+        total_tokens = None
+        if prompt_tokens is not None or completion_tokens is not None:
+            total_tokens = (prompt_tokens or 0) + (completion_tokens or 0)
+        decisions = token_usage.get("decisions")
+        tokens_per_decision = total_tokens / decisions if total_tokens is not None and decisions else None
+
+        stat = os.stat(path)
+        return {
+            "file_name": os.path.basename(path),
+            "path": path,
+            "config_hash": config_hash,
+            "scenario": metadata.get("config_name"),
+            "final_adoption_rate": results.get("total_adoption_rate"),
+            "final_step": results.get("final_step"),
+            "num_agents": metadata.get("total_agents", config.get("num_agents")),
+            "simulation_time": results.get("simulation_time", metadata.get("simulation_time")),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+            "response_profile": config.get("response_profile", "full"),
+            "tokens_per_decision": tokens_per_decision,
+            "network_type": config.get("network_type"),
+            "save_date": metadata.get("save_date"),
+            "file_mtime": stat.st_mtime,
+            "file_size": stat.st_size,
+        }
+
+    @staticmethod
+    def _read_summary(path: str) -> Dict:
+        """Read the scalar entries of a results file"""
+        if path.endswith(RESULTS_EXTENSION):
+            with ResultsArchive(path) as archive:
+                return archive.summary
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def add(self, path: str, results: Optional[Dict] = None):
+        """
+        Add or update a run
+
+        Args:
+            path: Path of the results file
+            results: Results dictionary (read from the file if None)
+        """
+        if results is None:
+            results = self._read_summary(path)
+        row = self._summary_row(path, results)
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        self._connection.execute(
+            f"INSERT OR REPLACE INTO runs ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+            [row[column] for column in self.COLUMNS]
+        )
+        self._connection.commit()
+
+    def remove(self, file_name: str):
+        """Remove a run from the catalog"""
+        self._connection.execute("DELETE FROM runs WHERE file_name = ?", (file_name,))
+        self._connection.commit()
+
+    def sync(self, results_dir: str = "results"):
+        """
+        Bring the catalog in line with the results directory
+
+        Files that are new or changed since they were indexed are (re)read;
+        rows of deleted files are dropped. A legacy .pkl file is skipped once
+        it has been converted (a results file with the same name exists), so
+        converted runs are listed once.
+
+        Args:
+            results_dir: Directory holding results files
+        """
+        if not os.path.exists(results_dir):
+            return
+
+        indexed = {
+            row["file_name"]: (row["file_mtime"], row["file_size"])
+            for row in self._connection.execute("SELECT file_name, file_mtime, file_size FROM runs")
+        }
+
+        files = set(os.listdir(results_dir))
+        present = set()
+        for file in sorted(files):
+            if not (file.endswith('.pkl') or file.endswith(RESULTS_EXTENSION)):
+                continue
+            if file.endswith('.pkl') and os.path.splitext(file)[0] + RESULTS_EXTENSION in files:
+                continue
+            present.add(file)
+            path = os.path.join(results_dir, file)
+            stat = os.stat(path)
+            if indexed.get(file) == (stat.st_mtime, stat.st_size):
+                continue
+            try:
+                self.add(path)
+            except Exception as e:
+                logger.warning(f"Failed to index {path}: {e}")
+
+        for file in set(indexed) - present:
+            self.remove(file)
+
+    def query(
+            self,
+            scenario: Optional[str] = None,
+            config_hash: Optional[str] = None,
+            network_type: Optional[str] = None,
+            response_profile: Optional[str] = None,
+            min_adoption_rate: Optional[float] = None,
+            order_by: str = "save_date",
+            descending: bool = True,
+            limit: Optional[int] = None
+        ) -> List[Dict]:
+        """
+        List runs matching the given filters
+
+        Args:
+            scenario: Scenario (configuration) name
+            config_hash: Configuration hash
+            network_type: Network type
+            response_profile: Response profile of the agents' answers
+            min_adoption_rate: Minimum final adoption rate
+            order_by: One of SORT_COLUMNS
+            descending: Sort order
+            limit: Maximum number of runs
+
+        Returns:
+            List of run dictionaries
+        """
+        if order_by not in self.SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {order_by}, expected one of {self.SORT_COLUMNS}")
+
+        conditions, parameters = [], []
+        for column, value in (("scenario", scenario), ("config_hash", config_hash), ("network_type", network_type),
+                              ("response_profile", response_profile)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if min_adoption_rate is not None:
+            conditions.append("final_adoption_rate >= ?")
+            parameters.append(min_adoption_rate)
+
+        sql = "SELECT * FROM runs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, file_name DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        return [dict(row) for row in self._connection.execute(sql, parameters)]
+
+    def scenarios(self) -> List[str]:
+        """Distinct scenario names"""
+        rows = self._connection.execute("SELECT DISTINCT scenario FROM runs WHERE scenario IS NOT NULL ORDER BY scenario")
+        return [row["scenario"] for row in rows]
@@ -0,0 +1,265 @@
+"""
+Append-only streaming log of simulation steps
+
+Each step's summary and decisions are appended to a JSON lines log as soon
+as the orchestrator returns them, so memory stays flat during long runs and
+partial results survive crashes. The log is finalised into the normal
+results file by SocialDiffusionSimulation.save_results, or recovered with:
+
+    python -m social.results_log results/partial/<run>.jsonl
+"""
+
+import json
+import logging
+import os
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from social.results_store import RESULTS_EXTENSION, _json_default, _network_arrays, _network_metrics_summary, write_results
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_RESULTS_DIR = os.path.join("results", "partial")
+
+
+class StepLogWriter:
+    """
+    Append-only writer for per-step simulation results
+    """
+
+    def __init__(self, config: Dict, log_dir: str = PARTIAL_RESULTS_DIR, fsync: bool = False,
+                 agents: Optional[List[Tuple[str, str]]] = None):
+        """
+        Create a new step log
+
+        Args:
+            config: Simulation configuration dictionary (written as log header)
+            log_dir: Directory holding in-progress logs
+            fsync: Force every step to stable storage (slower, survives power loss)
+            agents: (agent id, adopter category) of every agent, written with the
+                header so recovered runs keep agents that never decided
+        """
+        os.makedirs(log_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.path = os.path.join(log_dir, f"run_{timestamp}.jsonl")
+        self.fsync = fsync
+        self.offsets: Dict[int, Tuple[int, int]] = {}
+        self._file = open(self.path, "ab")
+        self._write_line({"type": "header", "config": config, "start_date": datetime.now().isoformat(),
+                          "agents": [list(agent) for agent in agents or []]})
+
+    def _write_line(self, entry: Dict) -> Tuple[int, int]:
+        line = json.dumps(entry, default=_json_default).encode("utf-8") + b"\n"
+        offset = self._file.tell()
+        self._file.write(line)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        return offset, len(line)
+
+    def write_network(self, network_metrics: Dict):
+        """
+        Record the network so that recovered runs keep their graph
+
+        Args:
+            network_metrics: Network metrics including the networkx_graph or its edge arrays
+        """
+        network = _network_arrays(network_metrics)
+        if network is None:
+            return
+        agent_ids, edges = network
+        self._write_line({
+            "type": "network",
+            "metrics": _network_metrics_summary(network_metrics),
+            "agent_ids": list(agent_ids),
+            "edges": edges.tolist(),
+        })
+
+    def append_step(self, step: int, step_results: Dict):
+        """
+        Append a step's summary and decisions
+
+        Args:
+            step: Simulation step
+            step_results: Orchestrator results for the step
+        """
+        self.offsets[step] = self._write_line({"type": "step", "step": step, "results": step_results})
+
+    def read_step(self, step: int) -> Dict:
+        """Read a step back from the log"""
+        offset, length = self.offsets[step]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))["results"]
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self):
+        """Close and delete the log (after it has been finalised)"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class StreamingHistory(Mapping):
+    """
+    adoption_history backed by a step log
+
+    Only the latest step is kept in memory; earlier steps are read back from
+    the log on access.
+    """
+
+    def __init__(self, writer: StepLogWriter):
+        self.writer = writer
+        self._latest: Optional[Tuple[int, Dict]] = None
+
+    def __setitem__(self, step: int, step_results: Dict):
+        self.writer.append_step(step, step_results)
+        self._latest = (step, step_results)
+
+    def __getitem__(self, step: int) -> Dict:
+        if self._latest is not None and self._latest[0] == step:
+            return self._latest[1]
+        if step not in self.writer.offsets:
+            raise KeyError(step)
+        return self.writer.read_step(step)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.writer.offsets)
+
+    def __len__(self) -> int:
+        return len(self.writer.offsets)
+
+    def __contains__(self, step) -> bool:
+        return step in self.writer.offsets
+
+
+def _network_from_entry(entry: Dict) -> Dict:
+    """Rebuild network metrics from a logged network entry; the graph is built on first use"""
+    import numpy as np
+    from social.network_statistics import EdgeArrayGraph, NetworkStatistics, calculate_network_statistics
+
+    agent_ids = entry["agent_ids"]
+    source = EdgeArrayGraph(
+        np.array(entry["edges"], dtype=np.int32).reshape(-1, 2),
+        agent_ids,
+        [agent_id.split("_agent_")[0] if agent_id is not None else None for agent_id in agent_ids]
+    )
+    stored = entry.get("metrics", {})
+    metrics = calculate_network_statistics(None, mode=NetworkStatistics.DEFERRED, known=stored, graph_source=source)
+    for key in ("statistics_mode", "creation_time", "network_type"):
+        if key in stored:
+            metrics[key] = stored[key]
+    return metrics
+
+
+def read_log(log_path: str) -> Dict[str, Any]:
+    """
+    Rebuild a results dictionary from a (possibly truncated) step log
+
+    Args:
+        log_path: Path of the step log
+
+    Returns:
+        Results dictionary with config, network, adoption history and run totals
+    """
+    config: Dict = {}
+    agents: List[List[str]] = []
+    network_entry: Optional[Dict] = None
+    adoption_history: Dict[int, Dict] = {}
+    with open(log_path, "rb") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash can leave the last line incomplete
+                logger.warning(f"Ignoring truncated entry in {log_path}")
+                break
+            if entry.get("type") == "header":
+                config = entry.get("config", {})
+                agents = entry.get("agents", [])
+            elif entry.get("type") == "network":
+                network_entry = entry
+            elif entry.get("type") == "step":
+                adoption_history[int(entry["step"])] = entry["results"]
+
+    results: Dict[str, Any] = {"config": config, "adoption_history": adoption_history}
+    if network_entry is not None:
+        results["network_metrics"] = _network_from_entry(network_entry)
+    # Every agent of the run (logs written before agents were recorded only know those that decided)
+    agent_states: Dict[str, Dict] = {
+        agent_id: {"agent_id": agent_id, "adopter_category": category, "has_adopted": False,
+                   "adoption_time": None, "adoption_attempts": 0}
+        for agent_id, category in agents
+    }
+    if adoption_history:
+        final_step = max(adoption_history)
+        last = adoption_history[final_step]
+        results["final_step"] = final_step
+        results["total_adoption_rate"] = last.get("total_adoption_rate", 0)
+        results["total_adoptions"] = last.get("total_adoptions", 0)
+
+        # Final agent states from the latest decision of every agent
+        for step in sorted(adoption_history):
+            for agent_id, record in adoption_history[step].get("agents_results", {}).items():
+                if record is None:
+                    continue
+                state = agent_states.setdefault(agent_id, {
+                    "agent_id": agent_id,
+                    "adopter_category": agent_id.split("_agent_")[0],
+                    "has_adopted": False,
+                    "adoption_time": None,
+                    "adoption_attempts": 0,
+                })
+                if not record.get("adopted_before", False):
+                    state["adoption_attempts"] += 1
+                state["has_adopted"] = record.get("has_adopted", False)
+                state["adoption_time"] = record.get("adoption_time")
+    if agent_states:
+        results["agent_states"] = list(agent_states.values())
+    return results
+
+
+def recover_log(log_path: str, output_path: Optional[str] = None) -> str:
+    """
+    Turn a step log left behind by an interrupted run into a results file
+
+    Args:
+        log_path: Path of the step log
+        output_path: Output results file (next to the results directory by default)
+
+    Returns:
+        Path of the written results file
+    """
+    results = read_log(log_path)
+    results["metadata"] = {
+        "save_date": datetime.now().isoformat(),
+        "app_version": "1.0.0",
+        "description": "Social Innovation Diffusion Simulation Results (recovered from step log)",
+        "total_agents": len(results.get("agent_states", [])),
+        "config_name": "recovered",
+    }
+    if output_path is None:
+        name = os.path.splitext(os.path.basename(log_path))[0]
+        output_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(log_path))),
+                                   f"results_recovered_{name}{RESULTS_EXTENSION}")
+    write_results(output_path, results)
+    logger.info(f"Recovered {len(results['adoption_history'])} steps from {log_path} into {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Recover results files from step logs of interrupted runs")
+    parser.add_argument("logs", nargs="+", help="Step log files")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for log_file in args.logs:
+        recover_log(log_file)
@@ -0,0 +1,620 @@
+"""
+Columnar on-disk store for simulation results
+
+A results file is a zip archive of NumPy arrays (readable with np.load,
+which loads members lazily):
+- summary: JSON with config, metadata, run totals, per-step summaries and
+  resolved network metrics; text_codec names the codec of the text blobs
+- agent_*: one row per agent (id, category, final adoption state)
+- network_edges / network_node_agent: the social network as an edge array
+- network_layout_<algorithm>: cached node positions of expensive layouts
+- decision columns: one row per (step, agent) decision with numeric fields
+- adopted_before_bits / adopted_before_steps: per-step bitset of agents that
+  had already adopted; their "adopted before" stub records are not stored
+  as rows but rebuilt on access (format version 2)
+- text_blob / text_blob_offsets / text_blob_data / text_dictionary:
+  reasoning text of each decision as a compressed, deduplicated blob (see
+  social.text_store), kept apart from the numeric table and only
+  decompressed when a record is opened (format version 3; older versions
+  store plain <name>_offsets / <name>_data columns)
+"""
+
+import json
+import logging
+import os
+import zipfile
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from social.config import ADOPTER_CATEGORIES
+from social.text_store import DEFAULT_CODEC, TextBlobReader, TextBlobWriter, check_codec
+
+logger = logging.getLogger(__name__)
+
+RESULTS_EXTENSION = ".npz"
+FORMAT_VERSION = 3
+
+DECISION_VALUES = {"ADOPT": 1, "NOT_ADOPT": 0}
+DECISION_NAMES = {value: name for name, value in DECISION_VALUES.items()}
+
+LEVEL_COLUMNS = ("network_influence_level", "global_influence_level", "confidence_level")
+TEXT_COLUMNS = ("thinking", "reasoning", "full_output")
+
+# Keys of a decision record represented by dedicated columns
+RECORD_KEYS = {
+    "decision_time", "has_adopted", "adoption_time", "adopted_before", "decision",
+    *LEVEL_COLUMNS, *TEXT_COLUMNS
+}
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy scalars and arrays found in results"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode_text(values: List[Optional[str]]):
+    """Encode strings as (offsets, utf-8 data); None is stored as an empty string"""
+    encoded = [(value or "").encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return offsets, data
+
+
+def _write_member(archive: zipfile.ZipFile, name: str, array: np.ndarray):
+    with archive.open(f"{name}.npy", "w", force_zip64=True) as f:
+        np.lib.format.write_array(f, np.asarray(array), allow_pickle=False)
+
+
+def _network_metrics_summary(network_metrics: Dict) -> Dict:
+    """Resolved, JSON-serializable network metrics (without the graph)"""
+    if hasattr(network_metrics, "cacheable"):
+        summary = network_metrics.cacheable()
+    else:
+        summary = {key: value for key, value in network_metrics.items() if key != "networkx_graph"}
+    for key in ("statistics_mode", "creation_time", "network_type"):
+        if key in network_metrics and key not in summary:
+            summary[key] = dict.get(network_metrics, key)
+    return summary
+
+
+def _network_arrays(network_metrics: Optional[Dict]):
+    """
+    Network as (node agent ids, (E, 2) edge array in node positions)
+
+    Edge arrays kept by the metrics are used as they are; the NetworkX graph
+    is only read when the network was generated as one.
+    """
+    if not network_metrics:
+        return None
+    source = getattr(network_metrics, "graph_source", None)
+    if source is not None and "networkx_graph" in network_metrics.pending:
+        return source.node_agent_ids, np.asarray(source.edges, dtype=np.int32).reshape(-1, 2)
+    graph = network_metrics.get("networkx_graph")
+    if graph is None:
+        return None
+    nodes = list(graph.nodes())
+    node_position = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(node_position[u], node_position[v]) for u, v in graph.edges()], dtype=np.int32).reshape(-1, 2)
+    return [graph.nodes[node].get("agent_id") for node in nodes], edges
+
+
+def _stub_record(adoption_time: Optional[int]) -> Dict:
+    """Record of an agent that had adopted in an earlier step"""
+    return {"decision_time": 0, "has_adopted": True, "adoption_time": adoption_time, "adopted_before": True}
+
+
+def _is_canonical_stub(record: Dict, agent_state: Dict) -> bool:
+    """Whether a record is exactly the stub rebuilt from the agent's final state"""
+    return bool(record.get("adopted_before", False)) and record == _stub_record(agent_state.get("adoption_time"))
+
+
+def write_results(path: str, results: Dict) -> str:
+    """
+    Write simulation results to a columnar results file
+
+    Args:
+        path: Output file path
+        results: Results dictionary as produced by SocialDiffusionSimulation
+
+    Returns:
+        Path of the written file
+    """
+    agent_states = list(results.get("agent_states", []))
+    agent_index = {state["agent_id"]: i for i, state in enumerate(agent_states)}
+    category_codes = {category: i for i, category in enumerate(ADOPTER_CATEGORIES)}
+
+    def agent_row(agent_id: str) -> int:
+        # Agents missing from agent_states (e.g. interrupted runs) are appended
+        if agent_id not in agent_index:
+            agent_index[agent_id] = len(agent_states)
+            agent_states.append({"agent_id": agent_id, "adopter_category": agent_id.split("_agent_")[0]})
+        return agent_index[agent_id]
+
+    # Decisions table; canonical "adopted before" stubs only set a bit in the step's bitset
+    steps, agents, decisions, has_adopted, adopted_before = [], [], [], [], []
+    stub_steps, stub_agents = [], []
+    adoption_times, decision_times = [], []
+    levels = {column: [] for column in LEVEL_COLUMNS}
+    # zstd only when the run asked for it, so files open on a requirements-only install by default
+    text_blobs = TextBlobWriter(results.get("config", {}).get("results_text_codec", DEFAULT_CODEC))
+    text_blob_rows = []
+    extras = []
+    step_summaries = {}
+
+    adoption_history = results.get("adoption_history", {})
+    for step in sorted(adoption_history.keys()):
+        step_data = adoption_history[step]
+        step_summaries[str(step)] = {key: value for key, value in step_data.items() if key != "agents_results"}
+
+        for agent_id, record in step_data.get("agents_results", {}).items():
+            if record is None:
+                continue
+            row = agent_row(agent_id)
+            if _is_canonical_stub(record, agent_states[row]):
+                stub_steps.append(step)
+                stub_agents.append(row)
+                continue
+            steps.append(step)
+            agents.append(row)
+            decisions.append(DECISION_VALUES.get(record.get("decision"), -1))
+            has_adopted.append(bool(record.get("has_adopted", False)))
+            adopted_before.append(bool(record.get("adopted_before", False)))
+            adoption_time = record.get("adoption_time")
+            adoption_times.append(-1 if adoption_time is None else adoption_time)
+            decision_times.append(record.get("decision_time", 0.0))
+            for column in LEVEL_COLUMNS:
+                value = record.get(column)
+                levels[column].append(value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan)
+            text_blob_rows.append(text_blobs.add(
+                [record.get(column) if isinstance(record.get(column), str) else None for column in TEXT_COLUMNS]
+            ))
+            extra = {key: value for key, value in record.items() if key not in RECORD_KEYS}
+            extras.append(json.dumps(extra, default=_json_default) if extra else None)
+
+    network_metrics = results.get("network_metrics", {}) or {}
+    summary = {
+        "format_version": FORMAT_VERSION,
+        "config": results.get("config", {}),
+        "metadata": results.get("metadata", {}),
+        "network_metrics": _network_metrics_summary(network_metrics),
+        "steps": step_summaries,
+        "text_codec": text_blobs.codec,
+    }
+    for key, value in results.items():
+        if key not in ("config", "metadata", "network_metrics", "network_layouts", "adoption_history", "agent_states"):
+            summary[key] = value
+
+    # Network as an edge array in graph node space plus node -> agent map
+    network = _network_arrays(network_metrics)
+    if network is not None:
+        node_agent_ids, edges = network
+        node_agent = np.array([agent_index.get(agent_id, -1) for agent_id in node_agent_ids], dtype=np.int32)
+    else:
+        edges = np.zeros((0, 2), dtype=np.int32)
+        node_agent = np.zeros(0, dtype=np.int32)
+
+    tmp_path = f"{path}.tmp"
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        _write_member(archive, "summary", np.frombuffer(
+            json.dumps(summary, default=_json_default).encode("utf-8"), dtype=np.uint8))
+
+        # Agents table
+        agent_ids_offsets, agent_ids_data = _encode_text([state["agent_id"] for state in agent_states])
+        _write_member(archive, "agent_id_offsets", agent_ids_offsets)
+        _write_member(archive, "agent_id_data", agent_ids_data)
+        _write_member(archive, "agent_category", np.array(
+            [category_codes.get(state.get("adopter_category"), -1) for state in agent_states], dtype=np.int8))
+        _write_member(archive, "agent_has_adopted", np.array(
+            [bool(state.get("has_adopted", False)) for state in agent_states], dtype=bool))
+        _write_member(archive, "agent_adoption_time", np.array(
+            [-1 if state.get("adoption_time") is None else state["adoption_time"] for state in agent_states], dtype=np.int32))
+        _write_member(archive, "agent_adoption_attempts", np.array(
+            [state.get("adoption_attempts", 0) for state in agent_states], dtype=np.int32))
+
+        # Per-step adoption bitsets
+        bitset_steps = sorted(set(stub_steps))
+        step_index = {step: i for i, step in enumerate(bitset_steps)}
+        bits = np.zeros((len(bitset_steps), len(agent_states)), dtype=bool)
+        if stub_steps:
+            bits[[step_index[step] for step in stub_steps], stub_agents] = True
+        _write_member(archive, "adopted_before_steps", np.array(bitset_steps, dtype=np.int32))
+        _write_member(archive, "adopted_before_bits", np.packbits(bits, axis=1))
+
+        _write_member(archive, "network_edges", edges)
+        _write_member(archive, "network_node_agent", node_agent)
+        for algorithm, positions in (results.get("network_layouts") or {}).items():
+            _write_member(archive, f"network_layout_{algorithm}", np.asarray(positions, dtype=np.float32))
+
+        # Decisions table
+        agents_array = np.array(agents, dtype=np.int32)
+        agent_categories = np.array(
+            [category_codes.get(state.get("adopter_category"), -1) for state in agent_states], dtype=np.int8)
+        _write_member(archive, "step", np.array(steps, dtype=np.int32))
+        _write_member(archive, "agent", agents_array)
+        _write_member(archive, "category", agent_categories[agents_array] if len(agents_array) else np.zeros(0, dtype=np.int8))
+        _write_member(archive, "decision", np.array(decisions, dtype=np.int8))
+        _write_member(archive, "has_adopted", np.array(has_adopted, dtype=bool))
+        _write_member(archive, "adopted_before", np.array(adopted_before, dtype=bool))
+        _write_member(archive, "adoption_time", np.array(adoption_times, dtype=np.int32))
+        _write_member(archive, "decision_time", np.array(decision_times, dtype=np.float64))
+        for column in LEVEL_COLUMNS:
+            _write_member(archive, column, np.array(levels[column], dtype=np.float32))
+
+        # Reasoning text blobs
+        dictionary, blob_offsets, blob_data = text_blobs.encode()
+        _write_member(archive, "text_blob", np.array(text_blob_rows, dtype=np.int32))
+        _write_member(archive, "text_dictionary", np.frombuffer(dictionary, dtype=np.uint8))
+        _write_member(archive, "text_blob_offsets", blob_offsets)
+        _write_member(archive, "text_blob_data", blob_data)
+
+        offsets, data = _encode_text(extras)
+        _write_member(archive, "extra_offsets", offsets)
+        _write_member(archive, "extra_data", data)
+
+    os.replace(tmp_path, path)
+    return path
+
+
+class ResultsArchive:
+    """
+    Lazy reader for columnar results files
+
+    Only the summary is read on open; columns, the network and text blobs are
+    read from the archive the first time they are requested. The file is
+    opened for each read, so no handle stays open while results are in use.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a results file
+
+        Args:
+            path: Path of the results file
+        """
+        self.path = path
+        self._columns: Dict[str, np.ndarray] = {}
+        with np.load(path, allow_pickle=False) as npz:
+            self.files: List[str] = list(npz.files)
+            self.summary: Dict = json.loads(npz["summary"].tobytes().decode("utf-8"))
+        self._step_bounds: Optional[Dict[int, tuple]] = None
+        self._bitset_rows: Optional[Dict[int, int]] = None
+        self._text_blobs: Optional[TextBlobReader] = None
+        self._agent_ids: Optional[List[str]] = None
+
+    def close(self):
+        """Release the cached columns"""
+        self._columns.clear()
+        self._text_blobs = None
+
+    def __enter__(self) -> 'ResultsArchive':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def column(self, name: str) -> np.ndarray:
+        """Read (and cache) a column"""
+        if name not in self._columns:
+            with np.load(self.path, allow_pickle=False) as npz:
+                self._columns[name] = npz[name]
+        return self._columns[name]
+
+    def text(self, column: str, row: int) -> Optional[str]:
+        """Decode a single text field, None if empty"""
+        if column in TEXT_COLUMNS and "text_blob" in self.files:
+            if self._text_blobs is None:
+                codec = self.summary.get("text_codec", DEFAULT_CODEC)
+                # Checked before the blob columns are read
+                try:
+                    check_codec(codec, action="read")
+                except ImportError as e:
+                    raise ImportError(f"{self.path}: {e}") from e
+                self._text_blobs = TextBlobReader(
+                    codec,
+                    self.column("text_dictionary").tobytes(),
+                    self.column("text_blob_offsets"),
+                    self.column("text_blob_data"),
+                    fields=len(TEXT_COLUMNS)
+                )
+            return self._text_blobs.get(int(self.column("text_blob")[row]))[TEXT_COLUMNS.index(column)]
+
+        offsets = self.column(f"{column}_offsets")
+        start, end = offsets[row], offsets[row + 1]
+        if start == end:
+            return None
+        return self.column(f"{column}_data")[start:end].tobytes().decode("utf-8")
+
+    @property
+    def agent_ids(self) -> List[str]:
+        if self._agent_ids is None:
+            offsets = self.column("agent_id_offsets")
+            data = self.column("agent_id_data").tobytes()
+            self._agent_ids = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+        return self._agent_ids
+
+    @property
+    def steps(self) -> List[int]:
+        return sorted(int(step) for step in self.summary.get("steps", {}))
+
+    def step_rows(self, step: int) -> range:
+        """Decision rows of a step (rows are stored sorted by step)"""
+        if self._step_bounds is None:
+            step_column = self.column("step")
+            unique, starts = np.unique(step_column, return_index=True)
+            ends = np.append(starts[1:], len(step_column))
+            self._step_bounds = {int(s): (int(a), int(b)) for s, a, b in zip(unique, starts, ends)}
+        start, end = self._step_bounds.get(step, (0, 0))
+        return range(start, end)
+
+    def adopted_before_agents(self, step: int) -> np.ndarray:
+        """Agents whose "adopted before" stub was delta-encoded in a step's bitset"""
+        if "adopted_before_bits" not in self.files:
+            # Format version 1 stores stubs as regular rows
+            return np.zeros(0, dtype=np.int64)
+        if self._bitset_rows is None:
+            self._bitset_rows = {int(s): i for i, s in enumerate(self.column("adopted_before_steps"))}
+        if step not in self._bitset_rows:
+            return np.zeros(0, dtype=np.int64)
+        bits = np.unpackbits(self.column("adopted_before_bits")[self._bitset_rows[step]], count=len(self.agent_ids))
+        return np.flatnonzero(bits)
+
+    def agent_states(self) -> List[Dict]:
+        categories = self.column("agent_category")
+        has_adopted = self.column("agent_has_adopted")
+        adoption_time = self.column("agent_adoption_time")
+        attempts = self.column("agent_adoption_attempts")
+        return [
+            {
+                "agent_id": agent_id,
+                "adopter_category": ADOPTER_CATEGORIES[categories[i]] if categories[i] >= 0 else None,
+                "has_adopted": bool(has_adopted[i]),
+                "adoption_time": int(adoption_time[i]) if adoption_time[i] >= 0 else None,
+                "adoption_attempts": int(attempts[i]),
+            }
+            for i, agent_id in enumerate(self.agent_ids)
+        ]
+
+    def record(self, row: int) -> Dict:
+        """Rebuild the decision record of a row, in the original record layout"""
+        adoption_time = int(self.column("adoption_time")[row])
+        record = {
+            "decision_time": float(self.column("decision_time")[row]),
+            "has_adopted": bool(self.column("has_adopted")[row]),
+            "adoption_time": adoption_time if adoption_time >= 0 else None,
+        }
+        if self.column("adopted_before")[row]:
+            record["adopted_before"] = True
+            return record
+
+        full_output = self.text("full_output", row)
+        if full_output is not None:
+            record["full_output"] = full_output
+        thinking = self.text("thinking", row)
+        if thinking is not None:
+            record["thinking"] = thinking
+        decision = int(self.column("decision")[row])
+        if decision in DECISION_NAMES:
+            record["decision"] = DECISION_NAMES[decision]
+        reasoning = self.text("reasoning", row)
+        if reasoning is not None:
+            record["reasoning"] = reasoning
+        for column in LEVEL_COLUMNS:
+            value = float(self.column(column)[row])
+            if not np.isnan(value):
+                record[column] = int(value) if value.is_integer() else value
+        extra = self.text("extra", row)
+        if extra is not None:
+            record.update(json.loads(extra))
+        return record
+
+    def stub_record(self, agent: int) -> Dict:
+        """Rebuild the "adopted before" stub record of an agent"""
+        adoption_time = int(self.column("agent_adoption_time")[agent])
+        return _stub_record(adoption_time if adoption_time >= 0 else None)
+
+    def step_results(self, step: int) -> Dict:
+        """Rebuild the adoption_history entry of a step (stubs included, in agent order)"""
+        step_data = dict(self.summary["steps"][str(step)])
+        agent_column = self.column("agent")
+        agent_ids = self.agent_ids
+
+        rows = self.step_rows(step)
+        loaders = [(int(agent_column[row]), (lambda row=row: self.record(row))) for row in rows]
+        stub_agents = self.adopted_before_agents(step)
+        if len(stub_agents):
+            loaders += [(agent, (lambda agent=agent: self.stub_record(agent))) for agent in stub_agents.tolist()]
+            loaders.sort(key=lambda entry: entry[0])
+
+        step_data["agents_results"] = LazyMapping({agent_ids[agent]: loader for agent, loader in loaders})
+        return step_data
+
+    def network_source(self):
+        """The stored network as edge arrays with the agent of every node"""
+        from social.network_statistics import EdgeArrayGraph
+
+        node_agent = self.column("network_node_agent").tolist()
+        categories = self.column("agent_category")
+        agent_ids = self.agent_ids
+        return EdgeArrayGraph(
+            self.column("network_edges"),
+            [agent_ids[agent] if agent >= 0 else None for agent in node_agent],
+            [ADOPTER_CATEGORIES[categories[agent]] if agent >= 0 else None for agent in node_agent]
+        )
+
+    def network_graph(self):
+        """Rebuild the NetworkX graph with agent attributes on every node"""
+        return self.network_source().to_networkx()
+
+    def network_metrics(self) -> Dict:
+        """Network metrics; the graph and metrics not stored are computed lazily"""
+        from social.network_statistics import NetworkStatistics, calculate_network_statistics
+
+        stored = dict(self.summary.get("network_metrics", {}))
+        mode = stored.get("statistics_mode", NetworkStatistics.EXACT)
+        metrics = calculate_network_statistics(None, mode=NetworkStatistics.DEFERRED, known=stored,
+                                               graph_source=self.network_source())
+        for key in ("creation_time", "network_type"):
+            if key in stored:
+                metrics[key] = stored[key]
+        metrics["statistics_mode"] = mode
+        return metrics
+
+    def network_layouts(self) -> Dict[str, np.ndarray]:
+        """Node positions stored with the results, by layout algorithm"""
+        prefix = "network_layout_"
+        return {name[len(prefix):]: self.column(name) for name in self.files if name.startswith(prefix)}
+
+    def to_results(self) -> 'LazyResults':
+        """Results dictionary in the in-memory layout, loaded lazily"""
+        loaders = {
+            "adoption_history": lambda: LazyMapping(
+                {step: (lambda step=step: self.step_results(step)) for step in self.steps}
+            ),
+            "network_metrics": self.network_metrics,
+            "network_layouts": self.network_layouts,
+            "agent_states": self.agent_states,
+        }
+        values = {
+            key: value for key, value in self.summary.items()
+            if key not in ("format_version", "steps", "network_metrics")
+        }
+        return LazyResults(values, loaders)
+
+
+class LazyMapping(Mapping):
+    """Read-only mapping whose values are produced by loaders on first access"""
+
+    def __init__(self, loaders: Dict[Any, Callable[[], Any]]):
+        self._loaders = loaders
+        self._values: Dict[Any, Any] = {}
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            self._values[key] = self._loaders[key]()
+        return self._values[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._loaders)
+
+    def __len__(self) -> int:
+        return len(self._loaders)
+
+    def __contains__(self, key) -> bool:
+        return key in self._loaders
+
+
+class LazyResults(dict):
+    """
+    Results dictionary loaded from a columnar file
+
+    Small scalar entries are regular items; large entries (adoption history,
+    network, agent states) are materialized on first access.
+    """
+
+    def __init__(self, values: Dict, loaders: Dict[str, Callable[[], Any]]):
+        super().__init__(values)
+        self._loaders = dict(loaders)
+
+    def _load(self, key):
+        loader = self._loaders.pop(key)
+        value = loader()
+        dict.__setitem__(self, key, value)
+        return value
+
+    def __getitem__(self, key):
+        if key in self._loaders:
+            return self._load(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self._loaders:
+            return self._load(key)
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        return key in self._loaders or dict.__contains__(self, key)
+
+    def materialize(self) -> 'LazyResults':
+        """Load every lazy entry"""
+        for key in list(self._loaders):
+            self._load(key)
+        return self
+
+    def __iter__(self):
+        yield from dict.__iter__(self)
+        yield from list(self._loaders)
+
+    def __len__(self):
+        return dict.__len__(self) + len(self._loaders)
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return dict.items(self.materialize())
+
+    def values(self):
+        return dict.values(self.materialize())
+
+    def copy(self) -> Dict:
+        return dict(self.materialize())
+
+
+def read_results(path: str) -> LazyResults:
+    """
+    Read a columnar results file lazily
+
+    Args:
+        path: Results file path
+
+    Returns:
+        LazyResults dictionary
+    """
+    return ResultsArchive(path).to_results()
+
+
+def convert_pickle(pickle_path: str, output_path: Optional[str] = None) -> str:
+    """
+    Convert a legacy pickled results file to the columnar format
+
+    Args:
+        pickle_path: Path of the .pkl results file
+        output_path: Output path (same name with the columnar extension by default)
+
+    Returns:
+        Path of the written file
+    """
+    import pickle
+
+    with open(pickle_path, "rb") as f:
+        results = pickle.load(f)
+
+    if output_path is None:
+        output_path = os.path.splitext(pickle_path)[0] + RESULTS_EXTENSION
+    write_results(output_path, results)
+
+    logger.info(f"Converted {pickle_path} ({os.path.getsize(pickle_path)} bytes) -> "
+                f"{output_path} ({os.path.getsize(output_path)} bytes)")
+    return output_path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert pickled simulation results to the columnar format")
+    parser.add_argument("files", nargs="+", help="Pickled results files")
+    parser.add_argument("--remove", action="store_true", help="Remove the pickle after a successful conversion")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for pickle_file in args.files:
+        converted = convert_pickle(pickle_file)
+        if args.remove:
+            os.remove(pickle_file)
@@ -0,0 +1,170 @@
+"""
+Background execution of simulations
+
+A SimulationRunner owns a thread with its own event loop, so a simulation can
+run while the caller (e.g. the Streamlit script) stays responsive. Progress is
+published as events on a queue that the caller polls; nothing on the runner
+thread touches the UI.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from social.simulation import SocialDiffusionSimulation
+
+logger = logging.getLogger(__name__)
+
+# Event kinds
+INITIALIZED = "initialized"
+STEP_STARTED = "step_started"
+STEP_COMPLETED = "step_completed"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+# Events after which the runner thread has finished
+FINAL_EVENTS = (COMPLETED, CANCELLED, FAILED)
+
+
+@dataclass
+class SimulationEvent:
+    """Progress event published by a SimulationRunner"""
+    kind: str
+    step: Optional[int] = None
+    # Results of the step for STEP_COMPLETED
+    data: Optional[Dict[str, Any]] = None
+    # Error message and traceback for FAILED
+    message: Optional[str] = None
+    details: Optional[str] = None
+    time: float = field(default_factory=time.time)
+
+
+class SimulationRunner:
+    """
+    Runs a simulation on a background thread that owns its event loop
+
+    The simulation callbacks are replaced by ones that publish events; the
+    final event (COMPLETED, CANCELLED or FAILED) is only published once the
+    simulation has fully returned, so the caller may then save the results.
+    """
+
+    def __init__(self, simulation: SocialDiffusionSimulation, initialize: bool = True):
+        """
+        Prepare a runner (call start() to run)
+
+        Args:
+            simulation: Simulation to run
+            initialize: Also run initialize_simulation() (network and agent
+                creation) on the runner thread
+        """
+        self.simulation = simulation
+        self.initialize = initialize
+        self.events: "queue.Queue[SimulationEvent]" = queue.Queue()
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._cancel_requested = False
+        self._error: Optional[SimulationEvent] = None
+        self._thread = threading.Thread(target=self._run, name="simulation-runner", daemon=True)
+
+        simulation.simulation_initialized_callback = lambda: self._publish(INITIALIZED, step=0)
+        simulation.simulation_step_started_callback = lambda step: self._publish(STEP_STARTED, step=step)
+        simulation.simulation_step_completed_callback = self._on_step_completed
+        simulation.simulation_completed_callback = None
+        simulation.simulation_error_callback = self._on_error
+
+    def _publish(self, kind: str, **kwargs):
+        self.events.put(SimulationEvent(kind, **kwargs))
+
+    def _on_step_completed(self, step: int):
+        # Read on the runner thread, the history may be streamed to disk
+        self._publish(STEP_COMPLETED, step=step, data=self.simulation.results["adoption_history"][step])
+
+    def _on_error(self, message: str):
+        # run_simulation handles its own errors; report them once it has returned
+        self._error = SimulationEvent(FAILED, step=self.simulation.current_step, message=message,
+                                      details=traceback.format_exc())
+
+    def start(self):
+        """Start the runner thread"""
+        self._thread.start()
+
+    def _run(self):
+        final_event = None
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            if self.initialize:
+                self.simulation.initialize_simulation()
+
+            with self._lock:
+                if self._cancel_requested:
+                    raise asyncio.CancelledError()
+                self._task = self._loop.create_task(self.simulation.run_simulation())
+            self._loop.run_until_complete(self._task)
+
+            final_event = self._error or SimulationEvent(COMPLETED, step=self.simulation.current_step)
+        except asyncio.CancelledError:
+            logger.info(f"Simulation cancelled at step {self.simulation.current_step}")
+            final_event = SimulationEvent(CANCELLED, step=self.simulation.current_step)
+        except Exception as e:
+            logger.error(f"Simulation runner failed: {e}")
+            final_event = SimulationEvent(FAILED, step=self.simulation.current_step, message=str(e),
+                                          details=traceback.format_exc())
+        finally:
+            try:
+                self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            finally:
+                with self._lock:
+                    self._loop.close()
+            if final_event is not None:
+                self.events.put(final_event)
+
+    def cancel(self):
+        """
+        Cancel the run
+
+        The simulation task is cancelled on its own loop, which cancels the
+        in-flight LLM requests; a run that has not started stepping yet is
+        cancelled as soon as initialization finishes.
+        """
+        with self._lock:
+            self._cancel_requested = True
+            if self._task is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._task.cancel)
+        logger.info("Simulation cancellation requested")
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def poll(self, timeout: Optional[float] = None) -> List[SimulationEvent]:
+        """
+        Take the published events
+
+        Args:
+            timeout: Seconds to wait for a first event (None returns at once)
+
+        Returns:
+            Events in publication order (possibly empty)
+        """
+        events = []
+        try:
+            if timeout is not None:
+                events.append(self.events.get(timeout=timeout))
+            while True:
+                events.append(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        return events
+
+    def join(self, timeout: Optional[float] = None):
+        """Wait for the runner thread to finish"""
+        self._thread.join(timeout)
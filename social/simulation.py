@@ -1,17 +1,29 @@
 from collections.abc import Callable
 import logging
+import os
 import time
 import pickle
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from datetime import datetime
 
 from social.config import SimulationConfig, SIMULATION_CONFIGS
-from social.agent import SocialAgent
-from social.network import NetworkGenerator
-from social.orchestrator import AgentOrchestrator
+from social.edge_list import load_edge_list
+from social.event_log import EventLog
+from social.metrics import MetricsFileWriter, MetricsServer, SimulationMetrics
+from social.model import ModelRouter
+from social.prompts import DiffusionPrompts
+from social.results_catalog import ResultsCatalog
+from social.results_log import StepLogWriter, StreamingHistory
+from social.results_store import RESULTS_EXTENSION, read_results, write_results
+
+# Agents, network generation and orchestration pull in the LLM backend and
+# NetworkX; they are imported when a simulation is initialized, so loading
+# saved results stays light
+if TYPE_CHECKING:
+    from social.agent import SocialAgent
+    from social.orchestrator import AgentOrchestrator
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 
 class SocialDiffusionSimulation:
@@ -42,9 +54,16 @@ class SocialDiffusionSimulation:
         self.simulation_error_callback = simulation_error_callback
         
         # Simulation state
-        self.agents: List[SocialAgent] = []
-        self.orchestrator: Optional[AgentOrchestrator] = None
+        self.agents: List["SocialAgent"] = []
+        self.orchestrator: Optional["AgentOrchestrator"] = None
+        self.results_log: Optional[StepLogWriter] = None
+        self.event_log: Optional[EventLog] = None
+        self.metrics: Optional[SimulationMetrics] = None
+        # Shared LLM clients per model route
+        self.model_router = ModelRouter(self.config.model_routes, self.config.model_cascade)
         self.current_step = 0
+        # (path, mtime_ns, size) of the file the results were loaded from
+        self.results_source: Optional[Tuple[str, int, int]] = None
         
         # Data tracking
         self.results = {
@@ -58,16 +77,33 @@ class SocialDiffusionSimulation:
         
     def initialize_simulation(self):
         """Initialize all simulation components"""
+        from social.network import NetworkGenerator
+        from social.orchestrator import AgentOrchestrator
+        
+        # Empirical networks define the population size and adopter categories
+        edge_list = None
+        agents_per_category = None
+        if self.config.network_type == "edge_list":
+            edge_list = load_edge_list(self.config)
+            agents_per_category = edge_list.category_counts()
+            if self.config.num_agents != edge_list.num_nodes:
+                logger.warning(f"num_agents changed from {self.config.num_agents} to the "
+                               f"{edge_list.num_nodes} nodes of the edge list")
+                self.config.num_agents = edge_list.num_nodes
         
         # Create agents
-        self._create_agents()
+        self._create_agents(agents_per_category)
         
         # Create social network
-        network_stats = NetworkGenerator.create_network(self.agents, self.config)
+        network_stats = NetworkGenerator.create_network(self.agents, self.config, edge_list=edge_list)
         self.results["network_metrics"] = network_stats
         
         # Validate network
-        validation = NetworkGenerator.validate_network(self.agents)
+        validation = NetworkGenerator.validate_network(
+            self.agents,
+            mode=self.config.network_validation_mode,
+            seed=self.config.network_seed
+        )
         if not validation["valid"]:
             logger.warning(f"Network validation issues: {validation['issues']}")
         
@@ -82,10 +118,12 @@ class SocialDiffusionSimulation:
         if self.simulation_initialized_callback:
             self.simulation_initialized_callback()
     
-    def _create_agents(self):
-        """Create agents with configured distribution"""
+    def _create_agents(self, agents_per_category: Optional[Dict[str, int]] = None):
+        """Create agents with configured distribution (or explicit per-category counts)"""
+        from social.agent import SocialAgent
         
-        agents_per_category = self.config.get_agents_per_category()
+        if agents_per_category is None:
+            agents_per_category = self.config.get_agents_per_category()
         
         for category, count in agents_per_category.items():
             logger.debug(f"Creating {count} {category} agents")
@@ -94,7 +132,8 @@ class SocialDiffusionSimulation:
                 agent = SocialAgent(
                     agent_id=f"{category}_agent_{i:03d}",
                     adopter_category=category,
-                    config=self.config
+                    config=self.config,
+                    model_client=self.model_router.route(category, step=1).client
                 )
                 self.agents.append(agent)
 
@@ -111,6 +150,38 @@ class SocialDiffusionSimulation:
         logger.info(f"🚀 Starting enhanced social diffusion simulation")
         logger.info(f"📊 Using scientific formulas and improved LLM prompting")
         
+        # Stream every step to disk so long runs keep memory flat and survive crashes
+        if self.config.stream_results:
+            self.results_log = StepLogWriter(self.config.to_dict(), fsync=self.config.stream_fsync,
+                                             agents=[(agent.agent_id, agent.adopter_category) for agent in self.agents])
+            self.results_log.write_network(self.results.get("network_metrics", {}))
+            self.results["adoption_history"] = StreamingHistory(self.results_log)
+            logger.info(f"Streaming step results to {self.results_log.path}")
+
+        # Structured decision, retry and step events, written off the event loop
+        if self.config.event_log:
+            self.event_log = EventLog(sample_rate=self.config.event_log_sample_rate, seed=self.config.network_seed)
+            self.orchestrator.event_log = self.event_log
+            self.event_log.emit("run_started", name=self.config.name, config_hash=self.config.config_hash(),
+                                num_agents=len(self.agents), max_steps=self.config.max_steps)
+
+        # Live metrics, optionally served over HTTP or written to a file
+        self.metrics = SimulationMetrics(self.config.name, self.config.config_hash(),
+                                         len(self.agents), self.config.max_steps)
+        self.metrics.running = True
+        self.orchestrator.metrics = self.metrics
+        self.orchestrator.model_router = self.model_router
+        metrics_exporters = []
+        try:
+            if self.config.metrics_port is not None:
+                metrics_exporters.append(MetricsServer(self.metrics, self.config.metrics_port))
+            if self.config.metrics_file:
+                metrics_exporters.append(MetricsFileWriter(self.metrics, self.config.metrics_file))
+        except OSError as e:
+            logger.warning(f"Metrics export disabled: {e}")
+
+        # Reported in the final event; stays "cancelled" if the run is interrupted
+        status, error = "cancelled", None
         try:
             no_adoption_steps = 0
             # Run simulation steps
@@ -126,6 +197,18 @@ class SocialDiffusionSimulation:
                 step_results = await self.orchestrator.orchestrate_group_decision(step)
 
                 self.results["adoption_history"][step] = step_results
+                self.metrics.record_step(step, step_results["total_adoptions"], step_results["total_adoption_rate"])
+                if self.event_log:
+                    self.event_log.emit(
+                        "step",
+                        step=step,
+                        decisions=sum(1 for record in step_results["agents_results"].values()
+                                      if not record.get("adopted_before")),
+                        new_adoptions=step_results["new_adoptions"],
+                        total_adoptions=step_results["total_adoptions"],
+                        total_adoption_rate=step_results["total_adoption_rate"],
+                        orchestration_time=step_results["orchestration_time"],
+                    )
                 
                 total_adoption_rate = step_results.get("total_adoption_rate", 0)
                 if total_adoption_rate == 1.0:
@@ -177,27 +260,60 @@ class SocialDiffusionSimulation:
                 agent_states.append(agent_state)
 
             self.results["agent_states"] = agent_states
+            prompt_tokens = sum(agent.prompt_tokens for agent in self.agents)
+            completion_tokens = sum(agent.completion_tokens for agent in self.agents)
+            decisions = self.metrics.decisions
+            self.results["token_usage"] = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                # Per accepted decision, retries and escalations included
+                "response_profile": self.config.response_profile,
+                "decisions": decisions,
+                "prompt_tokens_per_decision": prompt_tokens / decisions if decisions else None,
+                "completion_tokens_per_decision": completion_tokens / decisions if decisions else None,
+                # Estimated tokens of each prompt template
+                "prompt_templates": DiffusionPrompts.prompt_token_counts(self.config),
+            }
+            # Throughput and answer quality per model route
+            self.results["model_routes"] = self.model_router.stats()
 
             # Ensure config is properly included
             self.results["config"] = self.config.to_dict()
 
             logger.info(f"🎯 Simulation completed in {simulation_time:.2f}s")
+            status = "completed"
             if self.simulation_completed_callback:
                 self.simulation_completed_callback()
         except Exception as e:
+            status, error = "failed", str(e)
             logger.error(f"❌ Simulation failed: {e}")
+            if self.results_log:
+                logger.info(f"Partial results kept in {self.results_log.path}")
             if self.simulation_error_callback:
                 self.simulation_error_callback(str(e))    
+        finally:
+            if self.results_log:
+                self.results_log.close()
+            if self.event_log:
+                self.event_log.emit("run_finished", status=status, step=self.current_step, error=error,
+                                    simulation_time=time.time() - self.simulation_start_time)
+                self.event_log.close()
+            self.metrics.running = False
+            for exporter in metrics_exporters:
+                exporter.close()
+            try:
+                await self.model_router.close()
+            except Exception as e:
+                logger.warning(f"Failed to close LLM clients: {e}")
     
     def save_results(self, filename_prefix: str = None):
-        """Save simulation results to a single comprehensive file"""
+        """Save simulation results to a single columnar results file"""
         if filename_prefix is None:
             filename_prefix = "simulation_results"
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Ensure results directory exists
-        import os
         results_dir = "results"
         if not os.path.exists(results_dir):
             os.makedirs(results_dir)
@@ -214,12 +330,24 @@ class SocialDiffusionSimulation:
             'config_name': getattr(self.config, 'name', 'custom')
         }
 
-        results_file = os.path.join(results_dir, f"{filename_prefix}_{timestamp}.pkl")
+        results_file = os.path.join(results_dir, f"{filename_prefix}_{timestamp}{RESULTS_EXTENSION}")
         
         try:
-            with open(results_file, 'wb') as f:
-                pickle.dump(results, f)
+            write_results(results_file, results)
             logger.info(f"Complete simulation results saved to {results_file}")
+
+            try:
+                catalog = ResultsCatalog(os.path.join(results_dir, "catalog.sqlite"))
+                catalog.add(results_file, results)
+                catalog.close()
+            except Exception as e:
+                logger.warning(f"Failed to add {results_file} to the results catalog: {e}")
+
+            # The step log has been finalised into the results file
+            if self.results_log and "final_step" in self.results:
+                self.results["adoption_history"] = read_results(results_file)["adoption_history"]
+                self.results_log.discard()
+                self.results_log = None
             return results_file
             
         except Exception as e:
@@ -228,33 +356,53 @@ class SocialDiffusionSimulation:
     
     @staticmethod
     def load_simulation(filepath: str) -> 'SocialDiffusionSimulation':
-        """Load simulation results from file"""
+        """Load simulation results from file (columnar, or legacy pickle)"""
         try:
-            with open(filepath, 'rb') as f:
-                results = pickle.load(f)
+            stat = os.stat(filepath)
+            if filepath.endswith('.pkl'):
+                with open(filepath, 'rb') as f:
+                    results = pickle.load(f)
+            else:
+                # Columnar files are read lazily
+                results = read_results(filepath)
             logger.info(f"Simulation results loaded from {filepath}")
             simulation = SocialDiffusionSimulation(
                 config=SimulationConfig.from_dict(results.get("config", {})),
             )
             simulation.results = results
+            simulation.results_source = (filepath, stat.st_mtime_ns, stat.st_size)
             return simulation
         except Exception as e:
             logger.error(f"Failed to load results from {filepath}: {e}")
             raise
     
     @staticmethod
-    def get_saved_simulations(results_dir: str = "results") -> List[str]:
-        """Get list of saved simulation files"""
-        import os
+    def get_simulation_catalog(results_dir: str = "results") -> ResultsCatalog:
+        """Get the catalog of saved simulations, synced with the results directory"""
+        catalog = ResultsCatalog(os.path.join(results_dir, "catalog.sqlite"))
+        catalog.sync(results_dir)
+        return catalog
+
+    @staticmethod
+    def get_saved_simulations(results_dir: str = "results", **filters) -> List[str]:
+        """
+        Get list of saved simulation files
+
+        Args:
+            results_dir: Directory holding results files
+            **filters: Filters and sort order passed to ResultsCatalog.query
+
+        Returns:
+            File names, most recent first by default
+        """
         if not os.path.exists(results_dir):
             return []
-        
-        saved_files = []
-        for file in os.listdir(results_dir):
-            if file.endswith('.pkl'):
-                saved_files.append(file)
-        
-        return sorted(saved_files, reverse=True)  # Most recent first
+
+        catalog = SocialDiffusionSimulation.get_simulation_catalog(results_dir)
+        try:
+            return [run["file_name"] for run in catalog.query(**filters)]
+        finally:
+            catalog.close()
 
 
 # Simulation runner functions
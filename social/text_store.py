@@ -0,0 +1,231 @@
+"""
+Compressed, deduplicated store for LLM reasoning text
+
+The text fields of a decision record (thinking, reasoning, full_output) are
+framed together as one blob, so the parsed fields repeated inside the raw
+output cost almost nothing. Identical blobs are stored once (content hash).
+Blobs are compressed in small blocks with a dictionary trained on the
+decision corpus (zlib preset dictionaries by default, zstd on request when
+the optional zstandard package is installed), and a block is only
+decompressed when one of its records is opened. The codec is recorded with
+the results, and files written with zstd need zstandard to be read.
+"""
+
+import hashlib
+import struct
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZLIB = "zlib"
+ZSTD = "zstd"
+CODECS = (ZLIB, ZSTD)
+DEFAULT_CODEC = ZLIB
+
+# zlib preset dictionaries are limited to the 32 KiB window
+ZLIB_DICTIONARY_SIZE = 32 * 1024
+ZSTD_DICTIONARY_SIZE = 64 * 1024
+
+# Blobs compressed together; larger blocks compress better but cost more per opened record
+BLOCK_SIZE = 16
+
+_LENGTH_FORMAT = "<i"
+_LENGTH_SIZE = struct.calcsize(_LENGTH_FORMAT)
+
+
+def check_codec(codec: str, action: str = "write"):
+    """
+    Check that a codec is known and usable here
+
+    Raises:
+        ValueError: If the codec is unknown
+        ImportError: If the codec is zstd and zstandard is not installed
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown text codec {codec!r}, expected one of {CODECS}")
+    if codec == ZSTD and zstandard is None:
+        raise ImportError(f"The zstandard package is required to {action} zstd-compressed results "
+                          f"(pip install zstandard)")
+
+
+def frame_texts(texts: Sequence[Optional[str]]) -> bytes:
+    """Frame text fields as length-prefixed UTF-8 (-1 marks None)"""
+    parts = []
+    for text in texts:
+        if text is None:
+            parts.append(struct.pack(_LENGTH_FORMAT, -1))
+        else:
+            encoded = text.encode("utf-8")
+            parts.append(struct.pack(_LENGTH_FORMAT, len(encoded)))
+            parts.append(encoded)
+    return b"".join(parts)
+
+
+def unframe_texts(payload: bytes, count: int) -> List[Optional[str]]:
+    """Inverse of frame_texts"""
+    texts = []
+    position = 0
+    for _ in range(count):
+        (length,) = struct.unpack_from(_LENGTH_FORMAT, payload, position)
+        position += _LENGTH_SIZE
+        if length < 0:
+            texts.append(None)
+        else:
+            texts.append(payload[position:position + length].decode("utf-8"))
+            position += length
+    return texts
+
+
+def train_dictionary(samples: List[bytes], codec: str) -> bytes:
+    """
+    Train a compression dictionary on blob payloads
+
+    Args:
+        samples: Uncompressed payloads
+        codec: "zstd" or "zlib"
+
+    Returns:
+        Dictionary bytes (empty if the corpus is too small to benefit)
+    """
+    if not samples:
+        return b""
+
+    total = sum(len(sample) for sample in samples)
+    if codec == ZSTD:
+        size = min(ZSTD_DICTIONARY_SIZE, max(total // 10, 1024))
+        try:
+            return zstandard.train_dictionary(size, samples).as_bytes()
+        except zstandard.ZstdError:
+            # Too few samples to train on
+            return b""
+
+    # zlib has no trainer: a preset dictionary works best when it holds the
+    # common substrings close to its end, so sample payloads evenly across
+    # the corpus (keeping roughly a tenth of it) and concatenate them.
+    size = min(ZLIB_DICTIONARY_SIZE, total // 10)
+    if size < 256:
+        return b""
+    step = max(1, total // size)
+    chosen, used = [], 0
+    for sample in samples[::step]:
+        if used + len(sample) > size:
+            break
+        chosen.append(sample)
+        used += len(sample)
+    return b"".join(chosen)
+
+
+class TextBlobWriter:
+    """
+    Collects text blobs and writes them as compressed, deduplicated arrays
+    """
+
+    def __init__(self, codec: str = DEFAULT_CODEC):
+        check_codec(codec)
+        self.codec = codec
+        self._payloads: List[bytes] = []
+        self._index: Dict[bytes, int] = {}
+
+    def add(self, texts: Sequence[Optional[str]]) -> int:
+        """
+        Add the text fields of one record
+
+        Returns:
+            Blob index, or -1 if every field is None
+        """
+        if all(text is None for text in texts):
+            return -1
+        payload = frame_texts(texts)
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if digest not in self._index:
+            self._index[digest] = len(self._payloads)
+            self._payloads.append(payload)
+        return self._index[digest]
+
+    def encode(self) -> Tuple[bytes, np.ndarray, np.ndarray]:
+        """
+        Compress every unique blob, BLOCK_SIZE blobs per block
+
+        Returns:
+            Tuple (dictionary, block offsets, data)
+        """
+        dictionary = train_dictionary(self._payloads, self.codec)
+
+        blocks = [
+            b"".join(struct.pack(_LENGTH_FORMAT, len(payload)) + payload
+                     for payload in self._payloads[start:start + BLOCK_SIZE])
+            for start in range(0, len(self._payloads), BLOCK_SIZE)
+        ]
+
+        if self.codec == ZSTD:
+            compressor = zstandard.ZstdCompressor(
+                level=19, dict_data=zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            )
+            compressed = [compressor.compress(block) for block in blocks]
+        else:
+            compressed = []
+            for block in blocks:
+                compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=dictionary) if dictionary \
+                    else zlib.compressobj(9, zlib.DEFLATED, -15)
+                compressed.append(compressor.compress(block) + compressor.flush())
+
+        offsets = np.zeros(len(compressed) + 1, dtype=np.int64)
+        np.cumsum([len(blob) for blob in compressed], out=offsets[1:])
+        data = np.frombuffer(b"".join(compressed), dtype=np.uint8)
+        return dictionary, offsets, data
+
+
+class TextBlobReader:
+    """
+    Lazily decompresses text blobs, keeping the most recently opened blocks
+    """
+
+    CACHE_SIZE = 8
+
+    def __init__(self, codec: str, dictionary: bytes, offsets: np.ndarray, data: np.ndarray, fields: int):
+        check_codec(codec, action="read")
+        self.codec = codec
+        self.dictionary = dictionary
+        self.offsets = offsets
+        self.data = data
+        self.fields = fields
+        self._cache: Dict[int, List[bytes]] = {}
+        self._decompressor = None
+        if codec == ZSTD:
+            self._decompressor = zstandard.ZstdDecompressor(
+                dict_data=zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            )
+
+    def _block(self, block: int) -> List[bytes]:
+        if block not in self._cache:
+            compressed = self.data[self.offsets[block]:self.offsets[block + 1]].tobytes()
+            if self.codec == ZSTD:
+                data = self._decompressor.decompress(compressed)
+            else:
+                decompressor = zlib.decompressobj(-15, zdict=self.dictionary) if self.dictionary \
+                    else zlib.decompressobj(-15)
+                data = decompressor.decompress(compressed) + decompressor.flush()
+
+            payloads, position = [], 0
+            while position < len(data):
+                (length,) = struct.unpack_from(_LENGTH_FORMAT, data, position)
+                position += _LENGTH_SIZE
+                payloads.append(data[position:position + length])
+                position += length
+
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[block] = payloads
+        return self._cache[block]
+
+    def get(self, blob: int) -> List[Optional[str]]:
+        """Text fields of a blob (all None for -1)"""
+        if blob < 0:
+            return [None] * self.fields
+        return unframe_texts(self._block(blob // BLOCK_SIZE)[blob % BLOCK_SIZE], self.fields)
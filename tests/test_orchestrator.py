@@ -0,0 +1,60 @@
+"""
+Cost accounting of the model cascade in AgentOrchestrator
+"""
+
+import asyncio
+import json
+
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+import social.model
+from social.agent import SocialAgent
+from social.config import SimulationConfig
+from social.model import ModelRouter
+from social.orchestrator import AgentOrchestrator
+
+
+def _answer(confidence_level: int) -> str:
+    return json.dumps({
+        "thinking": "Weighing the adoption in my network.",
+        "decision": "NOT_ADOPT",
+        "reasoning": "I need more evidence first.",
+        "network_influence_level": 3,
+        "global_influence_level": 2,
+        "confidence_level": confidence_level,
+    })
+
+
+def test_escalated_screening_is_charged_when_the_routed_answer_fails(monkeypatch):
+    # The screening model is unsure, the routed model fails one parse and then answers
+    clients = {
+        "screening-model": ReplayChatCompletionClient([_answer(confidence_level=2)]),
+        social.model.DEFAULT_MODEL: ReplayChatCompletionClient(["not a decision", _answer(confidence_level=8)]),
+    }
+    monkeypatch.setattr(social.model, "create_llm_client", lambda model, **options: clients[model])
+
+    config = SimulationConfig(num_agents=10, max_steps=1, event_log=False,
+                              model_cascade={"model": "screening-model", "confidence_threshold": 7})
+    router = ModelRouter(cascade=config.model_cascade)
+    route = router.route("Innovator", 1)
+    agent = SocialAgent("Innovator_agent_001", "Innovator", config, model_client=route.client)
+    agent.freeze_state(0.0)
+    orchestrator = AgentOrchestrator([agent], config)
+    orchestrator.model_router = router
+
+    result = asyncio.run(orchestrator._decide_adoption_with_retry(agent, step=1))
+
+    assert result["confidence_level"] == 8
+    screening = router.screening.stats()
+    assert screening["requests"] == 1
+    assert screening["escalations"] == 1
+    assert screening["escalation_rate"] == 1.0
+    assert screening["decisions"] == 0
+
+    routed = route.stats()
+    assert routed["requests"] == 2
+    assert routed["decisions"] == 1
+    assert routed["parse_failures"] == 1
+    assert routed["escalations"] == 0
+    assert router.screening.prompt_tokens + route.prompt_tokens == agent.prompt_tokens
+    assert router.screening.completion_tokens + route.completion_tokens == agent.completion_tokens